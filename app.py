@@ -1,11 +1,25 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for, session
+from flask import Flask, Response, g, has_request_context, render_template, request, jsonify, redirect, url_for, session, stream_with_context
+import functools
+import hashlib
 import json
 import os
-from datetime import datetime, timedelta
-from database import get_all_data as db_get_all_data, save_data as db_save_data, get_week_data, update_entry, init_database, get_database_stats, get_all_weeks, get_db_connection
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+from database import get_all_data as db_get_all_data, save_data as db_save_data, save_data_bulk as db_save_data_bulk, bulk_write_rows, get_week_data, update_entry, init_database, get_database_stats, get_all_weeks, get_db_connection, db_transaction, after_commit, get_weekly_scores, get_daily_scores, get_category_scores, get_weekly_scores_range, get_category_scores_range, get_data_version, get_data_changes, start_change_listener, invalidate_weeks_cache, get_schema_version, migrate_database, SCHEMA_VERSION, iter_weeks, json_chunks, ndjson_chunks, week_key
 from config import config
-from firebase_auth import init_firebase, verify_firebase_token, require_firebase_auth, get_current_user, is_firebase_available
-from firestore_users import create_user_profile, get_user_profile, update_user_profile
+from cell_values import FLAG_NUMBER, FLAG_REST, to_cell_value, value_parts
+import scoring
+from scoring import CATEGORIES, DAYS
+from score_engine import ScoreEngine
+from career_ledger import CareerLedger
+from week_keys import as_label, parse_season_start, parse_week, relabeled_weeks, resolve_week, season_range, week_label, week_order
+from compact_store import CompactStore
+from result_cache import VersionedCache
+from event_hub import EventHub
+from firebase_auth import init_firebase, verify_firebase_token, require_firebase_auth, get_current_user, is_firebase_available, get_auth_cache_stats
+from firestore_users import create_user_profile, get_user_profile, update_user_profile, get_profile_cache_stats
 
 app = Flask(__name__)
 
@@ -20,199 +34,476 @@ WEBSITE_PASSWORD = 'AlphaBrecher'
 
 # BrecherSystem Konfiguration
 NAMES = ['David', 'Cedric', 'Müller']
-CATEGORIES = ['Gym', 'Food', 'Supps', 'Sleep', 'FH', 'Steps', 'Hausarbeit', 'Work', 'Study', 'Fehler', 'Morgenroutine', 'Abendroutine', 'PB']
-DAYS = ['Mo', 'Di', 'Mi', 'Do', 'Fr', 'Sa', 'So']
+# CATEGORIES und DAYS sowie die Punkteregeln liegen in scoring.py
 # get_weeks_list() wird jetzt dynamisch aus der Datenbank geladen
 
-# Datenstruktur - jetzt aus der Datenbank
-data_store = {}
+# Datenstruktur - jetzt aus der Datenbank (kompakt, verhält sich wie das verschachtelte dict).
+# Enthält nur die gerade benutzten Wochen: load_week() lädt bei Bedarf, enforce_memory_budget() verdrängt.
+data_store = CompactStore(NAMES)
 db_initialized = False
+db_init_lock = threading.Lock()
+
+# Wochen, die laufende Requests gerade benutzen (Woche -> Anzahl Requests), siehe pin_week
+pinned_weeks = Counter()
+pinned_lock = threading.Lock()
+
+# Kennzahlen pro Woche für Charts, Leader und Profil (bleiben nach dem Verdrängen erhalten), siehe get_week_summaries
+week_summaries = {}
+
+# Wins/Punkte/absolvierte Wochen pro Person über die abgeschlossenen Wochen (Profil), siehe update_career_ledger
+career_ledger = CareerLedger(NAMES)
+
+# Zellen (week, person, day, category), die seit dem letzten Speichern nur im
+# data_store geändert wurden. /api/save schreibt nur diese Zellen.
+dirty_cells = set()
+
+# Abgeleitete Punkte pro Person-Woche für inkrementelle Updates in update_cell
+score_engine = ScoreEngine()
+
+# Optional: NumPy-Würfel (week, person, day, category) für Übersicht, Charts und Statistiken
+score_cube = None
+if app_config.USE_NUMPY_SCORING:
+    import vector_scoring  # lädt numpy - nur wenn eingeschaltet
+    if vector_scoring.is_available():
+        score_cube = vector_scoring.ScoreCube(NAMES)
+    else:
+        print('⚠️  USE_NUMPY_SCORING gesetzt, aber numpy ist nicht installiert - nutze Standard-Scoring')
+
+# Ergebnisse der Dashboard-Funktionen pro Datenversion (siehe dashboard_cached)
+dashboard_cache = VersionedCache(app_config.DASHBOARD_CACHE_SIZE)
+
+# Datenversion, auf der der data_store steht (siehe sync_data_store)
+data_version_seen = 0
+# PostgreSQL: neueste per NOTIFY gemeldete Version (None = unbekannt, pro Request abfragen)
+remote_data_version = None
+data_sync_lock = threading.Lock()
+
+# Montag, an dem die 'KW<n>'-Labels im data_store zuletzt galten (siehe week_keys.py und relabel_weeks)
+labels_seen = None
+
+# Erste (ISO-Jahr, Woche) der Saison in Scoreboards und Charts (None = alle Wochen)
+SEASON_START = parse_season_start(app_config.SEASON_START)
+
+# Live-Updates für /api/stream (Server-Sent Events)
+event_hub = EventHub(app_config.SSE_HISTORY)
 
 def get_weeks_list():
-    """Hole verfügbare Wochen aus der Datenbank"""
+    """Hole verfügbare Wochen aus der Datenbank (alle Jahre)"""
     return get_all_weeks()
 
+def in_season(week):
+    """Woche liegt in der Saison der Scoreboards und Charts (SEASON_START)"""
+    return parse_week(week) is not None and week_order(week) >= season_range(SEASON_START)[0]
+
+def get_season_weeks():
+    """Wochen der Saison für Scoreboards und Charts"""
+    return [week for week in get_weeks_list() if in_season(week)]
+
+@app.template_filter('week_title')
+def week_title(week):
+    """Anzeige einer Woche der Wochenliste: 39 -> '39', '2025-KW39' -> '39 (2025)'"""
+    parsed = parse_week(week)
+    if parsed is None or parsed[0] is None:
+        return str(week)
+    return f'{parsed[1]} ({parsed[0]})'
+
+def canonical_week(week):
+    """Label, unter dem eine Woche im data_store steht ('2026-KW42' -> 'KW42', solange KW42 2026 meint)"""
+    if parse_week(week) is None:
+        return week
+    return week_label(*resolve_week(week))
+
 def ensure_database_initialized():
-    """Stelle sicher, dass die Datenbank initialisiert ist"""
-    global db_initialized, data_store
+    """Stelle sicher, dass die Datenbank initialisiert ist
+
+    The DDL normally runs once per deploy (python database.py migrate, see
+    railway.toml); a cold boot only checks the schema version. Firebase is
+    initialized on first use or by warm_up().
+    """
+    global db_initialized
     if db_initialized:
         return
 
+    # Warm-up und erster Request sollen nicht doppelt initialisieren
+    with db_init_lock:
+        if db_initialized:
+            return
+        try:
+            if get_schema_version() < SCHEMA_VERSION:
+                migrate_database()
+
+            reload_data_store()
+            if app_config.DATA_CHANGE_LISTENER:
+                start_change_listener(on_remote_version)
+            db_initialized = True
+            print('✅ Database initialized successfully')
+        except Exception as e:
+            print(f'❌ Database initialization failed: {e}')
+            raise
+
+def warm_up():
+    """Datenbank, Firebase und das Dashboard der Startseite vorbereiten, bevor der erste Request kommt"""
+    started = time.perf_counter()
     try:
-        init_database()
+        ensure_database_initialized()
+        if init_firebase() is not None:
+            from firestore_users import get_firestore_client
+            get_firestore_client()
+        # Templates kompilieren und das Dashboard berechnen (landet im dashboard_cache)
+        for template in ('index.html', 'week.html', 'login_fixed.html'):
+            app.jinja_env.get_template(template)
+        get_weekly_overview()
+        get_monthly_scoreboard()
+        get_current_week_scoreboard()
+        get_daily_statistics()
+        print(f'🔥 Warm-up finished in {(time.perf_counter() - started) * 1000:.0f} ms')
+    except Exception as e:
+        print(f'⚠️  Warm-up failed, the first request will retry: {e}')
+
+def start_warm_up():
+    """warm_up() im Hintergrund (gunicorn.conf.py post_worker_init, asgi.py lifespan)"""
+    thread = threading.Thread(target=warm_up, name='brecher-warm-up', daemon=True)
+    thread.start()
+    return thread
+
+def reload_data_store():
+    """Lade die Wochen des data_store neu aus der Datenbank (geladene und heiße Wochen)"""
+    global data_version_seen, labels_seen
+    # Version vor dem Laden merken: was danach geschrieben wird, holt sync_data_store nach
+    version = get_data_version()
+    labels_seen = current_monday()
+    dirty = snapshot_dirty()
+    reload_weeks(set(data_store) | hot_weeks())
+    restore_dirty(dirty)
+    data_version_seen = version
+    invalidate_scores()
+
+def reload_weeks(weeks):
+    data_store.load({})
+    for week in weeks:
+        load_week(week)
+
+def hot_weeks():
+    """Wochen, die nie verdrängt werden: aktuelle Woche, Scoreboard-Woche und Wochen mit ungespeicherten Zellen"""
+    weeks = {f'KW{datetime.now().isocalendar()[1]}', f'KW{get_scoreboard_week()}'}
+    weeks.update(key[0] for key in dirty_cells)
+    return weeks
+
+def load_week(week):
+    """Lade eine Woche bei Bedarf aus der Datenbank in den data_store
+
+    Returns False if the week is neither in memory nor in the database.
+    """
+    if not isinstance(week, str):
+        return False
+    pin_week(week)
+    if week in data_store:
+        return True
+    week_data = get_week_data(week)
+    if not week_data:
+        return False
+    data_store[week] = week_data
+    score_engine.invalidate(week)
+    return True
+
+def pin_week(week):
+    """Woche bis zum Ende des laufenden Requests vor dem Verdrängen schützen
+
+    Views of the data_store resolve their week lazily, so a week evicted by
+    another request (gevent: while this one waits on the database) would
+    read as empty.
+    """
+    if not has_request_context():
+        return
+    weeks = g.setdefault('pinned_weeks', set())
+    if week not in weeks:
+        weeks.add(week)
+        with pinned_lock:
+            pinned_weeks[week] += 1
+
+@app.teardown_request
+def unpin_weeks(exc=None):
+    weeks = g.pop('pinned_weeks', ())
+    with pinned_lock:
+        for week in weeks:
+            pinned_weeks[week] -= 1
+            if pinned_weeks[week] <= 0:
+                del pinned_weeks[week]
+
+def enforce_memory_budget():
+    """Verdränge die am längsten nicht benutzten Wochen, solange der data_store über DATA_STORE_BUDGET_KB liegt
+
+    Hot weeks and weeks of requests still running (pin_week) stay.
+    """
+    if app_config.DATA_STORE_BUDGET_KB <= 0:
+        return
+    pinned = hot_weeks()
+    with pinned_lock:
+        pinned |= set(pinned_weeks)
+    for week in data_store.evict(app_config.DATA_STORE_BUDGET_KB * 1024, pinned):
+        score_engine.invalidate(week)
+
+def all_week_data():
+    """Alle Wochen der Saison als verschachteltes dict: geladene aus dem data_store, die übrigen aus der Datenbank"""
+    data = db_get_all_data(*season_range(SEASON_START))
+    for week in data_store:
+        if in_season(week):
+            data[week] = data_store[week].to_dict()
+    return data
+
+def iter_all_week_data():
+    """Alle Wochen aller Jahre, Woche für Woche ((iso_year, iso_week, week), week_data) für den Export
+
+    Weeks come from the database cursor (iter_weeks); a loaded week is taken
+    from the data_store instead so unsaved cells are included.
+    """
+    loaded = set(data_store)
+    for key, week_data in iter_weeks():
+        week = key[2]
+        if week in loaded:
+            loaded.discard(week)
+            if week in data_store:
+                week_data = data_store[week].to_dict()
+        yield key, week_data
+    for week in sorted(loaded, key=week_key):
+        if week in data_store:
+            yield week_key(week) + (week,), data_store[week].to_dict()
+
+def on_remote_version(version):
+    """Callback des PostgreSQL-Listeners"""
+    global remote_data_version
+    remote_data_version = version
+    # Offene Streams prüfen dann sofort auf Änderungen anderer Worker
+    event_hub.wake()
+
+def snapshot_dirty(week=None):
+    """Werte der ungespeicherten Zellen (einer Woche) vor dem Neuladen sichern"""
+    return {key: data_store.get_value(*key) for key in dirty_cells if week is None or key[0] == week}
+
+def restore_dirty(snapshot):
+    """Ungespeicherte Zellen nach dem Neuladen wieder in den data_store schreiben"""
+    for (week, person, day, category), value in snapshot.items():
+        data_store.set_value(week, person, day, category, value)
+
+def sync_data_store():
+    """Hole Änderungen anderer Worker nach (nur die betroffenen Wochen)
+
+    One primary-key lookup per request; with the PostgreSQL listener running
+    not even that, unless a newer version was announced.
+    """
+    global data_version_seen
+    if remote_data_version is not None and remote_data_version <= data_version_seen:
+        return
+
+    with data_sync_lock:
+        version, weeks = get_data_changes(data_version_seen)
+        if version <= data_version_seen:
+            return
+
+        if weeks is None:
+            print(f'🔄 Data version {data_version_seen} -> {version}: reloading all weeks')
+            dirty = snapshot_dirty()
+            reload_weeks(list(data_store))
+            restore_dirty(dirty)
+            invalidate_scores()
+            invalidate_weeks_cache()
+            event_hub.publish('reload', {})
+        else:
+            for week in weeks:
+                # Nicht geladene Wochen kommen beim nächsten Zugriff ohnehin frisch aus der Datenbank
+                week_data = get_week_data(week) if week in data_store else None
+                if week_data:
+                    dirty = snapshot_dirty(week)
+                    data_store[week] = week_data
+                    restore_dirty(dirty)
+                invalidate_scores(week)
+                event_hub.publish('week', {'week': week}, week=week)
+            if weeks:
+                invalidate_weeks_cache()
+                print(f'🔄 Data version {data_version_seen} -> {version}: reloaded {", ".join(sorted(weeks))}')
+        data_version_seen = version
+
+def current_monday():
+    today = date.today()
+    return today - timedelta(days=today.weekday())
+
+def relabel_weeks():
+    """Montags: Wochen, deren 'KW<n>'-Label jetzt ein anderes Jahr meint, unter ihrem neuen Label führen
+
+    Usually one week number per Monday (next week's 'KW<n>' now means this
+    year's week, last year's becomes '2025-KW<n>'). Only those weeks are
+    dropped from the data_store; unsaved cells move to the new label.
+    """
+    global labels_seen
+    monday = current_monday()
+    if labels_seen == monday:
+        return
 
-        # Initialize Firebase
-        init_firebase()
+    with data_sync_lock:
+        if labels_seen is None or labels_seen == monday:
+            labels_seen = monday
+            return
+        for number in relabeled_weeks(labels_seen, monday):
+            # Label -> (Jahr, Woche) bisher; gespeichert wird unter dem heutigen Label derselben Woche
+            old_labels = {f'KW{number}': resolve_week(number, labels_seen)}
+            for year in {old_labels[f'KW{number}'][0], resolve_week(number, monday)[0]}:
+                old_labels[f'{year}-KW{number}'] = (year, number)
+
+            moved = {}
+            for label, key in old_labels.items():
+                new_label = week_label(*key)
+                for cell, value in snapshot_dirty(label).items():
+                    dirty_cells.discard(cell)
+                    moved[(new_label,) + cell[1:]] = value
+                if label in data_store:
+                    del data_store[label]
+                invalidate_scores(label)
+                event_hub.publish('week', {'week': label}, week=label)
+
+            for cell, value in moved.items():
+                if not load_week(cell[0]):
+                    data_store.fill(cell[0])
+                data_store.set_value(*cell, value)
+                mark_dirty(*cell)
+        labels_seen = monday
+        invalidate_weeks_cache()
+
+@app.before_request
+def sync_before_request():
+    # Statische Dateien brauchen keine aktuellen Daten (spart die Versionsabfrage pro Asset)
+    if db_initialized and request.endpoint != 'static':
+        relabel_weeks()
+        sync_data_store()
+
+@app.after_request
+def evict_after_request(response):
+    enforce_memory_budget()
+    return response
+
+def mark_dirty(week, person, day, category):
+    """Merke eine Zelle als ungespeichert"""
+    dirty_cells.add((week, person, day, category))
+
+def get_dirty_data():
+    """Baue die verschachtelte Struktur nur aus den ungespeicherten Zellen"""
+    dirty_data = {}
+    for week, person, day, category in dirty_cells:
+        value = data_store.get(week, {}).get(person, {}).get(day, {}).get(category, '')
+        dirty_data.setdefault(week, {}).setdefault(person, {}).setdefault(day, {})[category] = value
+    return dirty_data
+
+def clear_dirty(saved_data):
+    """Entferne gespeicherte Zellen aus dirty_cells (nur wenn der Wert unverändert ist)"""
+    for week, week_data in saved_data.items():
+        for person, person_data in week_data.items():
+            for day, day_data in person_data.items():
+                for category, value in day_data.items():
+                    current = data_store.get(week, {}).get(person, {}).get(day, {}).get(category, '')
+                    if current == value:
+                        dirty_cells.discard((week, person, day, category))
+
+def bump_data_version():
+    """Daten haben sich geändert - gecachte Dashboard-Ergebnisse verwerfen"""
+    return dashboard_cache.bump()
+
+def forget_week_summary(week=None):
+    """Kennzahlen einer Woche (None: aller Wochen) verwerfen, auch im Karriere-Ledger"""
+    if week is None:
+        week_summaries.clear()
+        career_ledger.clear()
+        return
+    key = week_key(week)
+    week_summaries.pop(key, None)
+    career_ledger.unfold(key)
+
+def invalidate_scores(week=None):
+    """Verwerfe abgeleitete Punkte nach Änderungen am data_store außerhalb von update_cell"""
+    score_engine.invalidate(week)
+    forget_week_summary(week)
+    if score_cube is not None:
+        score_cube.invalidate()
+    bump_data_version()
+
+def data_etag(*parts):
+    """Starkes ETag aus Datenversion, Scoreboard-Woche, Kalenderwoche und Route-Parametern
+
+    The data version is the shared one of the database, so every worker
+    gives the same ETag for the same data. Unsaved cells (only after a
+    failed write) are part of the key because they are part of the output.
+    """
+    unsaved = tuple(sorted((cell, str(data_store.get_value(*cell))) for cell in dirty_cells))
+    key = (get_data_version(), unsaved, get_scoreboard_week(), datetime.now().isocalendar()[1]) + parts
+    return hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+
+def conditional_json(etag, build):
+    """JSON-Antwort mit ETag; bei passendem If-None-Match 304, ohne build() aufzurufen"""
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        response = jsonify(build())
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def conditional_stream(etag, chunks, mimetype):
+    """Gestreamte Antwort mit ETag; bei passendem If-None-Match 304, ohne chunks() zu starten"""
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        response = Response(chunks(), mimetype=mimetype)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
 
-        # Auto-migrate data on Railway if database is empty
-        if os.environ.get('DATABASE_URL') and os.path.exists('railway_migration.json'):
-            from database import get_database_stats
-            stats = get_database_stats()
-            if stats['total_records'] == 0:
-                print('🚀 Auto-migrating data to Railway PostgreSQL...')
-                try:
-                    import json
-                    with open('railway_migration.json', 'r') as f:
-                        migration_data = json.load(f)
-                    records = db_save_data(migration_data)
-                    print(f'✅ Auto-migrated {records} records!')
-                except Exception as e:
-                    print(f'❌ Migration error: {e}')
-
-        data_store = db_get_all_data()
-        db_initialized = True
-        print('✅ Database initialized successfully')
-    except Exception as e:
-        print(f'❌ Database initialization failed: {e}')
-        raise
+def dashboard_cached(func):
+    """Cache das Ergebnis pro Datenversion, Scoreboard-Woche und aktueller Kalenderwoche
+
+    Between two edits repeated dashboard loads (and Railway's health check on
+    /) return the stored result without any scoring work.
+    """
+    @functools.wraps(func)
+    def wrapper(*args):
+        key = (func.__name__, args, get_scoreboard_week(), datetime.now().isocalendar()[1])
+        return dashboard_cache.get(key, lambda: func(*args))
+    return wrapper
+
+def get_score_result():
+    """Ergebnis des NumPy-Kernels (None wenn USE_NUMPY_SCORING aus ist)"""
+    if score_cube is None:
+        return None
+    if not score_cube.loaded:
+        score_cube.load(all_week_data())
+    return score_cube.score()
+
+def get_all_weekly_scores():
+    """Wochenpunkte aller Wochen der Saison {week: {person: total}}"""
+    result = get_score_result()
+    if result is not None:
+        return result.weekly_scores()
+    scores = get_weekly_scores_range(*season_range(SEASON_START))
+    return {week_label(*key): week_scores for key, week_scores in scores.items()}
 
 def initialize_data():
     """Initialisiere Datenbank und lade Daten"""
     ensure_database_initialized()
 
-    # Sicherstellen, dass alle Wochen aus der DB existieren
-    available_weeks = get_weeks_list()
-    for week in available_weeks:
-        week_key = f'KW{week}'
-        if week_key not in data_store:
-            data_store[week_key] = {}
-        for person in NAMES:
-            if person not in data_store[week_key]:
-                data_store[week_key][person] = {}
-            for day in DAYS:
-                if day not in data_store[week_key][person]:
-                    data_store[week_key][person][day] = {}
-                for cat in CATEGORIES:
-                    if cat not in data_store[week_key][person][day]:
-                        data_store[week_key][person][day][cat] = ''
-
-def calculate_points(category, value):
-    """Berechne Punkte basierend auf Kategorie und Wert"""
-    if not value or value == '':
-        return 0
+    # Geladene Wochen auffüllen (leere Zellen kosten nur einen Zeiger); weitere Wochen lädt load_week() bei Bedarf
+    for week in data_store:
+        data_store.fill(week)
 
-    try:
-        val = float(value)
-    except:
-        # Gym 'R' (Rest Day) - 1x pro Woche erlaubt, gibt 2 Punkte
-        if category == 'Gym' and str(value).upper() == 'R':
-            return 2
-        return 0
-
-    if category == 'Gym':
-        # 1 Workout = 2 Punkte, 2 Workouts = 4 Punkte, etc.
-        return val * 2
-    elif category == 'Food':
-        return min(val, 3)
-    elif category == 'Supps':  # Renamed from Saps
-        return 1 if val > 0 else 0
-    elif category == 'Sleep':
-        if 7 <= val <= 9:
-            return 4
-        elif (6 <= val < 7) or (9 < val <= 10):
-            return 3
-        else:
-            return 1
-    elif category == 'FH':  # Renamed from Study - 0.5 points per hour
-        return val * 0.5
-    elif category == 'Steps':
-        # New formula: (steps * 2) / 10000
-        return (val * 2) / 10000
-    elif category == 'Hausarbeit':
-        return val
-    elif category == 'Work':
-        return val / 100
-    elif category == 'Study':  # Renamed from Podcast/Read - 2 points per hour
-        return val * 2
-    elif category == 'Fehler':
-        # Fehler-Berechnung erfolgt über die ganze Woche (siehe calculate_daily_total)
-        return val * -2  # Temporär, wird in calculate_daily_total überschrieben
-    elif category == 'Morgenroutine':
-        return 2 if val >= 1 else 0
-    elif category == 'Abendroutine':
-        return 2 if val >= 1 else 0
-    elif category == 'PB':
-        # 1h = 1 Punkt (direkte Umrechnung)
-        return val
-    return 0
+def get_person_week_data(person, week):
+    """Daten einer Person in einer Woche aus dem data_store"""
+    return data_store.get(week, {}).get(person, {})
 
 def get_cell_color(category, value, person=None, day=None, week=None):
     """Bestimme Zellfarbe basierend auf Wert"""
-    if not value or value == '':
-        return 'white'
-
-    try:
-        val = float(value)
-    except:
-        # Gym 'R' (Rest Day) - grün
-        if category == 'Gym' and str(value).upper() == 'R':
-            return 'green'
-        return 'white'
-
-    if category == 'Gym':
-        # 1 Workout = grün, 2+ Workouts = grün
-        if val >= 1: return 'green'
-        else: return 'orange'
-    elif category == 'Food':
-        if val >= 3: return 'green'
-        elif val >= 2: return 'orange'
-        else: return 'red'
-    elif category == 'Supps':  # Renamed from Saps
-        if val >= 1: return 'green'
-        else: return 'red'
-    elif category == 'Sleep':
-        if 7 <= val <= 9: return 'green'
-        elif (6 <= val < 7) or (9 < val <= 10): return 'orange'
-        else: return 'red'
-    elif category == 'FH':  # Renamed from Study - 0.5 points per hour
-        if val >= 4: return 'green'
-        elif val >= 2: return 'orange'
-        else: return 'red'
-    elif category == 'Steps':
-        # New thresholds based on new formula
-        if val >= 15000: return 'green'
-        elif val >= 10000: return 'orange'
-        else: return 'red'
-    elif category == 'Hausarbeit':
-        if val >= 3: return 'green'
-        elif val >= 2: return 'orange'
-        else: return 'red'
-    elif category == 'Work':
-        if val >= 300: return 'green'
-        elif val >= 150: return 'orange'
-        else: return 'red'
-    elif category == 'Study':  # Renamed from Podcast/Read - 2 points per hour
-        if val >= 3: return 'green'
-        elif val >= 1: return 'orange'
-        else: return 'red'
-    elif category == 'Fehler':
-        if val == 0:
-            return 'green'  # Keine Fehler = grün
-        else:
-            # Prüfe ob es der erste Fehler der Woche ist (braucht week context)
-            if person and day and week:
-                fehler_points = calculate_fehler_points_for_day(person, day, week)
-                if fehler_points == 0:
-                    return 'green'  # Erster Fehler = grün (toleriert)
-                else:
-                    return 'red'  # Weitere Fehler = rot
-            else:
-                return 'red'  # Fallback
-    elif category == 'Morgenroutine':
-        if val >= 1: return 'green'
-        else: return 'red'
-    elif category == 'Abendroutine':
-        if val >= 1: return 'green'
-        else: return 'red'
-    elif category == 'PB':
-        if val >= 6: return 'green'
-        elif val >= 2: return 'orange'
-        else: return 'red'
-    return 'white'
+    if category == 'Fehler' and person and day and week:
+        return scoring.get_cell_color(category, value, get_person_week_data(person, week), day)
+    return scoring.get_cell_color(category, value)
 
 def validate_gym_r_entry(value, person, week):
     """Validiere Gym 'R' Einträge: nur 1x pro Woche erlaubt"""
-    if not value or str(value).upper() != 'R':
+    if value_parts(value)[1] != FLAG_REST:
         return True  # Andere Werte sind immer erlaubt
 
     # Zähle bereits vorhandene 'R' Einträge in der Woche
@@ -222,8 +513,7 @@ def validate_gym_r_entry(value, person, week):
     r_count = 0
     for day in DAYS:
         day_data = person_data.get(day, {})
-        gym_value = day_data.get('Gym', '')
-        if str(gym_value).upper() == 'R':
+        if value_parts(day_data.get('Gym', ''))[1] == FLAG_REST:
             r_count += 1
 
     # Nur 1 'R' pro Woche erlaubt
@@ -233,161 +523,30 @@ def calculate_fehler_points_for_day(person, target_day, week):
     """Berechne Fehler-Punkte für einen Tag basierend auf der gesamten Woche
     Regel: Erster Fehler der Woche = 0 Punkte, alle weiteren = -2 Punkte
     """
-    week_data = data_store.get(week, {})
-    person_data = week_data.get(person, {})
-
-    # Sammle alle Fehler der gesamten Woche in chronologischer Reihenfolge
-    all_week_errors = []
-
-    for day in DAYS:
-        day_data = person_data.get(day, {})
-        fehler_value = day_data.get('Fehler', '')
-        if fehler_value and fehler_value.strip():
-            try:
-                fehler_count = int(float(fehler_value))
-                if fehler_count > 0:
-                    # Füge für jeden Fehler dieses Tages einen Eintrag hinzu
-                    for _ in range(fehler_count):
-                        all_week_errors.append(day)
-            except:
-                pass
-
-    # Finde Fehler für den Ziel-Tag
-    target_day_data = person_data.get(target_day, {})
-    target_fehler_value = target_day_data.get('Fehler', '')
-
-    if not target_fehler_value or target_fehler_value.strip() == '':
-        return 0
-
-    try:
-        target_fehler_count = int(float(target_fehler_value))
-    except:
-        return 0
-
-    if target_fehler_count <= 0:
-        return 0
-
-    # Berechne welche Position die Fehler des Ziel-Tags in der Gesamt-Woche haben
-    total_points = 0
-    error_position = 1  # Zähler für die Gesamtposition der Fehler
-
-    for day in DAYS:
-        day_data = person_data.get(day, {})
-        day_fehler_value = day_data.get('Fehler', '')
-
-        if day_fehler_value and day_fehler_value.strip():
-            try:
-                day_fehler_count = int(float(day_fehler_value))
-                if day_fehler_count > 0:
-                    # Wenn das der Ziel-Tag ist, berechne Punkte
-                    if day == target_day:
-                        for _ in range(day_fehler_count):
-                            if error_position == 1:
-                                total_points += 0  # Erster Fehler der Woche = 0 Punkte
-                            else:
-                                total_points += -2  # Weitere Fehler = -2 Punkte
-                            error_position += 1
-                        break
-                    else:
-                        # Andere Tage: erhöhe nur den Zähler
-                        error_position += day_fehler_count
-            except:
-                pass
-
-    return total_points
+    return scoring.calculate_fehler_points(get_person_week_data(person, week), target_day)
 
 def calculate_daily_total(person, day, week):
     """Berechne Tagespunkte für eine Person"""
-    total = 0
-    week_data = data_store.get(week, {})
-    person_data = week_data.get(person, {})
-    day_data = person_data.get(day, {})
-
-    for category in CATEGORIES:
-        value = day_data.get(category, '')
-        if category == 'Fehler':
-            # Spezielle Behandlung für Fehler (wochenweise Toleranz)
-            points = calculate_fehler_points_for_day(person, day, week)
-        else:
-            points = calculate_points(category, value)
-        total += points
-
-    return round(total, 2)
+    return scoring.calculate_daily_total(get_person_week_data(person, week), day)
 
 def calculate_weekly_total(person, week):
     """Berechne Wochenpunkte für eine Person"""
-    total = 0
-    for day in DAYS:
-        total += calculate_daily_total(person, day, week)
-
-    # Add weekly bonus points
-    bonus_points = calculate_weekly_bonus(person, week)
-    total += bonus_points
-
-    return round(total, 2)
+    return scoring.calculate_weekly_total(get_person_week_data(person, week))
 
 def calculate_weekly_bonus(person, week):
     """Berechne Wochen-Bonus: 5x Gym = 2 Punkte, 7 fehlerfreie Tage = 2 Punkte"""
-    week_data = data_store.get(week, {})
-    person_data = week_data.get(person, {})
-
-    bonus_points = 0
+    return scoring.calculate_weekly_bonus(get_person_week_data(person, week))
 
-    # Bonus 1: 5x Gym = 2 Bonus-Punkte
-    gym_count = 0
-    for day in DAYS:
-        day_data = person_data.get(day, {})
-        gym_value = day_data.get('Gym', '')
-
-        # Zähle nur echte Workouts, nicht 'R' (Rest Day)
-        if gym_value and str(gym_value).upper() != 'R':
-            try:
-                gym_val = float(gym_value)
-                if gym_val > 0:
-                    gym_count += gym_val
-            except:
-                pass
-
-    if gym_count >= 5:
-        bonus_points += 2
-
-    # Bonus 2: 7 fehlerfreie Tage = 2 Bonus-Punkte
-    # ALLE 7 Tage müssen eingetragen UND 0 sein (grün)
-    all_days_filled_and_zero = True
-    for day in DAYS:
-        day_data = person_data.get(day, {})
-        fehler_value = day_data.get('Fehler', '')
-
-        # Tag muss einen Wert haben UND dieser muss 0 sein
-        if not fehler_value or fehler_value.strip() == '':
-            all_days_filled_and_zero = False  # Kein Eintrag = kein Bonus
-            break
-
-        try:
-            fehler_val = float(fehler_value)
-            if fehler_val != 0:
-                all_days_filled_and_zero = False  # Nicht 0 = kein Bonus
-                break
-        except:
-            all_days_filled_and_zero = False  # Ungültiger Wert = kein Bonus
-            break
-
-    # Nur wenn alle 7 Tage explizit mit 0 eingetragen sind
-    if all_days_filled_and_zero:
-        bonus_points += 2
-
-    return bonus_points
-
-def get_weekly_scoreboard(week):
-    """Erstelle Scoreboard für eine Woche"""
-    scores = []
-    for person in NAMES:
-        score = calculate_weekly_total(person, week)
-        scores.append((person, score))
+def get_weekly_scoreboard(week, week_scores=None):
+    """Erstelle Scoreboard für eine Woche (aus der weekly_scores Tabelle)"""
+    if week_scores is None:
+        week_scores = get_weekly_scores(week).get(week, {})
 
+    scores = [(person, week_scores.get(person, 0)) for person in NAMES]
     scores.sort(key=lambda x: x[1], reverse=True)
     return scores
 
+@dashboard_cached
 def get_monthly_scoreboard():
     """Erstelle Monats-Scoreboard - nur abgeschlossene Wochen
     
@@ -397,13 +556,14 @@ def get_monthly_scoreboard():
     
     # Bestimme welche Woche aktuell im Scoreboard angezeigt wird (abgeschlossene Wochen)
     current_scoreboard_week = get_scoreboard_week()
+    all_scores = get_all_weekly_scores()
 
     # Nur abgeschlossene Wochen in das Monthly Scoreboard einbeziehen
-    for week in get_weeks_list():
-        if week <= current_scoreboard_week:  # Nur abgeschlossene Wochen
-            week_key = f'KW{week}'
+    for week in get_season_weeks():
+        if is_closed_week(week, current_scoreboard_week):  # Nur abgeschlossene Wochen
+            week_scores = all_scores.get(as_label(week), {})
             for person in NAMES:
-                monthly_scores[person] += calculate_weekly_total(person, week_key)
+                monthly_scores[person] += week_scores.get(person, 0)
 
     scores = [(person, round(score, 2)) for person, score in monthly_scores.items()]
     scores.sort(key=lambda x: x[1], reverse=True)
@@ -413,6 +573,7 @@ def get_total_scoreboard():
     """Erstelle TOTAL-Scoreboard (identisch mit monthly da nur ein Zeitraum)"""
     return get_monthly_scoreboard()
 
+@dashboard_cached
 def get_weekly_overview():
     """Erstelle Übersicht aller Wochen für Hauptseite
     
@@ -424,13 +585,14 @@ def get_weekly_overview():
     
     # Bestimme welche Woche aktuell im Scoreboard angezeigt wird
     current_scoreboard_week = get_scoreboard_week()
+    all_scores = get_all_weekly_scores()
     
-    for week in get_weeks_list():
-        week_key = f'KW{week}'
+    for week in get_season_weeks():
+        week_key = as_label(week)
         
         # Für abgeschlossene Wochen: Normale Berechnung mit Punkten und Gewinnern
-        if week <= current_scoreboard_week:
-            week_scores = get_weekly_scoreboard(week_key)
+        if is_closed_week(week, current_scoreboard_week):
+            week_scores = get_weekly_scoreboard(week_key, all_scores.get(week_key, {}))
             
             # Bestimme Gewinner nur wenn Punkte > 0 existieren
             winner = None
@@ -464,29 +626,47 @@ def get_weekly_overview():
     
     return overview
 
-def get_weeks_with_data():
-    """Gibt nur Wochen zurück, die tatsächlich Daten enthalten"""
-    weeks_with_data = []
-    for week in get_weeks_list():
-        week_key = f'KW{week}'
-        week_data = data_store.get(week_key, {})
-
-        # Prüfe ob mindestens eine Person Daten hat
-        has_data = False
-        for person in NAMES:
-            person_data = week_data.get(person, {})
-            for day in DAYS:
-                day_data = person_data.get(day, {})
-                if any(day_data.get(cat, '').strip() for cat in ['Gym', 'Food', 'Sleep', 'FH', 'Steps', 'Work'] if day_data.get(cat, '').strip()):
-                    has_data = True
-                    break
-            if has_data:
-                break
+def summarize_week(week_scores):
+    """Kennzahlen einer Woche aus category_scores ({person: {category: (points, filled)}}):
+    hat Daten, Punkte pro Person und Kategorie, vollständig ausgefüllt"""
+    has_data = False
+    category_points = {}
+    completed = {}
+    for person in NAMES:
+        person_scores = week_scores.get(person, {})
 
-        if has_data:
-            weeks_with_data.append(week)
+        # Mindestens eine Person mit Daten in einer der Hauptkategorien
+        if not has_data:
+            has_data = any(person_scores.get(cat, (0, 0))[1] for cat in ['Gym', 'Food', 'Sleep', 'FH', 'Steps', 'Work'])
 
-    return weeks_with_data
+        category_points[person] = {category: person_scores.get(category, (0, 0))[0] for category in CATEGORIES}
+        completed[person] = all(person_scores.get(category, (0, 0))[1] == len(DAYS) for category in CATEGORIES)
+
+    return {'has_data': has_data, 'category_points': category_points, 'completed': completed}
+
+def get_week_summaries(weeks):
+    """Kennzahlen für weeks (KW-Labels)
+
+    Built from the category_scores table (maintained with every write), so
+    weeks never have to be loaded for them. Kept per ISO (year, week) until
+    the week changes; several missing weeks are read with one range query.
+    """
+    keys = {week: week_key(week) for week in weeks}
+    missing = sorted({key for key in keys.values() if key not in week_summaries})
+    if len(missing) > 1:
+        category_scores = get_category_scores_range(missing[0], missing[-1])
+    elif missing:
+        label = week_label(*missing[0])
+        category_scores = {missing[0]: get_category_scores(label).get(label, {})}
+    for key in missing:
+        week_summaries[key] = summarize_week(category_scores.get(key, {}))
+    return {week: week_summaries[key] for week, key in keys.items()}
+
+def get_weeks_with_data():
+    """Gibt nur Wochen der Saison zurück, die tatsächlich Daten enthalten"""
+    weeks = get_season_weeks()
+    summaries = get_week_summaries([as_label(week) for week in weeks])
+    return [week for week in weeks if summaries[as_label(week)]['has_data']]
 
 def get_category_data_for_charts():
     """Erstelle Kategorie-Daten für Charts - nur für abgeschlossene Wochen
@@ -510,7 +690,10 @@ def get_category_data_for_charts():
     current_scoreboard_week = get_scoreboard_week()
 
     # Nur Wochen mit tatsächlichen Daten verwenden UND die abgeschlossen sind
-    weeks_with_data = [week for week in get_weeks_with_data() if week <= current_scoreboard_week]
+    weeks_with_data = [week for week in get_weeks_with_data() if is_closed_week(week, current_scoreboard_week)]
+    score_result = get_score_result()
+    if score_result is None:
+        summaries = get_week_summaries([as_label(week) for week in weeks_with_data])
 
     for backend_category in backend_categories:
         # Frontend-Namen für Kategorie bestimmen
@@ -525,21 +708,19 @@ def get_category_data_for_charts():
 
         # Für jede abgeschlossene Woche mit Daten die Kategorie-Punkte sammeln
         for week in weeks_with_data:
-            week_key = f'KW{week}'
-            category_data[frontend_category]['weeks'].append(f'KW{week}')
+            week_key = as_label(week)
+            category_data[frontend_category]['weeks'].append(week_key)
 
-            for person in NAMES:
-                weekly_category_points = 0
-                person_data = data_store.get(week_key, {}).get(person, {})
-
-                # Berechne Wochenpunkte für diese Kategorie (Backend-Namen verwenden!)
-                for day in DAYS:
-                    day_data = person_data.get(day, {})
-                    value = day_data.get(backend_category, '')  # Backend-Kategorie für Datenabfrage
-                    points = calculate_points(backend_category, value)  # Backend-Kategorie für Punkteberechnung
-                    weekly_category_points += points
+            if score_result is not None:
+                week_points = score_result.category_points(week_key, backend_category)
+                for person in NAMES:
+                    category_data[frontend_category][person].append(week_points[person])
+                continue
 
-                category_data[frontend_category][person].append(round(weekly_category_points, 2))
+            # Wochenpunkte dieser Kategorie (Backend-Namen!) aus den Wochen-Kennzahlen
+            week_points = summaries[week_key]['category_points']
+            for person in NAMES:
+                category_data[frontend_category][person].append(week_points[person][backend_category])
 
     return category_data
 
@@ -548,8 +729,9 @@ def get_current_week_number():
     from datetime import datetime
     current_week = datetime.now().isocalendar()[1]
     # Falls aktuelle Woche nicht in unserem System ist, nimm die letzte
-    if current_week not in get_weeks_list():
-        return get_weeks_list()[-1]
+    weeks = get_weeks_list()
+    if current_week not in weeks and weeks:
+        return weeks[-1]
     return current_week
 
 def get_current_week_leaders():
@@ -563,9 +745,10 @@ def get_current_week_leaders():
     current_week = get_current_week_number()
     
     # Wenn aktuelle Woche noch nicht abgeschlossen ist, zeige Leaders OHNE Punkte! 😎
-    if current_week > current_scoreboard_week:
+    if not is_closed_week(current_week, current_scoreboard_week):
         # Laufende Woche - Leaders zeigen aber KEINE Punkte verraten!
-        week_key = f'KW{current_week}'
+        week_key = as_label(current_week)
+        week_points = get_week_summaries([week_key])[week_key]['category_points']
         leaders = {}
         # Backend/Frontend Mapping für Leaders (ALLE 13 Kategorien)
         backend_categories = ['Gym', 'Food', 'Supps', 'Sleep', 'FH', 'Steps', 'Hausarbeit', 'Work', 'Study', 'Fehler', 'Morgenroutine', 'Abendroutine', 'PB']
@@ -581,16 +764,7 @@ def get_current_week_leaders():
             
             # Berechne echte Führung für laufende Woche
             for person in NAMES:
-                person_data = data_store.get(week_key, {}).get(person, {})
-                weekly_points = 0
-                
-                for day in DAYS:
-                    day_data = person_data.get(day, {})
-                    value = day_data.get(backend_category, '')
-                    points = calculate_points(backend_category, value)
-                    weekly_points += points
-                    
-                category_scores[person] = round(weekly_points, 2)
+                category_scores[person] = week_points[person][backend_category]
             
             # Finde Führenden ABER verstecke die Punkte! 😏
             if any(score > 0 for score in category_scores.values()):
@@ -612,6 +786,7 @@ def get_current_week_leaders():
     
     # Woche ist abgeschlossen - normale Leader-Berechnung
     week_key = f'KW{current_scoreboard_week}'
+    week_points = get_week_summaries([week_key])[week_key]['category_points']
     leaders = {}
     backend_categories = ['Gym', 'Food', 'Supps', 'Sleep', 'FH', 'Steps', 'Hausarbeit', 'Work', 'Study', 'Fehler', 'Morgenroutine', 'Abendroutine', 'PB']
     frontend_names = {
@@ -625,16 +800,7 @@ def get_current_week_leaders():
         category_scores = {}
 
         for person in NAMES:
-            person_data = data_store.get(week_key, {}).get(person, {})
-            weekly_points = 0
-
-            for day in DAYS:
-                day_data = person_data.get(day, {})
-                value = day_data.get(backend_category, '')  # Backend-Namen für Datenabfrage
-                points = calculate_points(backend_category, value)  # Backend-Namen für Punkteberechnung
-                weekly_points += points
-
-            category_scores[person] = round(weekly_points, 2)
+            category_scores[person] = week_points[person][backend_category]  # Backend-Namen für Datenabfrage
 
         # Finde Führenden
         if any(score > 0 for score in category_scores.values()):
@@ -655,25 +821,27 @@ def get_current_week_leaders():
 
     return leaders
 
+@dashboard_cached
 def get_current_week_scoreboard():
     """Erstelle Leaderboard für anzuzeigende Woche (vorherige abgeschlossene Woche)"""
     scoreboard_week = get_scoreboard_week()
     week_key = f'KW{scoreboard_week}'
     return get_weekly_scoreboard(week_key), scoreboard_week
 
+@dashboard_cached
 def get_daily_statistics(week_num=None):
     """Erstelle tägliche Statistiken für eine Woche"""
     if week_num is None:
         week_num = get_current_week_number()
 
-    week_key = f'KW{week_num}'
+    week_key = as_label(week_num)
     daily_stats = {}
+    week_scores = get_daily_scores(week_key)
 
     for day in DAYS:
         daily_stats[day] = {}
         for person in NAMES:
-            daily_total = calculate_daily_total(person, day, week_key)
-            daily_stats[day][person] = daily_total
+            daily_stats[day][person] = week_scores.get(person, {}).get(day, 0)
 
         # Sortiere nach Punkten für den Tag
         day_ranking = sorted(daily_stats[day].items(), key=lambda x: x[1], reverse=True)
@@ -701,54 +869,56 @@ def is_scoreboard_visible():
 
     return False
 
+def update_career_ledger():
+    """Neu abgeschlossene (oder geänderte) Wochen in den career_ledger falten
+
+    Every closed week is folded in once; weeks that are no longer closed
+    (year boundary) are taken out again. Returns the open weeks, which the
+    profile adds live.
+    """
+    current_scoreboard_week = get_scoreboard_week()
+    weeks = get_weeks_list()
+    # Ledger-Schlüssel ist (ISO-Jahr, Woche): bleibt gleich, wenn sich das Label einer Woche ändert
+    closed = {week_order(week): as_label(week) for week in weeks if is_closed_week(week, current_scoreboard_week)}
+    folded = career_ledger.folded_weeks()
+    for key in folded - set(closed):
+        career_ledger.unfold(key)
+
+    missing = sorted(set(closed) - folded)
+    if missing:
+        week_keys = [closed[key] for key in missing]
+        all_scores = get_weekly_scores() if len(missing) > 1 else get_weekly_scores(week_keys[0])
+        summaries = get_week_summaries(week_keys)
+        for key, week_key in zip(missing, week_keys):
+            week_scores = all_scores.get(week_key, {})
+            week_scoreboard = get_weekly_scoreboard(week_key, week_scores)
+            winner = week_scoreboard[0][0] if week_scoreboard else None
+            career_ledger.fold(key, {
+                person: (week_scores.get(person, 0), person == winner, summaries[week_key]['completed'][person])
+                for person in NAMES
+            })
+
+    return [week for week in weeks if not is_closed_week(week, current_scoreboard_week)]
+
 def calculate_user_statistics(user_name):
     """Berechne Statistiken für einen User: Wins, Gesamtpunkte, absolvierte Wochen
     
     WICHTIG: Wins werden nur für abgeschlossene Wochen gezählt!
     Eine Woche gilt als abgeschlossen, wenn sie im offiziellen Scoreboard angezeigt wird.
     Das passiert ab Sonntag 22:00 für die gerade beendete Woche.
+    Abgeschlossene Wochen kommen aus dem career_ledger, nur laufende Wochen werden hier gerechnet.
     """
     if user_name not in NAMES:
         return {'wins': 0, 'total_points': 0, 'completed_weeks': 0}
 
-    wins = 0
-    total_points = 0
-    completed_weeks = 0
-    
-    # Bestimme welche Woche aktuell im Scoreboard angezeigt wird
-    # Nur Wochen bis zu dieser Woche (einschließlich) zählen für Wins
-    current_scoreboard_week = get_scoreboard_week()
-
-    for week in get_weeks_list():
-        week_key = f'KW{week}'
+    open_weeks = update_career_ledger()
+    wins, total_points, completed_weeks = career_ledger.totals(user_name)
 
-        # Berechne Gesamtpunkte für diese Woche (immer, unabhängig vom Zeitpunkt)
-        week_points = calculate_weekly_total(user_name, week_key)
-        total_points += week_points
-
-        # Prüfe ob User diese Woche gewonnen hat
-        # ABER: Wins nur zählen wenn Woche bereits "abgeschlossen" ist (im Scoreboard angezeigt wird)
-        if week <= current_scoreboard_week:
-            week_scoreboard = get_weekly_scoreboard(week_key)
-            if week_scoreboard and week_scoreboard[0][0] == user_name:
-                wins += 1
-
-        # Prüfe ob Woche "absolviert" (alle Kategorien ausgefüllt)
-        week_data = data_store.get(week_key, {})
-        user_data = week_data.get(user_name, {})
-
-        week_completed = True
-        for day in DAYS:
-            day_data = user_data.get(day, {})
-            for category in CATEGORIES:
-                value = day_data.get(category, '')
-                if not value or value.strip() == '':
-                    week_completed = False
-                    break
-            if not week_completed:
-                break
-
-        if week_completed:
+    # Laufende Wochen: Punkte und "absolviert" zählen schon, Wins noch nicht
+    for week in open_weeks:
+        week_key = as_label(week)
+        total_points += get_weekly_scores(week_key).get(week_key, {}).get(user_name, 0)
+        if get_week_summaries([week_key])[week_key]['completed'][user_name]:
             completed_weeks += 1
 
     return {
@@ -757,6 +927,10 @@ def calculate_user_statistics(user_name):
         'completed_weeks': completed_weeks
     }
 
+def is_closed_week(week, scoreboard_week):
+    """Woche liegt nicht nach der Scoreboard-Woche (Vergleich nach ISO-Jahr und Woche, auch über den Jahreswechsel)"""
+    return week_order(week) <= week_order(scoreboard_week)
+
 def get_scoreboard_week():
     """Bestimme welche Woche im Scoreboard angezeigt werden soll"""
     now = datetime.now()
@@ -1026,12 +1200,9 @@ def chart_data():
     if not require_auth():
         return jsonify({'error': 'Authentication required'}), 401
 
-    category_data = get_category_data_for_charts()
-    current_leaders = get_current_week_leaders()
-
-    return jsonify({
-        'category_data': category_data,
-        'current_leaders': current_leaders
+    return conditional_json(data_etag('chart-data'), lambda: {
+        'category_data': get_category_data_for_charts(),
+        'current_leaders': get_current_week_leaders()
     })
 
 @app.route('/api/statistics/<view_type>')
@@ -1041,58 +1212,56 @@ def statistics_data(view_type):
         return jsonify({'error': 'Authentication required'}), 401
 
     if view_type == 'daily':
-        stats, week_num = get_daily_statistics()
-        return jsonify({'stats': stats, 'week_num': week_num, 'type': 'daily'})
+        def build():
+            stats, week_num = get_daily_statistics()
+            return {'stats': stats, 'week_num': week_num, 'type': 'daily'}
     elif view_type == 'weekly':
-        weekly_overview = get_weekly_overview()
-        return jsonify({'stats': weekly_overview, 'type': 'weekly'})
+        def build():
+            return {'stats': get_weekly_overview(), 'type': 'weekly'}
     elif view_type == 'monthly':
-        monthly_scoreboard = get_monthly_scoreboard()
-        return jsonify({'stats': monthly_scoreboard, 'type': 'monthly'})
+        def build():
+            return {'stats': get_monthly_scoreboard(), 'type': 'monthly'}
     else:
         return jsonify({'error': 'Invalid view type'}), 400
 
+    return conditional_json(data_etag('statistics', view_type), build)
+
 @app.route('/week/<int:week_num>')
-def week_view(week_num):
-    """Ansicht für eine spezifische Woche"""
+@app.route('/week/<int:year>-KW<int:week_num>')
+def week_view(week_num, year=None):
+    """Ansicht für eine spezifische Woche (/week/39, ältere Jahre: /week/2025-KW39)"""
     if not require_auth():
         return redirect(url_for('login'))
 
-    week_key = f'KW{week_num}'
+    week_key = canonical_week(f'{year}-KW{week_num}' if year else f'KW{week_num}')
+    if week_key == f'KW{week_num}':
+        year = None
 
     # Lade Wochendaten aus der Datenbank falls nicht im data_store
-    if week_key not in data_store:
-        # Versuche Daten aus Datenbank zu laden
-        week_data_from_db = get_week_data(week_key)
-        if not week_data_from_db:
-            # Erstelle leere Woche falls nicht existiert
-            data_store[week_key] = {}
-            for person in NAMES:
-                data_store[week_key][person] = {}
-                for day in DAYS:
-                    data_store[week_key][person][day] = {}
-                    for cat in CATEGORIES:
-                        data_store[week_key][person][day][cat] = ''
-        else:
-            # Füge geladene Daten zum data_store hinzu
-            data_store[week_key] = week_data_from_db
+    if not load_week(week_key):
+        # Erstelle leere Woche falls nicht existiert
+        data_store.fill(week_key)
+        invalidate_scores(week_key)
 
     # Berechne alle Punkte und Farben für die Woche
+    # (aus der score_engine: Fehler-Punkte aller Tage kommen aus einem Durchlauf über die Woche)
     week_data = {}
     for person in NAMES:
         person_data = {}
+        person_week_data = data_store[week_key].get(person, {})
+        scores = score_engine.get(week_key, person, person_week_data)
         for day in DAYS:
             day_data = {}
-            person_day_data = data_store[week_key].get(person, {}).get(day, {})
+            person_day_data = person_week_data.get(day, {})
 
             for category in CATEGORIES:
                 value = person_day_data.get(category, '')
                 if category == 'Fehler':
                     # Spezielle Behandlung für Fehler mit Week-Context
-                    points = calculate_fehler_points_for_day(person, day, week_key)
-                    color = get_cell_color(category, value, person, day, week_key)
+                    points = scores.fehler_points[day]
+                    color = scoring.get_cell_color(category, value, fehler_points=points)
                 else:
-                    points = calculate_points(category, value)
+                    points = scores.points[(day, category)]
                     color = get_cell_color(category, value)
 
                 day_data[category] = {
@@ -1102,51 +1271,28 @@ def week_view(week_num):
                 }
 
             # Tagesgesamtpunkte
-            daily_total = calculate_daily_total(person, day, week_key)
-            day_data['daily_total'] = daily_total
+            day_data['daily_total'] = scores.daily[day]
             person_data[day] = day_data
 
         # Wochenpunkte
-        weekly_total = calculate_weekly_total(person, week_key)
-        person_data['weekly_total'] = weekly_total
+        person_data['weekly_total'] = scores.total
 
         # Add bonus row data
-        bonus_points = calculate_weekly_bonus(person, week_key)
-
-        # Berechne einzelne Bonus-Komponenten
-        person_week_data = data_store[week_key].get(person, {})
+        bonus_points = scores.bonus
 
         # Gym Bonus (5x Gym = 2 Punkte)
-        gym_count = 0
-        for day in DAYS:
-            day_data = person_week_data.get(day, {})
-            gym_value = day_data.get('Gym', '')
-            if gym_value and str(gym_value).upper() != 'R':
-                try:
-                    gym_val = float(gym_value)
-                    if gym_val > 0:
-                        gym_count += gym_val
-                except:
-                    pass
-
-        gym_bonus = 2 if gym_count >= 5 else 0
+        gym_bonus = scores.gym_bonus
 
         # Fehler Bonus (7 fehlerfreie Tage = 2 Punkte)
         error_free_days = 0
         for day in DAYS:
             day_data = person_week_data.get(day, {})
-            fehler_value = day_data.get('Fehler', '')
+            fehler_val, fehler_flag = value_parts(day_data.get('Fehler', ''))
 
-            # Tag ist fehlerfrei wenn kein Wert oder Wert = 0
+            # Tag ist fehlerfrei wenn kein Wert oder Wert = 0 (ungültiger Wert = kein Fehler)
             is_error_free = True
-            if fehler_value and fehler_value.strip():
-                try:
-                    fehler_val = float(fehler_value)
-                    if fehler_val > 0:
-                        is_error_free = False
-                except:
-                    # Ungültiger Wert = kein Fehler
-                    pass
+            if fehler_flag == FLAG_NUMBER and fehler_val > 0:
+                is_error_free = False
 
             if is_error_free:
                 error_free_days += 1
@@ -1181,6 +1327,8 @@ def week_view(week_num):
 
     return render_template('week.html',
                          week_num=week_num,
+                         week_year=year,
+                         week_key=week_key,
                          week_data=week_data,
                          names=NAMES,
                          categories=CATEGORIES,
@@ -1195,21 +1343,15 @@ def update_cell():
 
     try:
         data = request.json
-        week = data.get('week')
+        week = canonical_week(data.get('week'))
         person = data.get('person')
         day = data.get('day')
         category = data.get('category')
-        value = data.get('value', '')
+        value = to_cell_value(data.get('value', ''))  # einmal parsen, Ergebnis bleibt im data_store
 
         # Validierung und Auto-Load der Woche falls nicht im data_store
-        if week not in data_store:
-            # Versuche Woche aus der Datenbank zu laden
-            week_data_from_db = get_week_data(week)
-            if not week_data_from_db:
-                return jsonify({'error': 'Invalid week'}), 400
-            else:
-                # Füge geladene Daten zum data_store hinzu
-                data_store[week] = week_data_from_db
+        if not load_week(week):
+            return jsonify({'error': 'Invalid week'}), 400
 
         if person not in NAMES or day not in DAYS or category not in CATEGORIES:
             return jsonify({'error': 'Invalid parameters'}), 400
@@ -1219,169 +1361,81 @@ def update_cell():
             return jsonify({'error': 'Gym "R" nur 1x pro Woche möglich'}), 400
 
         # Sicherstellen, dass die Datenstruktur vollständig ist
-        if person not in data_store[week]:
-            data_store[week][person] = {}
-        if day not in data_store[week][person]:
-            data_store[week][person][day] = {}
-            # Initialisiere alle Kategorien für diesen Tag falls noch nicht vorhanden
-            for cat in CATEGORIES:
-                if cat not in data_store[week][person][day]:
-                    data_store[week][person][day][cat] = ''
+        if person not in data_store[week] or day not in data_store[week][person]:
+            data_store.fill(week, person, day)
 
-        # Update Daten
-        data_store[week][person][day][category] = value
+        # Nur die von dieser Zelle abhängigen Werte neu berechnen (vor dem Update, siehe ScoreEngine.update)
+        person_data = data_store[week][person]
+        delta = score_engine.update(week, person, person_data, day, category, value)
+        person_scores = score_engine.get(week, person, person_data)
 
-        # Speichere auch in der Datenbank
-        update_entry(week, person, day, category, value)
+        # Update Daten
+        person_data[day][category] = value
+        mark_dirty(week, person, day, category)
+        if score_cube is not None:
+            score_cube.set_value(week, person, day, category, value)
+
+        # Speichere auch in der Datenbank (bleibt bei Fehler dirty für /api/save)
+        scores = person_scores.as_scores(delta['daily'].keys())
+        scores['categories'] = {category: scoring.score_category(person_data, category)}
+        with db_transaction():
+            update_entry(week, person, day, category, value, scores=scores)
+            # Erst nach dem Commit: sonst cached ein paralleler Request die alten Tabellen unter der neuen Version
+            after_commit(bump_data_version)
+        dirty_cells.discard((week, person, day, category))
+        forget_week_summary(week)  # erst nach dem Schreiben: Kennzahlen kommen aus category_scores
 
-        # Berechne neue Werte
         if category == 'Fehler':
-            points = calculate_fehler_points_for_day(person, day, week)
-            color = get_cell_color(category, value, person, day, week)
+            color = scoring.get_cell_color(category, value, fehler_points=delta['points'])
         else:
-            points = calculate_points(category, value)
             color = get_cell_color(category, value)
-        daily_total = calculate_daily_total(person, day, week)
-        weekly_total = calculate_weekly_total(person, week)
-
-        # Bonus neu berechnen
-        bonus_points = calculate_weekly_bonus(person, week)
-
-        # Berechne einzelne Bonus-Komponenten
-        week_data = data_store.get(week, {})
-        person_data = week_data.get(person, {})
-
-        # Gym Bonus (5x Gym = 2 Punkte)
-        gym_count = 0
-        for day in DAYS:
-            day_data = person_data.get(day, {})
-            gym_value = day_data.get('Gym', '')
-            if gym_value and str(gym_value).upper() != 'R':
-                try:
-                    gym_val = float(gym_value)
-                    if gym_val > 0:
-                        gym_count += gym_val
-                except:
-                    pass
-
-        gym_bonus = 2 if gym_count >= 5 else 0
-
-        # Fehler Bonus (7 fehlerfreie Tage = 2 Punkte)
-        # ALLE 7 Tage müssen eingetragen UND 0 sein (grün)
-        all_days_filled_and_zero = True
-        for day in DAYS:
-            day_data = person_data.get(day, {})
-            fehler_value = day_data.get('Fehler', '')
-
-            # Tag muss einen Wert haben UND dieser muss 0 sein
-            if not fehler_value or fehler_value.strip() == '':
-                all_days_filled_and_zero = False  # Kein Eintrag = kein Bonus
-                break
-
-            try:
-                fehler_val = float(fehler_value)
-                if fehler_val != 0:
-                    all_days_filled_and_zero = False  # Nicht 0 = kein Bonus
-                    break
-            except:
-                all_days_filled_and_zero = False  # Ungültiger Wert = kein Bonus
-                break
-
-        fehler_bonus = 2 if all_days_filled_and_zero else 0
-
-        # Scoreboard nur für Dashboard berechnen, nicht für week view
-
-        # Berechne Bonus für alle Personen (da sich Bedingungen ändern können)
-        all_bonus_data = {}
-        for p in NAMES:
-            p_bonus_points = calculate_weekly_bonus(p, week)
-
-            # Berechne einzelne Bonus-Komponenten für Person p
-            p_week_data = data_store.get(week, {})
-            p_person_data = p_week_data.get(p, {})
-
-            # Gym Bonus für Person p
-            p_gym_count = 0
-            for day in DAYS:
-                day_data = p_person_data.get(day, {})
-                gym_value = day_data.get('Gym', '')
-                if gym_value and str(gym_value).upper() != 'R':
-                    try:
-                        gym_val = float(gym_value)
-                        if gym_val > 0:
-                            p_gym_count += gym_val
-                    except:
-                        pass
-
-            p_gym_bonus = 2 if p_gym_count >= 5 else 0
-
-            # Fehler Bonus für Person p (7 fehlerfreie Tage = 2 Punkte)
-            # ALLE 7 Tage müssen eingetragen UND 0 sein (grün)
-            p_all_days_filled_and_zero = True
-            for day in DAYS:
-                day_data = p_person_data.get(day, {})
-                fehler_value = day_data.get('Fehler', '')
-
-                # Tag muss einen Wert haben UND dieser muss 0 sein
-                if not fehler_value or fehler_value.strip() == '':
-                    p_all_days_filled_and_zero = False  # Kein Eintrag = kein Bonus
-                    break
-
-                try:
-                    fehler_val = float(fehler_value)
-                    if fehler_val != 0:
-                        p_all_days_filled_and_zero = False  # Nicht 0 = kein Bonus
-                        break
-                except:
-                    p_all_days_filled_and_zero = False  # Ungültiger Wert = kein Bonus
-                    break
-
-            p_fehler_bonus = 2 if p_all_days_filled_and_zero else 0
-
-            all_bonus_data[p] = {
-                'bonus_points': p_bonus_points,
-                'bonus_color': 'green' if p_bonus_points > 0 else 'white',
-                'gym_bonus': p_gym_bonus,
-                'fehler_bonus': p_fehler_bonus
-            }
 
+        bonus_points = delta['bonus']
         response_data = {
-            'points': points,
+            'points': delta['points'],
             'color': color,
-            'daily_total': daily_total,
-            'weekly_total': weekly_total,
+            'daily_total': delta['daily_total'],
+            'weekly_total': delta['weekly_total'],
             'bonus_points': bonus_points,
             'bonus_color': 'green' if bonus_points > 0 else 'white',
-            'gym_bonus': gym_bonus,
-            'fehler_bonus': fehler_bonus,
-            'all_bonus_data': all_bonus_data
+            'gym_bonus': delta['gym_bonus'],
+            'fehler_bonus': delta['fehler_bonus'],
+            # Bonus hängt nur von der eigenen Woche ab - nur bei Änderung mitschicken
+            'all_bonus_data': {}
         }
+        if delta['bonus_changed']:
+            response_data['all_bonus_data'][person] = {
+                'bonus_points': bonus_points,
+                'bonus_color': response_data['bonus_color'],
+                'gym_bonus': delta['gym_bonus'],
+                'fehler_bonus': delta['fehler_bonus']
+            }
 
-        # Wenn Fehler-Kategorie geändert wurde, berechne alle Fehler-Zellen dieser Person neu
+        # Wenn Fehler-Kategorie geändert wurde, nur die Fehler-Zellen späterer Tage mit geänderten Punkten
         if category == 'Fehler':
             fehler_updates = {}
-            for fehler_day in DAYS:
-                fehler_day_data = person_data.get(fehler_day, {})
-                fehler_value = fehler_day_data.get('Fehler', '')
-
-                # Neu berechnen für jeden Tag
-                fehler_points = calculate_fehler_points_for_day(person, fehler_day, week)
-                fehler_color = get_cell_color('Fehler', fehler_value, person, fehler_day, week)
-                fehler_daily_total = calculate_daily_total(person, fehler_day, week)
-
+            for fehler_day, fehler_points in delta['fehler'].items():
+                if fehler_day == day:
+                    continue
+                fehler_value = person_data[fehler_day].get('Fehler', '') if fehler_day in person_data else ''
                 fehler_updates[fehler_day] = {
                     'points': fehler_points,
-                    'color': fehler_color,
-                    'daily_total': fehler_daily_total
+                    'color': scoring.get_cell_color('Fehler', fehler_value, fehler_points=fehler_points),
+                    'daily_total': person_scores.daily[fehler_day]
                 }
 
             response_data['fehler_updates'] = fehler_updates
 
+        # Live-Update für alle offenen Wochenansichten
+        event_hub.publish('cell', dict(response_data, week=week, person=person, day=day,
+                                       category=category, value=str(value)), week=week)
+
         return jsonify(response_data)
 
     except Exception as e:
         # Log the error but don't fail the update
         print(f"⚠️  Cell update warning: {e}")
+        bump_data_version()  # data_store (und NumPy-Würfel) können trotzdem geändert sein
 
         # Return minimal successful response to prevent frontend errors
         return jsonify({
@@ -1398,12 +1452,213 @@ def update_cell():
             'warning': 'Update completed with warnings'
         })
 
+def gym_rest_conflicts(edits):
+    """(week, person) mit mehr als einem Gym 'R' nach dem Batch, sofern der Batch ein 'R' setzt"""
+    conflicts = []
+    for week, person in sorted({key[:2] for key in edits}):
+        sets_rest = False
+        rest_days = 0
+        for day in DAYS:
+            key = (week, person, day, 'Gym')
+            if key in edits:
+                is_rest = value_parts(edits[key])[1] == FLAG_REST
+                sets_rest = sets_rest or is_rest
+            else:
+                is_rest = value_parts(data_store.get_value(week, person, day, 'Gym'))[1] == FLAG_REST
+            rest_days += is_rest
+        if sets_rest and rest_days > 1:
+            conflicts.append((week, person))
+    return conflicts
+
+def cell_points_and_color(scores, day, category, value):
+    if category == 'Fehler':
+        points = scores.fehler_points[day]
+        return points, scoring.get_cell_color(category, value, fehler_points=points)
+    return scores.points[(day, category)], get_cell_color(category, value)
+
+@app.route('/update_cells', methods=['POST'])
+def update_cells():
+    """Update mehrerer Zellen in einer Transaktion
+
+    Body: {"cells": [{"week", "person", "day", "category", "value"}, ...]}.
+    All edits are validated before anything is written (including one Gym
+    'R' per person-week across the batch). Every affected person-week is
+    scored once, and the rows and scores are written in one transaction.
+
+    Response: 'cells' with points and colour of every edited cell and of
+    every Fehler cell whose points changed, and 'person_weeks'
+    {week: {person: {...}}} with the changed daily totals, the weekly total
+    and the bonus values.
+    """
+    if not require_auth():
+        return jsonify({'error': 'Authentication required'}), 401
+
+    data = request.get_json(silent=True)
+    cells = data.get('cells') if isinstance(data, dict) else data
+    if not isinstance(cells, list) or not cells:
+        return jsonify({'error': 'cells muss eine nicht-leere Liste sein'}), 400
+    if len(cells) > app_config.MAX_BATCH_CELLS:
+        return jsonify({'error': f'Maximal {app_config.MAX_BATCH_CELLS} Zellen pro Request'}), 400
+
+    # Alles validieren, bevor etwas geschrieben wird (spätere Änderung derselben Zelle gewinnt)
+    edits = {}
+    errors = []
+    for index, cell in enumerate(cells):
+        if not isinstance(cell, dict):
+            errors.append({'index': index, 'error': 'Invalid parameters'})
+            continue
+        week = canonical_week(cell.get('week'))
+        person = cell.get('person')
+        day = cell.get('day')
+        category = cell.get('category')
+
+        if not load_week(week):
+            errors.append({'index': index, 'error': 'Invalid week'})
+            continue
+
+        if person not in NAMES or day not in DAYS or category not in CATEGORIES:
+            errors.append({'index': index, 'error': 'Invalid parameters'})
+            continue
+
+        edits[(week, person, day, category)] = to_cell_value(cell.get('value', ''))
+
+    for week, person in gym_rest_conflicts(edits):
+        errors.append({'week': week, 'person': person, 'error': 'Gym "R" nur 1x pro Woche möglich'})
+
+    if errors:
+        return jsonify({'error': 'Ungültige Zellen - nichts gespeichert', 'errors': errors}), 400
+
+    # Punkte vor dem Update (für die Liste geänderter Tage/Fehler-Zellen)
+    old_scores = {}
+    for week, person, day, category in edits:
+        if person not in data_store[week] or day not in data_store[week][person]:
+            data_store.fill(week, person, day)
+    for week, person in {key[:2] for key in edits}:
+        old_scores[(week, person)] = score_engine.get(week, person, data_store[week][person])
+
+    for (week, person, day, category), value in edits.items():
+        data_store.set_value(week, person, day, category, value)
+        mark_dirty(week, person, day, category)
+        if score_cube is not None:
+            score_cube.set_value(week, person, day, category, value)
+
+    # Jede betroffene Person-Woche genau einmal neu berechnen
+    new_scores = {
+        key: score_engine.rebuild(key[0], key[1], data_store[key[0]][key[1]])
+        for key in old_scores
+    }
+
+    response_data = {'success': True, 'count': len(edits), 'cells': [], 'person_weeks': {}}
+    edited_categories = {}
+    for week, person, day, category in edits:
+        edited_categories.setdefault((week, person), set()).add(category)
+    try:
+        stored_scores = {}
+        for (week, person), scores in new_scores.items():
+            person_data = data_store[week][person]
+            stored_scores[(week, person)] = dict(scores.as_scores(), categories={
+                category: scoring.score_category(person_data, category) for category in edited_categories[(week, person)]
+            })
+        with db_transaction():
+            bulk_write_rows([key + (value,) for key, value in edits.items()], scores=stored_scores)
+            # Erst nach dem Commit (siehe update_cell)
+            after_commit(bump_data_version)
+        dirty_cells.difference_update(edits)
+    except Exception as e:
+        # Zellen bleiben dirty und werden mit /api/save nachgeschrieben
+        print(f"⚠️  Batch update warning: {e}")
+        bump_data_version()
+        response_data['warning'] = 'Update completed with warnings'
+    for week in {week for week, person in new_scores}:
+        forget_week_summary(week)
+
+    edited_days = {}
+    for (week, person, day, category), value in edits.items():
+        points, color = cell_points_and_color(new_scores[(week, person)], day, category, value)
+        response_data['cells'].append({'week': week, 'person': person, 'day': day, 'category': category,
+                                       'value': str(value), 'points': points, 'color': color})
+        edited_days.setdefault((week, person), set()).add(day)
+
+    for (week, person), scores in new_scores.items():
+        old = old_scores[(week, person)]
+        # Fehler-Punkte späterer Tage hängen von früheren Fehlern ab
+        for day in DAYS:
+            if scores.fehler_points[day] != old.fehler_points[day] and (week, person, day, 'Fehler') not in edits:
+                value = data_store.get_value(week, person, day, 'Fehler')
+                points, color = cell_points_and_color(scores, day, 'Fehler', value)
+                response_data['cells'].append({'week': week, 'person': person, 'day': day, 'category': 'Fehler',
+                                               'value': str(value), 'points': points, 'color': color})
+                edited_days[(week, person)].add(day)
+
+        days = [day for day in DAYS if day in edited_days[(week, person)] or scores.daily[day] != old.daily[day]]
+        response_data['person_weeks'].setdefault(week, {})[person] = {
+            'daily_totals': {day: scores.daily[day] for day in days},
+            'weekly_total': scores.total,
+            'bonus_points': scores.bonus,
+            'bonus_color': 'green' if scores.bonus > 0 else 'white',
+            'gym_bonus': scores.gym_bonus,
+            'fehler_bonus': scores.fehler_bonus
+        }
+
+    # Live-Update: ein Event pro Woche mit allen Zellen im Format der 'cell'-Events
+    for week, person_weeks in response_data['person_weeks'].items():
+        updates = []
+        for cell in response_data['cells']:
+            if cell['week'] != week:
+                continue
+            person_week = person_weeks[cell['person']]
+            bonus_data = {key: person_week[key] for key in ('bonus_points', 'bonus_color', 'gym_bonus', 'fehler_bonus')}
+            updates.append(dict(cell, daily_total=person_week['daily_totals'][cell['day']],
+                                weekly_total=person_week['weekly_total'],
+                                all_bonus_data={cell['person']: bonus_data}, **bonus_data))
+        event_hub.publish('cells', updates, week=week)
+
+    return jsonify(response_data)
+
+@app.route('/api/stream')
+def event_stream():
+    """Server-Sent Events: Zelländerungen einer Woche (?week=KW40) oder aller Wochen
+
+    Events: 'cell' (same fields as the /update_cell response plus week,
+    person, day, category and value), 'cells' (list of such updates from
+    /update_cells), 'week' (week changed by another
+    worker, reload it), 'reload' and 'reset' (reload the page).
+    """
+    if not require_auth():
+        return jsonify({'error': 'Authentication required'}), 401
+
+    week = canonical_week(request.args.get('week') or None)
+    last_id = event_hub.subscribe(request.headers.get('Last-Event-ID', ''))
+
+    def generate(last_id):
+        try:
+            yield f'retry: {app_config.SSE_RETRY_MS}\n\n'
+            while True:
+                last_id, events = event_hub.wait(last_id, week, timeout=app_config.SSE_KEEPALIVE)
+                if events:
+                    yield ''.join(events)
+                    continue
+                # Ruhe: Änderungen anderer Worker nachholen (sendet ggf. 'week'-Events)
+                if db_initialized:
+                    sync_data_store()
+                if event_hub.last_id == last_id:
+                    yield ': keepalive\n\n'
+        finally:
+            event_hub.unsubscribe()
+
+    return Response(stream_with_context(generate(last_id)), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
 @app.route('/api/data')
 def get_all_data_api():
-    """API Endpoint für alle Daten"""
+    """API Endpoint für alle Daten aller Jahre, Woche für Woche gestreamt (?format=ndjson: eine Zeile pro Woche)"""
     if not require_auth():
         return jsonify({'error': 'Authentication required'}), 401
-    return jsonify(data_store)
+    if request.args.get('format') == 'ndjson':
+        return conditional_stream(data_etag('data', 'ndjson'), lambda: ndjson_chunks(iter_all_week_data()), 'application/x-ndjson')
+    return conditional_stream(data_etag('data'), lambda: json_chunks(iter_all_week_data()), 'application/json')
 
 @app.route('/api/save', methods=['POST'])
 def save_data():
@@ -1411,8 +1666,27 @@ def save_data():
     if not require_auth():
         return jsonify({'error': 'Authentication required'}), 401
     try:
-        records_saved = db_save_data(data_store)
-        return jsonify({'success': True, 'records_saved': records_saved})
+        # ?full=1 schreibt den kompletten data_store, sonst nur ungespeicherte Zellen
+        full_save = request.args.get('full') == '1'
+        dirty_count = len(dirty_cells)
+
+        if full_save:
+            save_payload = data_store
+        else:
+            save_payload = get_dirty_data()
+
+        result = db_save_data_bulk(save_payload)
+        clear_dirty(save_payload)
+        if result['rows_written']:
+            bump_data_version()
+
+        return jsonify({
+            'success': True,
+            'records_saved': result['rows_written'],
+            'elapsed_ms': result['elapsed_ms'],
+            'dirty_cells': dirty_count,
+            'full_save': full_save
+        })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -1422,18 +1696,19 @@ def load_data():
     if not require_auth():
         return jsonify({'error': 'Authentication required'}), 401
     try:
-        global data_store
-        data_store = db_get_all_data()
+        reload_data_store()
+        dirty_cells.clear()
+        event_hub.publish('reload', {})
         return jsonify({'success': True})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/database/stats')
 def database_stats():
-    """API Endpoint für Datenbankstatistiken"""
+    """API Endpoint für Datenbankstatistiken (plus Zähler von Profil- und Auth-Cache)"""
     if not require_auth():
         return jsonify({'error': 'Authentication required'}), 401
-    return jsonify(get_database_stats())
+    return jsonify(dict(get_database_stats(), profile_cache=get_profile_cache_stats(), auth_cache=get_auth_cache_stats()))
 
 @app.route('/api/create-week', methods=['POST'])
 def create_week():
@@ -1457,20 +1732,23 @@ def create_week():
 
     week_key = f'KW{week_number}'
 
-    # Prüfen ob Woche bereits existiert
-    if week_key in data_store:
+    # Prüfen ob Woche bereits existiert (im Speicher oder in der Datenbank)
+    if load_week(week_key):
         return jsonify({'error': f'KW{week_number} existiert bereits'}), 400
 
     # Neue Woche erstellen
-    data_store[week_key] = {}
+    data_store.fill(week_key)
+    invalidate_scores(week_key)
+    empty_rows = []
     for person in NAMES:
-        data_store[week_key][person] = {}
         for day in DAYS:
-            data_store[week_key][person][day] = {}
             for category in CATEGORIES:
-                data_store[week_key][person][day][category] = ''
-                # Speichere leeren Eintrag in der Datenbank
-                update_entry(week_key, person, day, category, '')
+                empty_rows.append((week_key, person, day, category, ''))
+                mark_dirty(week_key, person, day, category)
+
+    # Speichere leere Einträge in einer Transaktion in der Datenbank
+    bulk_write_rows(empty_rows)
+    dirty_cells.difference_update(row[:4] for row in empty_rows)
 
     # Neue Woche ist jetzt in der Datenbank verfügbar
     # get_weeks_list() wird sie automatisch beim nächsten Aufruf finden
@@ -1508,6 +1786,7 @@ def migrate_data_now():
             data = json.load(f)
 
         records = db_save_data(data)
+        bump_data_version()
         final_stats = get_database_stats()
 
         return f"""
@@ -0,0 +1,413 @@
+"""
+ASGI entry point: ``uvicorn asgi:app`` (alternative to ``gunicorn app:app``).
+
+The routes that mostly wait on the network run natively on the event loop:
+/api/auth/verify and /api/auth/status (Firestore via the async client),
+/api/database/stats (async database pool, see database_async.py) and
+/api/stream (an asyncio.Event per connection instead of a greenlet).
+
+Every other route is the unchanged Flask app, called through a small WSGI
+bridge on a bounded thread pool (ASGI_THREADS) that passes response bodies on
+chunk by chunk, so streamed routes like /api/data stay streamed. Before a request enters the
+pool, the Firestore profile of the session user is loaded asynchronously and
+handed to get_current_user() in the WSGI environ, so the threads do not sit
+in Firestore round trips.
+
+Sessions are the signed Flask session cookies, so both entry points can serve
+the same users.
+"""
+
+import asyncio
+import io
+import json
+import sys
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+
+from itsdangerous import BadSignature
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.http import dump_cookie, parse_cookie
+
+import app as flask_module
+from app import app as flask_app, app_config, event_hub
+from database_async import get_database_stats_async
+from firebase_auth import PREFETCHED_PROFILE_KEY, get_auth_cache_stats, is_firebase_available, verify_firebase_token
+from firestore_users import create_user_profile_async, get_cached_user_profile_async, get_profile_cache_stats
+
+_executor = ThreadPoolExecutor(max_workers=app_config.ASGI_THREADS, thread_name_prefix='brecher-wsgi')
+
+
+async def run_sync(func, *args):
+    """Blockierende Funktion im Thread-Pool ausführen"""
+    return await asyncio.get_running_loop().run_in_executor(_executor, func, *args)
+
+
+# --- Session (Flask-Cookie) ---
+
+def load_session(headers):
+    """Decode the signed Flask session cookie ({} if missing or invalid)"""
+    value = parse_cookie(headers.get('cookie', '')).get(flask_app.config['SESSION_COOKIE_NAME'])
+    if not value:
+        return {}
+    serializer = flask_app.session_interface.get_signing_serializer(flask_app)
+    if serializer is None:
+        return {}
+    try:
+        max_age = int(flask_app.permanent_session_lifetime.total_seconds())
+        return dict(serializer.loads(value, max_age=max_age))
+    except BadSignature:
+        return {}
+
+
+def session_cookie(session_data):
+    """Set-Cookie header value for session_data, like Flask's session interface"""
+    serializer = flask_app.session_interface.get_signing_serializer(flask_app)
+    return dump_cookie(
+        flask_app.config['SESSION_COOKIE_NAME'],
+        serializer.dumps(session_data),
+        domain=flask_app.config['SESSION_COOKIE_DOMAIN'] or None,
+        path=flask_app.config['SESSION_COOKIE_PATH'] or flask_app.config['APPLICATION_ROOT'] or '/',
+        secure=flask_app.config['SESSION_COOKIE_SECURE'],
+        httponly=flask_app.config['SESSION_COOKIE_HTTPONLY'],
+        samesite=flask_app.config['SESSION_COOKIE_SAMESITE'],
+    )
+
+
+async def current_profile(session_data):
+    """(firebase_uid, Firestore profile) of the session user, (None, None) without one"""
+    firebase_uid = (session_data.get('firebase_user') or {}).get('firebase_uid')
+    if not firebase_uid or not is_firebase_available():
+        return None, None
+    return firebase_uid, await get_cached_user_profile_async(firebase_uid)
+
+
+def is_authenticated(session_data, profile):
+    """require_auth() for the native routes"""
+    if is_firebase_available() and profile:
+        return True
+    return session_data.get('authenticated', False)
+
+
+# --- Responses ---
+
+async def read_body(scope, receive):
+    """Collect the request body; RequestEntityTooLarge above MAX_CONTENT_LENGTH (like Flask on the WSGI path)"""
+    limit = flask_app.config.get('MAX_CONTENT_LENGTH')
+    for name, value in scope['headers']:
+        if name == b'content-length' and limit and value.isdigit() and int(value) > limit:
+            raise RequestEntityTooLarge()
+
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            break
+        chunk = message.get('body', b'')
+        size += len(chunk)
+        if limit and size > limit:
+            raise RequestEntityTooLarge()
+        chunks.append(chunk)
+        if not message.get('more_body'):
+            break
+    return b''.join(chunks)
+
+
+async def send_json(send, data, status=200, headers=()):
+    body = json.dumps(data).encode('utf-8')
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())] + list(headers),
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+# --- Native Routen ---
+
+async def auth_verify(scope, receive, send, headers, session_data, profile):
+    """POST /api/auth/verify (see verify_firebase_auth in app.py)"""
+    try:
+        body = await read_body(scope, receive)
+        try:
+            data = json.loads(body) if body else None
+        except ValueError:
+            data = None
+        id_token = data.get('idToken') if isinstance(data, dict) else None
+        profile_data = (data.get('profile') or {}) if isinstance(data, dict) else {}
+
+        if not id_token:
+            return await send_json(send, {'error': 'ID token required'}, 400)
+
+        # firebase_admin verifiziert synchron (Zertifikate werden gecacht)
+        user_info = await run_sync(verify_firebase_token, id_token)
+        if not user_info:
+            print(f"❌ Firebase token verification failed", flush=True)
+            return await send_json(send, {'error': 'Invalid token'}, 401)
+
+        user = await create_user_profile_async(
+            firebase_uid=user_info['firebase_uid'],
+            email=user_info['email'],
+            display_name=user_info['display_name'],
+            profile_data={'profile_picture': user_info['profile_picture'], **profile_data}
+        )
+        if user is None:
+            print(f"❌ Failed to create user profile in Firestore", flush=True)
+            return await send_json(send, {'error': 'Failed to create user profile'}, 500)
+
+        session_data['firebase_user'] = user_info
+        session_data['authenticated'] = True
+
+        await send_json(send, {
+            'success': True,
+            'user': {
+                'uid': user_info['firebase_uid'],
+                'email': user_info['email'],
+                'displayName': user_info['display_name'],
+                'photoURL': user_info['profile_picture']
+            }
+        }, headers=[(b'set-cookie', session_cookie(session_data).encode('latin-1')), (b'vary', b'Cookie')])
+
+    except RequestEntityTooLarge:
+        raise
+    except Exception as e:
+        traceback_str = traceback.format_exc()
+        print(f"❌ Firebase auth verification failed: {e}")
+        await send_json(send, {
+            'error': 'Authentication failed',
+            'details': str(e),
+            'traceback': traceback_str
+        }, 500)
+
+
+async def auth_status(scope, receive, send, headers, session_data, profile):
+    """GET /api/auth/status"""
+    if is_firebase_available() and profile:
+        return await send_json(send, {
+            'authenticated': True,
+            'firebase': True,
+            'user': {
+                'uid': profile['firebase_uid'],
+                'email': profile['email'],
+                'displayName': profile['display_name']
+            }
+        })
+
+    if session_data.get('authenticated'):
+        return await send_json(send, {'authenticated': True, 'firebase': False, 'legacy': True})
+
+    await send_json(send, {'authenticated': False})
+
+
+async def database_stats(scope, receive, send, headers, session_data, profile):
+    """GET /api/database/stats"""
+    if not is_authenticated(session_data, profile):
+        return await send_json(send, {'error': 'Authentication required'}, 401)
+    await send_json(send, dict(await get_database_stats_async(), profile_cache=get_profile_cache_stats(),
+                               auth_cache=get_auth_cache_stats()))
+
+
+async def event_stream(scope, receive, send, headers, session_data, profile):
+    """GET /api/stream (same events as event_stream in app.py)"""
+    if not is_authenticated(session_data, profile):
+        return await send_json(send, {'error': 'Authentication required'}, 401)
+
+    week = flask_module.canonical_week(parse_qs(scope['query_string'].decode('latin-1')).get('week', [''])[0] or None)
+    last_id = event_hub.subscribe(headers.get('last-event-id', ''))
+
+    loop = asyncio.get_running_loop()
+    new_events = asyncio.Event()
+    disconnected = False
+
+    async def watch_disconnect():
+        nonlocal disconnected
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+        disconnected = True
+        new_events.set()
+
+    event_hub.register_async(loop, new_events)
+    watcher = asyncio.create_task(watch_disconnect())
+    try:
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [
+                (b'content-type', b'text/event-stream; charset=utf-8'),
+                (b'cache-control', b'no-cache'),
+                (b'x-accel-buffering', b'no'),
+            ],
+        })
+        await send({'type': 'http.response.body', 'body': f'retry: {app_config.SSE_RETRY_MS}\n\n'.encode(), 'more_body': True})
+
+        while not disconnected:
+            new_events.clear()
+            last_id, events = event_hub.wait(last_id, week, timeout=0)
+            if events:
+                await send({'type': 'http.response.body', 'body': ''.join(events).encode('utf-8'), 'more_body': True})
+                continue
+            try:
+                await asyncio.wait_for(new_events.wait(), app_config.SSE_KEEPALIVE)
+                continue
+            except asyncio.TimeoutError:
+                pass
+            # Ruhe: Änderungen anderer Worker nachholen (sendet ggf. 'week'-Events)
+            if flask_module.db_initialized:
+                await run_sync(flask_module.sync_data_store)
+            if event_hub.last_id == last_id and not disconnected:
+                await send({'type': 'http.response.body', 'body': b': keepalive\n\n', 'more_body': True})
+    finally:
+        watcher.cancel()
+        event_hub.unregister_async(loop, new_events)
+        event_hub.unsubscribe()
+
+
+ROUTES = {
+    ('POST', '/api/auth/verify'): auth_verify,
+    ('GET', '/api/auth/status'): auth_status,
+    ('GET', '/api/database/stats'): database_stats,
+    ('GET', '/api/stream'): event_stream,
+}
+
+
+# --- WSGI-Brücke für alle anderen Routen ---
+
+def wsgi_environ(scope, body):
+    """WSGI environ for an ASGI http scope (PEP 3333 string handling)"""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope['query_string'].decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'REMOTE_ADDR': client[0],
+        'SERVER_PROTOCOL': 'HTTP/' + scope.get('http_version', '1.1'),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    # Der Body liegt komplett vor (auch bei chunked Requests)
+    environ['CONTENT_LENGTH'] = str(len(body))
+    for name, value in scope['headers']:
+        name = name.decode('latin-1')
+        value = value.decode('latin-1')
+        if name == 'content-type':
+            environ['CONTENT_TYPE'] = value
+        elif name == 'content-length':
+            continue
+        else:
+            key = 'HTTP_' + name.upper().replace('-', '_')
+            environ[key] = f'{environ[key]},{value}' if key in environ else value
+    return environ
+
+
+# Höchstens so viele Body-Chunks warten zwischen Flask-Thread und Event-Loop (Backpressure bei langsamen Clients)
+STREAM_QUEUE_SIZE = 8
+
+
+def run_wsgi(environ, emit):
+    """Run the Flask app for one request, handing every ASGI message to emit() as it is produced"""
+    def start_response(status, headers, exc_info=None):
+        emit({
+            'type': 'http.response.start',
+            'status': int(status.split(' ', 1)[0]),
+            'headers': [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers],
+        })
+        return lambda data: emit({'type': 'http.response.body', 'body': data, 'more_body': True})
+
+    result = flask_app(environ, start_response)
+    try:
+        for chunk in result:
+            if chunk:
+                emit({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+        emit({'type': 'http.response.body', 'body': b''})
+    finally:
+        if hasattr(result, 'close'):
+            result.close()
+
+
+async def call_flask(scope, receive, send, extra_environ):
+    """Run a Flask route in the thread pool and send its body chunk by chunk (gestreamte Antworten bleiben gestreamt)"""
+    environ = wsgi_environ(scope, await read_body(scope, receive))
+    environ.update(extra_environ)
+
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    # Backpressure im Flask-Thread statt Roundtrip über den Event-Loop pro Chunk
+    slots = threading.Semaphore(STREAM_QUEUE_SIZE)
+    closed = threading.Event()
+
+    def emit(message):
+        slots.acquire()
+        if closed.is_set():
+            raise ConnectionAbortedError('client disconnected')
+        loop.call_soon_threadsafe(queue.put_nowait, message)
+
+    def produce():
+        try:
+            run_wsgi(environ, emit)
+        finally:
+            if not closed.is_set():
+                loop.call_soon_threadsafe(queue.put_nowait, None)
+
+    worker = loop.run_in_executor(_executor, produce)
+    finished = False
+    try:
+        while True:
+            message = await queue.get()
+            if message is None:
+                break
+            await send(message)
+            slots.release()
+        finished = True
+    finally:
+        if not finished:
+            # Client weg: wartenden Flask-Thread freigeben, er bricht beim nächsten Chunk ab
+            closed.set()
+            slots.release(STREAM_QUEUE_SIZE)
+            worker.add_done_callback(lambda future: future.cancelled() or future.exception())
+    await worker
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            # Nicht blockieren: Requests während des Warm-ups initialisieren bei Bedarf selbst
+            flask_module.start_warm_up()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            _executor.shutdown(wait=False)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        return await lifespan(receive, send)
+    if scope['type'] != 'http':
+        return
+
+    headers = {name.decode('latin-1'): value.decode('latin-1') for name, value in scope['headers']}
+    session_data = load_session(headers)
+    firebase_uid, profile = await current_profile(session_data)
+
+    try:
+        route = ROUTES.get((scope['method'], scope['path']))
+        if route is not None:
+            return await route(scope, receive, send, headers, session_data, profile)
+
+        extra_environ = {PREFETCHED_PROFILE_KEY: (firebase_uid, profile)} if firebase_uid else {}
+        await call_flask(scope, receive, send, extra_environ)
+    except RequestEntityTooLarge:
+        # Wird vor der ersten Antwortzeile geworfen (read_body)
+        await send_json(send, {'error': 'Request body too large'}, 413)
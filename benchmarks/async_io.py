@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark: concurrent requests that wait on Firestore, WSGI threads vs. asgi.py.
+
+Usage:
+    python benchmarks/async_io.py [concurrent_requests] [firestore_latency_ms] [threads]
+
+Firestore is replaced by a fixed delay per profile lookup (time.sleep for the
+sync client, asyncio.sleep for the async one) and the profile cache is
+switched off, so every request pays one round trip. The same burst of
+requests for /api/auth/status and /api/data is served once by the Flask app
+on a pool of ``threads`` worker threads (like gunicorn --threads) and once by
+asgi.app with ASGI_THREADS = ``threads``.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 50) / 1000
+    threads = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+
+    tmp_dir = tempfile.mkdtemp(prefix='brecher_bench_')
+    os.environ.pop('DATABASE_URL', None)
+    os.environ['SQLITE_DATABASE_PATH'] = os.path.join(tmp_dir, 'bench.db')
+    os.environ['ASGI_THREADS'] = str(threads)
+
+    import database
+    import firebase_auth
+    import firestore_users
+    from result_cache import TTLCache
+    database.init_database()
+    with open(os.path.join(ROOT, 'railway_migration.json'), 'r', encoding='utf-8') as f:
+        database.save_data(json.load(f))
+
+    import asgi
+    asgi.flask_module.ensure_database_initialized()
+
+    # Firestore mit fester Latenz, ohne Profil-Cache
+    profile = {'firebase_uid': 'bench', 'email': 'bench@example.com', 'display_name': 'Bench'}
+
+    def load_profile(firebase_uid):
+        time.sleep(latency)
+        return dict(profile)
+
+    async def load_profile_async(firebase_uid):
+        await asyncio.sleep(latency)
+        return dict(profile)
+
+    firebase_auth.firebase_app = object()
+    firebase_auth._firebase_checked = True
+    firestore_users._profile_cache = TTLCache(maxsize=0)
+    firestore_users._load_user_profile = load_profile
+    firestore_users._load_user_profile_async = load_profile_async
+
+    cookie = asgi.session_cookie({'firebase_user': {'firebase_uid': 'bench'}, 'authenticated': True})
+    headers = [(b'cookie', cookie.split(';')[0].encode('latin-1'))]
+
+    def scope(path):
+        return {'type': 'http', 'method': 'GET', 'path': path, 'query_string': b'',
+                'headers': headers, 'http_version': '1.1'}
+
+    def wsgi_request(path):
+        sent = []
+        asgi.run_wsgi(asgi.wsgi_environ(scope(path), b''), sent.append)
+        assert sent[0]['status'] == 200, sent[0]['status']
+
+    async def asgi_request(path):
+        sent = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b''}
+
+        async def send(message):
+            sent.append(message)
+
+        await asgi.app(scope(path), receive, send)
+        assert sent[0]['status'] == 200, sent[0]['status']
+
+    print(f"{requests} concurrent requests, Firestore latency {latency * 1000:.0f} ms, {threads} threads")
+    for path in ('/api/auth/status', '/api/data'):
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            started = time.perf_counter()
+            list(pool.map(wsgi_request, [path] * requests))
+            wsgi_ms = (time.perf_counter() - started) * 1000
+
+        async def burst():
+            await asyncio.gather(*(asgi_request(path) for _ in range(requests)))
+
+        started = time.perf_counter()
+        asyncio.run(burst())
+        asgi_ms = (time.perf_counter() - started) * 1000
+
+        print(f"{path:18} WSGI: {wsgi_ms:8.1f} ms   ASGI: {asgi_ms:8.1f} ms ({wsgi_ms / asgi_ms:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark: filling a whole person-week cell by cell vs. one /update_cells batch.
+
+Usage:
+    python benchmarks/batch_update.py [repetitions]
+
+Loads railway_migration.json into a throwaway SQLite database and writes the
+91 cells of one person-week through the Flask test client, once as 91
+/update_cell requests and once as a single /update_cells request.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def main():
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    tmp_dir = tempfile.mkdtemp(prefix='brecher_bench_')
+    os.environ.pop('DATABASE_URL', None)
+    os.environ['SQLITE_DATABASE_PATH'] = os.path.join(tmp_dir, 'bench.db')
+
+    import database
+    import app
+    database.init_database()
+    with open(os.path.join(ROOT, 'railway_migration.json'), 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    database.save_data(data)
+    app.initialize_data()
+    app.require_auth = lambda: True
+    client = app.app.test_client()
+
+    week = sorted(data)[-1]
+    person = app.NAMES[0]
+
+    def cells(round_no):
+        return [
+            {'week': week, 'person': person, 'day': day, 'category': category, 'value': str((round_no + i) % 3)}
+            for i, (day, category) in enumerate((day, category) for day in app.DAYS for category in app.CATEGORIES)
+        ]
+
+    started = time.perf_counter()
+    for round_no in range(repetitions):
+        for cell in cells(round_no):
+            client.post('/update_cell', json=cell)
+    single_ms = (time.perf_counter() - started) * 1000 / repetitions
+
+    started = time.perf_counter()
+    for round_no in range(repetitions):
+        client.post('/update_cells', json={'cells': cells(round_no)})
+    batch_ms = (time.perf_counter() - started) * 1000 / repetitions
+
+    count = len(cells(0))
+    print(f"{count} cells via /update_cell:  {single_ms:8.1f} ms per week")
+    print(f"{count} cells via /update_cells: {batch_ms:8.1f} ms per week ({single_ms / batch_ms:.0f}x faster)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Benchmark for database.save_data_bulk against a throwaway SQLite database.
+
+Usage:
+    python benchmarks/bulk_save.py [weeks]
+
+Writes weeks x 3 persons x 7 days x 13 categories cells (default: 20 weeks,
+5460 cells) twice - once into an empty table and once as a full rewrite -
+and prints rows written and elapsed time for both passes.
+"""
+
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+NAMES = ['David', 'Cedric', 'Müller']
+CATEGORIES = ['Gym', 'Food', 'Supps', 'Sleep', 'FH', 'Steps', 'Hausarbeit', 'Work', 'Study', 'Fehler', 'Morgenroutine', 'Abendroutine', 'PB']
+DAYS = ['Mo', 'Di', 'Mi', 'Do', 'Fr', 'Sa', 'So']
+
+
+def build_data(weeks):
+    rng = random.Random(42)
+    return {
+        f'KW{week}': {
+            person: {
+                day: {category: str(rng.randint(0, 10)) for category in CATEGORIES}
+                for day in DAYS
+            }
+            for person in NAMES
+        }
+        for week in range(1, weeks + 1)
+    }
+
+
+def main():
+    weeks = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    tmp_dir = tempfile.mkdtemp(prefix='brecher_bench_')
+    os.environ.pop('DATABASE_URL', None)
+    os.environ['SQLITE_DATABASE_PATH'] = os.path.join(tmp_dir, 'bench.db')
+
+    import database
+    database.init_database()
+
+    data = build_data(weeks)
+    for label in ('insert', 'rewrite'):
+        result = database.save_data_bulk(data)
+        print(f"{label:8s} {result['rows_written']:6d} rows in {result['elapsed_ms']:8.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark: chart data and category leaders from category_scores vs. from the cells.
+
+Usage:
+    python benchmarks/chart_aggregates.py [runs]
+
+For 52, 260 and 520 fully filled random weeks in a throwaway SQLite database
+(the last one is the open week) this measures
+
+    from cells     the old way: read every cell and add up calculate_points per week, person and category
+    cold           get_category_data_for_charts() + get_current_week_leaders() in a fresh process (one query on category_scores)
+    after edit     /update_cell on one week, then both again (only that week is read again)
+
+Prints the median over all runs.
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(ROOT))
+sys.path.insert(0, ROOT)
+
+from dashboard import build_synthetic_data
+
+
+def timed(fn):
+    started = time.perf_counter()
+    fn()
+    return (time.perf_counter() - started) * 1000
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+    tmp_dir = tempfile.mkdtemp(prefix='brecher_bench_')
+    os.environ.pop('DATABASE_URL', None)
+    os.environ['SQLITE_DATABASE_PATH'] = os.path.join(tmp_dir, 'bench.db')
+
+    import database
+    import app
+    from scoring import CATEGORIES, DAYS, score_categories
+    database.init_database()
+    client = app.app.test_client()
+    with client.session_transaction() as session:
+        session['authenticated'] = True
+
+    def from_cells():
+        for week_data in database.get_all_data().values():
+            for person in app.NAMES:
+                score_categories(week_data.get(person, {}))
+
+    def charts_and_leaders():
+        app.get_category_data_for_charts()
+        app.get_current_week_leaders()
+
+    def cold():
+        app.week_summaries.clear()
+        charts_and_leaders()
+
+    print(f"median of {runs} runs")
+    for synthetic_weeks in (52, 260, 520):
+        database.save_data(build_synthetic_data(synthetic_weeks, app.NAMES, DAYS, CATEGORIES))
+        database.invalidate_weeks_cache()
+        app.reload_data_store()
+        app.get_scoreboard_week = lambda: synthetic_weeks - 1
+
+        samples = {'from cells': [], 'cold': [], 'after edit': []}
+        for run in range(runs):
+            samples['from cells'].append(timed(from_cells))
+            samples['cold'].append(timed(cold))
+            client.post('/update_cell', json={'week': 'KW1', 'person': 'David', 'day': 'Mo', 'category': 'Food', 'value': str(run % 4)})
+            samples['after edit'].append(timed(charts_and_leaders))
+
+        print(f"{synthetic_weeks:4} weeks  " + '   '.join(
+            f"{name}: {statistics.median(values):8.2f} ms" for name, values in samples.items()))
+
+
+if __name__ == '__main__':
+    main()
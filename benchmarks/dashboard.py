@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the scoring work behind the dashboard (index route).
+
+Usage:
+    python benchmarks/dashboard.py [repetitions] [synthetic_weeks]
+
+Loads railway_migration.json (or, with synthetic_weeks, that many weeks of
+fully filled random cells) into a throwaway SQLite database, fills the
+data_store and times the functions index() calls per page load, once with
+the data version bumped before every load (as after an edit) and once
+served from the dashboard cache.
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def build_synthetic_data(weeks, names, days, categories):
+    rng = random.Random(42)
+    values = {
+        'Gym': ['0', '1', '2', 'R'], 'Fehler': ['0', '0', '1', '2'], 'Steps': ['8000', '12000', '16000'],
+        'Work': ['0', '200', '400'], 'Sleep': ['5.5', '7', '8', '9.5'],
+    }
+    return {
+        f'KW{week}': {
+            person: {
+                day: {category: rng.choice(values.get(category, ['0', '1', '2', '3', '4'])) for category in categories}
+                for day in days
+            }
+            for person in names
+        }
+        for week in range(1, weeks + 1)
+    }
+
+
+def main():
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    synthetic_weeks = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+
+    tmp_dir = tempfile.mkdtemp(prefix='brecher_bench_')
+    os.environ.pop('DATABASE_URL', None)
+    os.environ['SQLITE_DATABASE_PATH'] = os.path.join(tmp_dir, 'bench.db')
+
+    import database
+    import app
+    database.init_database()
+    if synthetic_weeks:
+        database.save_data(build_synthetic_data(synthetic_weeks, app.NAMES, app.DAYS, app.CATEGORIES))
+    else:
+        with open(os.path.join(ROOT, 'railway_migration.json'), 'r', encoding='utf-8') as f:
+            database.save_data(json.load(f))
+
+    app.initialize_data()
+
+    def render():
+        app.get_weekly_overview()
+        app.get_monthly_scoreboard()
+        app.get_total_scoreboard()
+        app.get_current_week_scoreboard()
+        app.get_daily_statistics()
+
+    def timed(bump):
+        started = time.perf_counter()
+        for _ in range(repetitions):
+            if bump:
+                app.bump_data_version()  # wie nach einem update_cell
+            render()
+        return (time.perf_counter() - started) * 1000
+
+    render()  # warm-up
+    uncached_ms = timed(bump=True)
+    cached_ms = timed(bump=False)
+
+    print(f"{repetitions} dashboard renders after an edit: {uncached_ms:.1f} ms total, {uncached_ms / repetitions:.2f} ms per render")
+    print(f"{repetitions} dashboard renders without edits: {cached_ms:.1f} ms total, {cached_ms / repetitions:.3f} ms per render")
+    print(f"cache: {app.dashboard_cache.stats()}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Fehler points of a person-week, per day vs. one prefix-sum pass.
+
+Usage:
+    python benchmarks/fehler_ledger.py [repetitions] [errors_per_day]
+
+Scores random person-weeks with up to errors_per_day errors per day three ways:
+
+    per error      the old calculate_fehler_points: walk the week error by error for every day
+    per day        scoring.calculate_fehler_points for every day (one pass per day)
+    one pass       scoring.fehler_points_by_day once for the whole week
+
+and checks that all three give the same points.
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scoring
+from cell_values import to_cell_value
+from scoring import DAYS
+
+
+def fehler_points_per_error(person_data, target_day):
+    """calculate_fehler_points vor der Präfixsumme (eine Position pro Fehler)"""
+    target_count = scoring.get_fehler_count(person_data.get(target_day, {}).get('Fehler', ''))
+    if target_count is None or target_count <= 0:
+        return 0
+    total_points = 0
+    error_position = 1
+    for day in DAYS:
+        count = scoring.get_fehler_count(person_data.get(day, {}).get('Fehler', ''))
+        if count is not None and count > 0:
+            if day == target_day:
+                for _ in range(count):
+                    total_points += 0 if error_position == 1 else -2
+                    error_position += 1
+                break
+            error_position += count
+    return total_points
+
+
+def timed(fn, weeks, repetitions):
+    started = time.perf_counter()
+    for _ in range(repetitions):
+        results = [fn(person_data) for person_data in weeks]
+    return (time.perf_counter() - started) * 1000 / repetitions, results
+
+
+def main():
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    errors_per_day = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    rng = random.Random(42)
+    weeks = [
+        {day: {'Fehler': to_cell_value(str(rng.randint(0, errors_per_day)))} for day in DAYS}
+        for _ in range(1000)
+    ]
+
+    variants = {
+        'per error': lambda person_data: {day: fehler_points_per_error(person_data, day) for day in DAYS},
+        'per day': lambda person_data: {day: scoring.calculate_fehler_points(person_data, day) for day in DAYS},
+        'one pass': scoring.fehler_points_by_day,
+    }
+    print(f"1000 person-weeks, 0-{errors_per_day} errors per day, {repetitions} repetitions")
+    expected = None
+    for name, fn in variants.items():
+        elapsed_ms, results = timed(fn, weeks, repetitions)
+        if expected is None:
+            expected = results
+        status = '✅' if results == expected else '❌ different points'
+        print(f"{name:10} {elapsed_ms:8.2f} ms {status}")
+
+
+if __name__ == '__main__':
+    main()
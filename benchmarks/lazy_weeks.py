@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark: loading the whole history at startup vs. lazy per-week loading.
+
+Usage:
+    python benchmarks/lazy_weeks.py [synthetic_weeks]
+
+Writes that many fully filled random weeks into a throwaway SQLite database
+and compares the old startup (every week into the data_store) with
+reload_data_store(), which only loads the hot weeks. Afterwards every week
+is opened once through load_week() under DATA_STORE_BUDGET_KB and the size
+of the data_store is printed.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(ROOT))
+sys.path.insert(0, ROOT)
+
+from dashboard import build_synthetic_data
+
+
+def main():
+    synthetic_weeks = int(sys.argv[1]) if len(sys.argv) > 1 else 520
+
+    tmp_dir = tempfile.mkdtemp(prefix='brecher_bench_')
+    os.environ.pop('DATABASE_URL', None)
+    os.environ['SQLITE_DATABASE_PATH'] = os.path.join(tmp_dir, 'bench.db')
+
+    import database
+    import app
+    from scoring import CATEGORIES, DAYS
+    database.init_database()
+    database.save_data(build_synthetic_data(synthetic_weeks, app.NAMES, DAYS, CATEGORIES))
+
+    started = time.perf_counter()
+    app.data_store.load(database.get_all_data())
+    eager_ms = (time.perf_counter() - started) * 1000
+    eager_kb = app.data_store.total_bytes() / 1024
+
+    app.data_store.load({})  # frischer Prozess
+    started = time.perf_counter()
+    app.reload_data_store()
+    lazy_ms = (time.perf_counter() - started) * 1000
+    lazy_kb = app.data_store.total_bytes() / 1024
+
+    for week in range(1, synthetic_weeks + 1):
+        app.load_week(f'KW{week}')
+        app.enforce_memory_budget()
+    stats = app.data_store.stats()
+
+    print(f"{synthetic_weeks} weeks")
+    print(f"all weeks at startup: {eager_ms:8.1f} ms, {eager_kb:8.0f} KB")
+    print(f"hot weeks at startup: {lazy_ms:8.1f} ms, {lazy_kb:8.0f} KB")
+    print(f"after opening every week: {stats['weeks']} weeks, {stats['bytes'] / 1024:.0f} KB "
+          f"(budget {app.app_config.DATA_STORE_BUDGET_KB} KB, {stats['evictions']} evictions)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Compare the NumPy scoring kernel with the scalar scoring functions.
+
+Usage:
+    python benchmarks/numpy_scoring.py [repetitions] [synthetic_weeks]
+
+Scores the whole history of railway_migration.json (or of that many weeks of
+random cells) once per repetition with scoring.score_person_week and with
+vector_scoring.ScoreCube, checks that daily totals, weekly totals, bonus,
+colours and per-category points are identical and prints both timings.
+"""
+
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(ROOT))
+sys.path.insert(0, ROOT)
+
+import scoring
+import vector_scoring
+from cell_values import to_cell_value
+from dashboard import build_synthetic_data
+from scoring import CATEGORIES, DAYS
+
+NAMES = ['David', 'Cedric', 'Müller']
+
+
+def scalar_scores(data):
+    scores = {}
+    for week, week_data in data.items():
+        for person in NAMES:
+            person_data = week_data.get(person, {})
+            category_points = {}
+            for category in CATEGORIES:
+                total = 0
+                for day in DAYS:
+                    total += scoring.calculate_points(category, person_data.get(day, {}).get(category, ''))
+                category_points[category] = round(total, 2)
+            colors = {
+                day: {category: scoring.get_cell_color(category, person_data.get(day, {}).get(category, ''), person_data, day)
+                      for category in CATEGORIES}
+                for day in DAYS
+            }
+            scores[(week, person)] = (scoring.score_person_week(person_data), category_points, colors)
+    return scores
+
+
+def compare(result, scores):
+    mismatches = 0
+    for w, week in enumerate(result.weeks):
+        for p, person in enumerate(NAMES):
+            expected, category_points, colors = scores[(week, person)]
+            actual = (
+                {day: result.daily[w, p, d].item() for d, day in enumerate(DAYS)},
+                result.bonus[w, p].item(),
+                result.weekly[w, p].item(),
+                {category: result.category_weekly[w, p, c].item() for c, category in enumerate(CATEGORIES)},
+                result.color_names(week, person),
+            )
+            if actual != (expected['daily'], expected['bonus'], expected['total'], category_points, colors):
+                mismatches += 1
+                print(f"❌ {week} {person}: {actual[2]} != {expected['total']}")
+    return mismatches
+
+
+def main():
+    if not vector_scoring.is_available():
+        print('numpy is not installed')
+        sys.exit(1)
+
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    synthetic_weeks = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+
+    if synthetic_weeks:
+        raw = build_synthetic_data(synthetic_weeks, NAMES, DAYS, CATEGORIES)
+    else:
+        with open(os.path.join(os.path.dirname(ROOT), 'railway_migration.json'), 'r', encoding='utf-8') as f:
+            raw = json.load(f)
+    data = {
+        week: {person: {day: {category: to_cell_value(value) for category, value in day_data.items()}
+                        for day, day_data in person_data.items()}
+               for person, person_data in week_data.items()}
+        for week, week_data in raw.items()
+    }
+
+    started = time.perf_counter()
+    for _ in range(repetitions):
+        scores = scalar_scores(data)
+    scalar_ms = (time.perf_counter() - started) * 1000 / repetitions
+
+    cube = vector_scoring.ScoreCube(NAMES)
+    started = time.perf_counter()
+    cube.load(data)
+    load_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    for _ in range(repetitions):
+        result = cube._compute()  # score() würde das Ergebnis cachen
+    vector_ms = (time.perf_counter() - started) * 1000 / repetitions
+
+    mismatches = compare(result, scores)
+    print(f"{len(data)} weeks: scalar {scalar_ms:.2f} ms, numpy {vector_ms:.2f} ms per full scoring "
+          f"(cube load {load_ms:.2f} ms), {mismatches} mismatches")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark: profile statistics (calculate_user_statistics) vs. length of the history.
+
+Usage:
+    python benchmarks/profile_stats.py [runs]
+
+For 52, 260 and 520 fully filled random weeks in a throwaway SQLite database
+(the last one is the open week, all others are closed) this measures
+
+    full fold      first call, every closed week is folded into the career_ledger
+    profile view   later calls, only the open week is computed
+    after edit     an edit of a closed week, then the profile (refolds one week)
+
+Prints the median over all runs.
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(ROOT))
+sys.path.insert(0, ROOT)
+
+from dashboard import build_synthetic_data
+
+
+def timed(fn):
+    started = time.perf_counter()
+    fn()
+    return (time.perf_counter() - started) * 1000
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    tmp_dir = tempfile.mkdtemp(prefix='brecher_bench_')
+    os.environ.pop('DATABASE_URL', None)
+    os.environ['SQLITE_DATABASE_PATH'] = os.path.join(tmp_dir, 'bench.db')
+
+    import database
+    import app
+    from scoring import CATEGORIES, DAYS
+    database.init_database()
+    client = app.app.test_client()
+    with client.session_transaction() as session:
+        session['authenticated'] = True
+
+    print(f"median of {runs} runs")
+    for synthetic_weeks in (52, 260, 520):
+        database.save_data(build_synthetic_data(synthetic_weeks, app.NAMES, DAYS, CATEGORIES))
+        database.invalidate_weeks_cache()
+        app.reload_data_store()
+        app.get_scoreboard_week = lambda: synthetic_weeks - 1
+
+        def full_fold():
+            app.invalidate_scores()
+            app.calculate_user_statistics('David')
+
+        def edit():
+            value = str(len(samples['after edit']) % 50)
+            client.post('/update_cell', json={'week': 'KW1', 'person': 'David', 'day': 'Mo', 'category': 'Steps', 'value': value})
+
+        samples = {'full fold': [], 'profile view': [], 'after edit': []}
+        for _ in range(runs):
+            samples['full fold'].append(timed(full_fold))
+            samples['profile view'].append(timed(lambda: app.calculate_user_statistics('David')))
+            edit()
+            samples['after edit'].append(timed(lambda: app.calculate_user_statistics('David')))
+
+        print(f"{synthetic_weeks:4} weeks  " + '   '.join(
+            f"{name}: {statistics.median(values):7.2f} ms" for name, values in samples.items()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark: reading one season out of a multi-year history.
+
+Usage:
+    python benchmarks/season_range.py [years] [runs]
+
+Seeds a throwaway SQLite database with ``years`` seasons of 52 fully filled
+random weeks (every season saved as seen from its own autumn, so the same
+'KW<n>' labels land in different ISO years) and measures
+
+    all years      get_all_data(): every row of every season (weeks list, exports)
+    season         get_all_data(first, last): only the (iso_year, iso_week) range of
+                   the last season, as the scoreboards/charts read it with SEASON_START
+    scoreboards    get_weekly_scores_range() for that season (one range scan on weekly_scores)
+    all scores     get_weekly_scores(): weekly totals of every year (profile statistics)
+
+Prints the median over all runs.
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(ROOT))
+sys.path.insert(0, ROOT)
+
+from dashboard import build_synthetic_data
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - started) * 1000, result
+
+
+def main():
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    tmp_dir = tempfile.mkdtemp(prefix='brecher_bench_')
+    os.environ.pop('DATABASE_URL', None)
+    os.environ['SQLITE_DATABASE_PATH'] = os.path.join(tmp_dir, 'bench.db')
+
+    import database
+    import week_keys
+    from scoring import CATEGORIES, DAYS
+    from week_keys import season_range
+    database.init_database()
+    names = ['David', 'Cedric', 'Müller']
+
+    today = date.today()
+    real_today = week_keys._today
+    for years_back in range(years - 1, -1, -1):
+        season_day = today.replace(year=today.year - years_back)
+        week_keys._today = lambda day, season_day=season_day: season_day if day is None else real_today(day)
+        database.invalidate_weeks_cache()
+        database.save_data(build_synthetic_data(52, names, DAYS, CATEGORIES))
+    week_keys._today = real_today
+    database.invalidate_weeks_cache()
+
+    # Feste Saison wie SEASON_START: die letzten 52 Wochen
+    start = (today - timedelta(weeks=51)).isocalendar()[:2]
+    season = season_range(start)
+
+    cases = {
+        'all years': database.get_all_data,
+        'season': lambda: database.get_all_data(*season),
+        'scoreboards': lambda: database.get_weekly_scores_range(*season),
+        'all scores': database.get_weekly_scores,
+    }
+    print(f"{years} seasons of 52 weeks, median of {runs} runs")
+    for name, fn in cases.items():
+        samples = []
+        for _ in range(runs):
+            elapsed, result = timed(fn)
+            samples.append(elapsed)
+        print(f"{name:13} {statistics.median(samples):9.2f} ms   ({len(result)} entries)")
+
+
+if __name__ == '__main__':
+    main()
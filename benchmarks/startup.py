@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cold start of a worker (import time and time to first response).
+
+Usage:
+    python benchmarks/startup.py [runs]
+
+Every run starts a fresh Python process that imports app.py and requests /
+with a logged-in session, on a throwaway SQLite database with the data of
+railway_migration.json:
+
+    ddl on boot   the schema was never migrated, the first request runs init_database()
+    migrated      python database.py migrate ran before, the first request only checks the schema version
+    warmed up     migrated, and warm_up() finished before the first request
+
+Prints the median over all runs.
+"""
+
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = '''
+import json, sys, time
+started = time.perf_counter()
+import app
+import_ms = (time.perf_counter() - started) * 1000
+client = app.app.test_client()
+with client.session_transaction() as session:
+    session['authenticated'] = True
+if sys.argv[1] == 'warm':
+    app.start_warm_up().join()
+started = time.perf_counter()
+status = client.get('/').status_code
+print(json.dumps({'import_ms': import_ms, 'first_ms': (time.perf_counter() - started) * 1000, 'status': status}))
+'''
+
+
+def run_child(mode, db_path):
+    env = dict(os.environ, SQLITE_DATABASE_PATH=db_path)
+    env.pop('DATABASE_URL', None)
+    output = subprocess.run([sys.executable, '-c', CHILD, mode], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    assert result['status'] == 200, result
+    return result
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    tmp_dir = tempfile.mkdtemp(prefix='brecher_bench_')
+    migrated_db = os.path.join(tmp_dir, 'migrated.db')
+    env = dict(os.environ, SQLITE_DATABASE_PATH=migrated_db)
+    env.pop('DATABASE_URL', None)
+    seed = ('import json, database; database.migrate_database(); '
+            'database.save_data(json.load(open("railway_migration.json", encoding="utf-8")))')
+    subprocess.run([sys.executable, '-c', seed], cwd=ROOT, env=env, capture_output=True, check=True)
+
+    results = {'ddl on boot': [], 'migrated': [], 'warmed up': []}
+    for _ in range(runs):
+        # Datenbank von vor der Migration: ohne schema_version
+        old_db = os.path.join(tmp_dir, 'old.db')
+        shutil.copy(migrated_db, old_db)
+        subprocess.run([sys.executable, '-c', 'import sqlite3, sys; sqlite3.connect(sys.argv[1]).execute("DROP TABLE schema_version").connection.commit()', old_db],
+                       check=True)
+        results['ddl on boot'].append(run_child('cold', old_db))
+        results['migrated'].append(run_child('cold', migrated_db))
+        results['warmed up'].append(run_child('warm', migrated_db))
+
+    print(f"median of {runs} fresh processes")
+    for name, samples in results.items():
+        import_ms = statistics.median(sample['import_ms'] for sample in samples)
+        first_ms = statistics.median(sample['first_ms'] for sample in samples)
+        print(f"{name:12} import app: {import_ms:7.1f} ms   first response: {first_ms:7.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
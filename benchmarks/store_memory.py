@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Memory per stored week: nested dict data_store vs. CompactStore.
+
+Usage:
+    python benchmarks/store_memory.py [synthetic_weeks]
+
+Builds the data of railway_migration.json (or that many weeks of fully
+filled random cells) once as the nested dict of CellValues that
+database.get_all_data() returns and once as a CompactStore, both padded with
+empty cells like initialize_data(), and prints the bytes allocated per week
+(measured with tracemalloc).
+"""
+
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(ROOT))
+sys.path.insert(0, ROOT)
+
+from cell_values import EMPTY_VALUE, to_cell_value
+from compact_store import CompactStore
+from dashboard import build_synthetic_data
+from scoring import CATEGORIES, DAYS
+
+NAMES = ['David', 'Cedric', 'Müller']
+
+
+def build_nested(raw):
+    data = {
+        week: {person: {day: {category: to_cell_value(value) for category, value in day_data.items()}
+                        for day, day_data in person_data.items()}
+               for person, person_data in week_data.items()}
+        for week, week_data in raw.items()
+    }
+    # Auffüllen wie initialize_data() vor dem CompactStore
+    for week_data in data.values():
+        for person in NAMES:
+            person_data = week_data.setdefault(person, {})
+            for day in DAYS:
+                day_data = person_data.setdefault(day, {})
+                for category in CATEGORIES:
+                    day_data.setdefault(category, EMPTY_VALUE)
+    return data
+
+
+def build_compact(raw):
+    store = CompactStore(NAMES)
+    store.load(raw)
+    for week in store:
+        store.fill(week)
+    return store
+
+
+def measure(build, raw):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build(raw)
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return result, used
+
+
+def main():
+    synthetic_weeks = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+
+    if synthetic_weeks:
+        raw = build_synthetic_data(synthetic_weeks, NAMES, DAYS, CATEGORIES)
+    else:
+        with open(os.path.join(os.path.dirname(ROOT), 'railway_migration.json'), 'r', encoding='utf-8') as f:
+            raw = json.load(f)
+    weeks = len(raw)
+
+    nested, nested_bytes = measure(build_nested, raw)
+    del nested
+    store, compact_bytes = measure(build_compact, raw)
+
+    print(f"{weeks} weeks, {store.stats()['cells']} non-empty cells")
+    print(f"nested dict:  {nested_bytes / weeks:10.0f} bytes/week")
+    print(f"CompactStore: {compact_bytes / weeks:10.0f} bytes/week ({compact_bytes / nested_bytes:.0%})")
+
+
+if __name__ == '__main__':
+    main()
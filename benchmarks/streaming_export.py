@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark: peak memory and time of a full export, in memory vs. streamed.
+
+Usage:
+    python benchmarks/streaming_export.py [max_years]
+
+Seeds a throwaway SQLite database with 1, 2, ... max_years seasons of 52
+fully filled random weeks (as in season_range.py) and exports every season
+after each step:
+
+    in memory    the old way: nest all rows into one dict, then json.dumps() it
+    streamed     iter_weeks() + ndjson_chunks() written to a file, one week at a time
+
+Peak memory is measured with tracemalloc (Python allocations only).
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(ROOT))
+sys.path.insert(0, ROOT)
+
+from dashboard import build_synthetic_data
+
+
+def measured(fn):
+    tracemalloc.start()
+    started = time.perf_counter()
+    fn()
+    elapsed = (time.perf_counter() - started) * 1000
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024
+
+
+def main():
+    max_years = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+
+    tmp_dir = tempfile.mkdtemp(prefix='brecher_bench_')
+    os.environ.pop('DATABASE_URL', None)
+    os.environ['SQLITE_DATABASE_PATH'] = os.path.join(tmp_dir, 'bench.db')
+    export_path = os.path.join(tmp_dir, 'export.ndjson')
+
+    import json
+    import database
+    import week_keys
+    from scoring import CATEGORIES, DAYS
+    database.init_database()
+    names = ['David', 'Cedric', 'Müller']
+
+    def in_memory():
+        data = {f'{year}-{week}': week_data for (year, week), week_data in database.get_all_years_data().items()}
+        json.dumps(data, ensure_ascii=False)
+
+    def streamed():
+        with open(export_path, 'w', encoding='utf-8') as f:
+            for chunk in database.ndjson_chunks(database.iter_weeks()):
+                f.write(chunk)
+
+    today = date.today()
+    real_today = week_keys._today
+    for years in range(1, max_years + 1):
+        season_day = today.replace(year=today.year - years + 1)
+        week_keys._today = lambda day, season_day=season_day: season_day if day is None else real_today(day)
+        database.invalidate_weeks_cache()
+        database.save_data(build_synthetic_data(52, names, DAYS, CATEGORIES))
+        week_keys._today = real_today
+
+        results = {name: measured(fn) for name, fn in (('in memory', in_memory), ('streamed', streamed))}
+        print(f"{years:2} seasons  " + '   '.join(
+            f"{name}: {elapsed:7.1f} ms {peak:6.2f} MB" for name, (elapsed, peak) in results.items()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Running career statistics per person for the profile page.
+
+The ledger holds the contribution of every closed week (a week that is shown
+on the scoreboard, see app.get_scoreboard_week) and the running totals of
+wins, points and completed weeks per person. A closed week is folded in once;
+when it changes afterwards it is unfolded again and folded with its new
+values on the next read. Open weeks are not kept here, the profile adds them
+live.
+"""
+
+import threading
+
+
+class CareerLedger:
+    """Wins, total points and completed weeks per person over the folded weeks"""
+
+    def __init__(self, names):
+        self.names = list(names)
+        self._weeks = {}  # (ISO-Jahr, Woche) -> {person: (points, won, completed)}
+        self._totals = {person: [0, 0, 0] for person in self.names}
+        self._lock = threading.RLock()
+        self.folds = 0
+
+    def __contains__(self, week):
+        return week in self._weeks
+
+    def folded_weeks(self):
+        with self._lock:
+            return set(self._weeks)
+
+    def fold(self, week, contribution):
+        """Add one closed week ({person: (points, won, completed)}) to the totals"""
+        with self._lock:
+            self.unfold(week)
+            self._weeks[week] = contribution
+            for person, (points, won, completed) in contribution.items():
+                totals = self._totals[person]
+                totals[0] += int(won)
+                totals[1] += points
+                totals[2] += int(completed)
+            self.folds += 1
+
+    def unfold(self, week):
+        """Remove a week from the totals (it changed or is no longer closed)"""
+        with self._lock:
+            contribution = self._weeks.pop(week, None)
+            if contribution is None:
+                return False
+            for person, (points, won, completed) in contribution.items():
+                totals = self._totals[person]
+                totals[0] -= int(won)
+                totals[1] -= points
+                totals[2] -= int(completed)
+            return True
+
+    def clear(self):
+        with self._lock:
+            self._weeks.clear()
+            self._totals = {person: [0, 0, 0] for person in self.names}
+
+    def totals(self, person):
+        """(wins, points, completed_weeks) of person over the folded weeks"""
+        with self._lock:
+            wins, points, completed = self._totals[person]
+            return wins, points, completed
+
+    def stats(self):
+        with self._lock:
+            return {'weeks': len(self._weeks), 'folds': self.folds}
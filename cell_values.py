@@ -0,0 +1,75 @@
+from enum import IntEnum
+
+
+class ValueFlag(IntEnum):
+    """Art eines Zellwerts (wird als value_flag in brecher_data gespeichert)"""
+    EMPTY = 0   # '' / None / nur Leerzeichen
+    NUMBER = 1  # numerischer Wert, steht in num_value
+    REST = 2    # Gym 'R' (Rest Day)
+    TEXT = 3    # sonstiger, nicht auswertbarer Text
+
+
+# Kurznamen für die Scoring-Schleifen (spart den Enum-Attributzugriff pro Zelle)
+FLAG_EMPTY = ValueFlag.EMPTY
+FLAG_NUMBER = ValueFlag.NUMBER
+FLAG_REST = ValueFlag.REST
+FLAG_TEXT = ValueFlag.TEXT
+
+
+def parse_value(value):
+    """Parse a raw cell value once into (num, flag)"""
+    if not value or not str(value).strip():
+        return None, ValueFlag.EMPTY
+
+    try:
+        return float(value), ValueFlag.NUMBER
+    except (TypeError, ValueError):
+        pass
+
+    if str(value).upper() == 'R':
+        return None, ValueFlag.REST
+    return None, ValueFlag.TEXT
+
+
+class CellValue(str):
+    """Zellwert als String, der seine geparste Form mitträgt
+
+    Behaves exactly like the raw string for templates, jsonify and the
+    database, while the scoring functions read ``num`` and ``flag`` instead of
+    calling float() again.
+    """
+
+    def __new__(cls, value=''):
+        self = str.__new__(cls, value)
+        self.num, self.flag = parse_value(value)
+        return self
+
+    @classmethod
+    def from_parts(cls, value, num, flag):
+        """Build a CellValue from already parsed database columns"""
+        if flag is None or (flag == ValueFlag.NUMBER and num is None):
+            # Zeile ohne typisierte Spalten (vor der Migration geschrieben)
+            return cls(value or '')
+        self = str.__new__(cls, value or '')
+        self.num = num
+        self.flag = ValueFlag(flag)
+        return self
+
+
+EMPTY_VALUE = CellValue('')
+
+
+def to_cell_value(value):
+    """Convert an incoming raw value to a CellValue (falsy values become empty)"""
+    if isinstance(value, CellValue):
+        return value
+    if not value:
+        return EMPTY_VALUE
+    return CellValue(str(value))
+
+
+def value_parts(value):
+    """Return (num, flag) for a value, parsing only if it is not a CellValue yet"""
+    if isinstance(value, CellValue):
+        return value.num, value.flag
+    return parse_value(value)
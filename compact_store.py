@@ -0,0 +1,363 @@
+"""
+Compact in-memory store for the cell values (replaces the nested dict data_store).
+
+Persons, days and categories are mapped to integer indices. A week is a list
+of person rows, a person row a list of day rows and a day row a plain list of
+values indexed by category, so a stored week costs a few small lists instead
+of four levels of dicts. Cells that were never stored are None, empty cells
+all point to the shared EMPTY_VALUE and identical values share one CellValue
+object (see intern_value), so no object is allocated per cell.
+
+CompactStore, WeekView, PersonView and DayView behave like the nested dicts
+for reading and writing (``store[week][person][day][category] = value``,
+``.get()``, ``.items()``, ``in``), including which keys exist; to_dict()
+builds the plain nested dict for jsonify.
+
+The store keeps its weeks in least-recently-used order: evict() drops the
+coldest weeks until the store fits into a byte budget (see week_bytes).
+Loading weeks on demand is up to the caller (load_week in app.py).
+"""
+
+import sys
+import weakref
+from collections import OrderedDict
+from collections.abc import Mapping, MutableMapping
+
+from cell_values import EMPTY_VALUE, to_cell_value
+from scoring import CATEGORIES, DAYS
+
+# Ein CellValue pro unterschiedlichem Wert ('0', '1', 'R', ...) statt einem pro Zelle
+_interned_values = weakref.WeakValueDictionary()
+
+def intern_value(value):
+    """Return a shared CellValue for value"""
+    value = to_cell_value(value)
+    if not value:
+        return EMPTY_VALUE
+    key = str(value)
+    shared = _interned_values.get(key)
+    if shared is None:
+        _interned_values[key] = shared = value
+    return shared
+
+
+class _Axis:
+    """Key <-> index mapping of one dimension (grows for unknown keys)"""
+
+    __slots__ = ('keys', 'index')
+
+    def __init__(self, keys):
+        self.keys = list(keys)
+        self.index = {key: i for i, key in enumerate(self.keys)}
+
+    def add(self, key):
+        i = self.index.get(key)
+        if i is None:
+            i = len(self.keys)
+            self.keys.append(key)
+            self.index[key] = i
+        return i
+
+
+def _at(items, i):
+    if items is None or i is None or i >= len(items):
+        return None
+    return items[i]
+
+def _set_at(items, i, value):
+    if i >= len(items):
+        items.extend([None] * (i + 1 - len(items)))
+    items[i] = value
+
+
+class CompactStore(MutableMapping):
+    """week -> person -> day -> category -> CellValue, stored as index-based lists"""
+
+    def __init__(self, names, days=DAYS, categories=CATEGORIES):
+        self.names = list(names)
+        self.fill_days = list(days)
+        self.fill_categories = list(categories)
+        self.persons = _Axis(names)
+        self.days = _Axis(days)
+        self.categories = _Axis(categories)
+        self._weeks = OrderedDict()  # week -> [person row | None], zuletzt benutzte Woche am Ende
+        self._sizes = {}  # week -> Bytes (siehe week_bytes)
+        self.evictions = 0
+
+    # --- Mapping über Wochen ---
+
+    def __getitem__(self, week):
+        if week not in self._weeks:
+            raise KeyError(week)
+        self._weeks.move_to_end(week)
+        return WeekView(self, week)
+
+    def __setitem__(self, week, week_data):
+        self._weeks[week] = []
+        self._weeks.move_to_end(week)
+        self._sizes.pop(week, None)
+        for person, person_data in week_data.items():
+            self._person_row(week, person)
+            for day, day_data in person_data.items():
+                self._day_row(week, person, day)
+                for category, value in day_data.items():
+                    self.set_value(week, person, day, category, value)
+
+    def __delitem__(self, week):
+        del self._weeks[week]
+        self._sizes.pop(week, None)
+
+    def __iter__(self):
+        # Kopie: Zugriffe beim Iterieren ändern die LRU-Reihenfolge
+        return iter(list(self._weeks))
+
+    def __len__(self):
+        return len(self._weeks)
+
+    def __contains__(self, week):
+        return week in self._weeks
+
+    # --- Zeilen und Zellen ---
+
+    def _person_row(self, week, person):
+        """Person row of a week, created if missing"""
+        week_rows = self._weeks.setdefault(week, [])
+        p = self.persons.add(person)
+        person_row = _at(week_rows, p)
+        if person_row is None:
+            person_row = []
+            _set_at(week_rows, p, person_row)
+            self._sizes.pop(week, None)
+        return person_row
+
+    def _day_row(self, week, person, day):
+        """Day row of a person-week, created if missing"""
+        person_row = self._person_row(week, person)
+        d = self.days.add(day)
+        day_row = _at(person_row, d)
+        if day_row is None:
+            day_row = []
+            _set_at(person_row, d, day_row)
+            self._sizes.pop(week, None)
+        return day_row
+
+    def load(self, data):
+        """Replace the whole content with a nested week/person/day/category dict"""
+        self._weeks = OrderedDict()
+        self._sizes = {}
+        for week, week_data in data.items():
+            self[week] = week_data
+
+    def get_value(self, week, person, day, category, default=''):
+        week_rows = self._weeks.get(week)
+        if week_rows is not None:
+            self._weeks.move_to_end(week)
+        person_row = _at(week_rows, self.persons.index.get(person))
+        day_row = _at(person_row, self.days.index.get(day))
+        value = _at(day_row, self.categories.index.get(category))
+        return default if value is None else value
+
+    def set_value(self, week, person, day, category, value):
+        day_row = self._day_row(week, person, day)
+        c = self.categories.add(category)
+        if c >= len(day_row):
+            self._sizes.pop(week, None)
+        _set_at(day_row, c, intern_value(value))
+
+    def add_week(self, week):
+        """Lege eine leere Woche an, falls sie noch nicht existiert"""
+        self._weeks.setdefault(week, [])
+
+    def fill(self, week, person=None, day=None):
+        """Lege alle fehlenden Personen/Tage/Kategorien als '' an (wie initialize_data)
+
+        Empty cells only cost a pointer to the shared EMPTY_VALUE.
+        """
+        persons = self.names if person is None else [person]
+        days = self.fill_days if day is None else [day]
+        self._weeks.setdefault(week, [])
+        for fill_person in persons:
+            for fill_day in days:
+                day_row = self._day_row(week, fill_person, fill_day)
+                for category in self.fill_categories:
+                    c = self.categories.index[category]
+                    if _at(day_row, c) is None:
+                        _set_at(day_row, c, EMPTY_VALUE)
+
+    def to_dict(self):
+        """Plain nested dict (for jsonify / JSON backups)"""
+        return {week: self[week].to_dict() for week in self}
+
+    def week_bytes(self, week):
+        """Memory of one week: its row lists (the values are shared, see intern_value)"""
+        size = self._sizes.get(week)
+        if size is None:
+            week_rows = self._weeks[week]
+            size = sys.getsizeof(week_rows)
+            for person_row in week_rows:
+                if person_row is not None:
+                    size += sys.getsizeof(person_row)
+                    size += sum(sys.getsizeof(day_row) for day_row in person_row if day_row is not None)
+            self._sizes[week] = size
+        return size
+
+    def total_bytes(self):
+        return sum(self.week_bytes(week) for week in self._weeks)
+
+    def evict(self, budget, pinned=()):
+        """Drop least recently used weeks until the store fits into budget bytes
+
+        Weeks in pinned are never dropped. Returns the dropped weeks.
+        """
+        total = self.total_bytes()
+        evicted = []
+        for week in list(self._weeks):
+            if total <= budget:
+                break
+            if week in pinned:
+                continue
+            total -= self.week_bytes(week)
+            del self[week]
+            evicted.append(week)
+        self.evictions += len(evicted)
+        return evicted
+
+    def stats(self):
+        """Anzahl Wochen, Tageszeilen, nicht-leerer Zellen und Bytes"""
+        day_rows = 0
+        cells = 0
+        for week_rows in self._weeks.values():
+            for person_row in week_rows:
+                for day_row in person_row or ():
+                    if day_row is not None:
+                        day_rows += 1
+                        cells += sum(1 for value in day_row if value)
+        return {
+            'weeks': len(self._weeks),
+            'day_rows': day_rows,
+            'cells': cells,
+            'bytes': self.total_bytes(),
+            'evictions': self.evictions,
+            'interned_values': len(_interned_values),
+        }
+
+
+class _View(MutableMapping):
+    """Dict-artige Sicht auf eine Zeile des Stores
+
+    Subclasses provide _items() (the row, may be None), _axis() and _child().
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        value = _at(self._items(), self._axis().index.get(key))
+        if value is None:
+            raise KeyError(key)
+        return self._child(key, value)
+
+    def get(self, key, default=None):
+        value = _at(self._items(), self._axis().index.get(key))
+        if value is None:
+            return default
+        return self._child(key, value)
+
+    def __contains__(self, key):
+        return _at(self._items(), self._axis().index.get(key)) is not None
+
+    def __iter__(self):
+        keys = self._axis().keys
+        return iter([keys[i] for i, value in enumerate(self._items() or ()) if value is not None])
+
+    def __len__(self):
+        return sum(1 for value in self._items() or () if value is not None)
+
+    def items(self):
+        keys = self._axis().keys
+        return [(keys[i], self._child(keys[i], value)) for i, value in enumerate(self._items() or ()) if value is not None]
+
+    def values(self):
+        return [value for _, value in self.items()]
+
+    def __delitem__(self, key):
+        raise TypeError(f'{type(self).__name__} does not support deleting keys')
+
+    def to_dict(self):
+        return {key: value.to_dict() if isinstance(value, _View) else value for key, value in self.items()}
+
+    def __eq__(self, other):
+        if isinstance(other, Mapping):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+
+class WeekView(_View):
+    __slots__ = ('store', 'week')
+
+    def __init__(self, store, week):
+        self.store = store
+        self.week = week
+
+    def _items(self):
+        return self.store._weeks.get(self.week)
+
+    def _axis(self):
+        return self.store.persons
+
+    def _child(self, person, row):
+        return PersonView(self.store, self.week, person)
+
+    def __setitem__(self, person, person_data):
+        self.store._person_row(self.week, person)
+        for day, day_data in person_data.items():
+            PersonView(self.store, self.week, person)[day] = day_data
+
+
+class PersonView(_View):
+    __slots__ = ('store', 'week', 'person')
+
+    def __init__(self, store, week, person):
+        self.store = store
+        self.week = week
+        self.person = person
+
+    def _items(self):
+        return _at(self.store._weeks.get(self.week), self.store.persons.index.get(self.person))
+
+    def _axis(self):
+        return self.store.days
+
+    def _child(self, day, row):
+        return DayView(self.store, self.week, self.person, day)
+
+    def __setitem__(self, day, day_data):
+        self.store._day_row(self.week, self.person, day)
+        for category, value in day_data.items():
+            self.store.set_value(self.week, self.person, day, category, value)
+
+
+class DayView(_View):
+    __slots__ = ('store', 'week', 'person', 'day')
+
+    def __init__(self, store, week, person, day):
+        self.store = store
+        self.week = week
+        self.person = person
+        self.day = day
+
+    def _items(self):
+        store = self.store
+        person_row = _at(store._weeks.get(self.week), store.persons.index.get(self.person))
+        return _at(person_row, store.days.index.get(self.day))
+
+    def _axis(self):
+        return self.store.categories
+
+    def _child(self, category, value):
+        return value
+
+    def __setitem__(self, category, value):
+        self.store.set_value(self.week, self.person, self.day, category, value)
@@ -1,7 +1,9 @@
 import os
-from dotenv import load_dotenv
 
-load_dotenv()
+# .env nur lesen, wenn es eine gibt (auf Railway kommen die Variablen aus der Umgebung)
+if os.path.exists('.env') or os.path.exists(os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')):
+    from dotenv import load_dotenv
+    load_dotenv()
 
 class Config:
     """Base configuration"""
@@ -11,7 +13,62 @@ class Config:
     DATABASE_URL = os.environ.get('DATABASE_URL')
 
     # SQLite fallback for local development
-    SQLITE_DATABASE_PATH = 'brecher_system.db'
+    SQLITE_DATABASE_PATH = os.environ.get('SQLITE_DATABASE_PATH', 'brecher_system.db')
+
+    # Connection pool (PostgreSQL: bounded pool, SQLite: one connection per thread)
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+    DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 30))  # Sekunden Wartezeit auf freie Verbindung
+    DB_POOL_MAX_IDLE = float(os.environ.get('DB_POOL_MAX_IDLE', 300))  # Sekunden bis eine ungenutzte Verbindung ersetzt wird
+    DB_POOL_HEALTH_CHECK_INTERVAL = float(os.environ.get('DB_POOL_HEALTH_CHECK_INTERVAL', 30))  # SELECT 1 nach so vielen Sekunden Leerlauf
+
+    # Wochenliste (weeks-Tabelle) im Prozess cachen; andere Worker sehen neue Wochen spätestens nach so vielen Sekunden
+    WEEKS_CACHE_TTL = float(os.environ.get('WEEKS_CACHE_TTL', 60))
+
+    # Erste Woche der Saison für Scoreboards und Charts (ISO-Woche, z.B. 2025-W39; leer = alle Wochen).
+    # Wochenliste, Profil-Statistiken und Exporte umfassen immer alle Jahre.
+    SEASON_START = os.environ.get('SEASON_START', '')
+
+    # Maximale Größe eines Request-Bodys in Bytes (Flask und asgi.py antworten darüber mit 413)
+    MAX_CONTENT_LENGTH = int(os.environ.get('MAX_CONTENT_LENGTH', 16 * 1024 * 1024))
+
+    # /api/database/stats wird so viele Sekunden gecacht
+    STATS_CACHE_TTL = float(os.environ.get('STATS_CACHE_TTL', 5))
+
+    # Maximale Anzahl gecachter Dashboard-Ergebnisse (Übersicht, Scoreboards, Statistiken)
+    DASHBOARD_CACHE_SIZE = int(os.environ.get('DASHBOARD_CACHE_SIZE', 32))
+
+    # Speicherbudget des data_store in KB: kalte Wochen werden verdrängt und bei Bedarf neu geladen (0 = unbegrenzt)
+    DATA_STORE_BUDGET_KB = int(os.environ.get('DATA_STORE_BUDGET_KB', 1024))
+
+    # Firestore-Profile in get_current_user() cachen (Sekunden; nicht gefundene Profile kürzer)
+    USER_PROFILE_CACHE_TTL = float(os.environ.get('USER_PROFILE_CACHE_TTL', 300))
+    USER_PROFILE_NEGATIVE_TTL = float(os.environ.get('USER_PROFILE_NEGATIVE_TTL', 30))
+    USER_PROFILE_CACHE_SIZE = int(os.environ.get('USER_PROFILE_CACHE_SIZE', 256))
+
+    # Verifizierte Firebase-Tokens (bis exp) und User Records (Sekunden) cachen
+    FIREBASE_TOKEN_CACHE_SIZE = int(os.environ.get('FIREBASE_TOKEN_CACHE_SIZE', 1024))
+    FIREBASE_USER_CACHE_TTL = float(os.environ.get('FIREBASE_USER_CACHE_TTL', 300))
+    # false: Anzeigename und Bild nur aus den Token-Claims, kein auth.get_user() pro Login
+    FIREBASE_FETCH_USER_RECORD = os.environ.get('FIREBASE_FETCH_USER_RECORD', 'true').lower() in ('1', 'true', 'yes')
+
+    # Änderungsprotokoll für mehrere Worker: so viele Versionen bleiben in data_changes
+    DATA_CHANGES_KEEP = int(os.environ.get('DATA_CHANGES_KEEP', 1000))
+    # PostgreSQL: Änderungen per LISTEN/NOTIFY melden statt pro Request die Version abzufragen
+    DATA_CHANGE_LISTENER = os.environ.get('DATA_CHANGE_LISTENER', 'true').lower() in ('1', 'true', 'yes')
+
+    # Maximale Anzahl Zellen pro /update_cells Request
+    MAX_BATCH_CELLS = int(os.environ.get('MAX_BATCH_CELLS', 500))
+
+    # Server-Sent Events (/api/stream): Keepalive in Sekunden, Reconnect-Wartezeit, gepufferte Events
+    SSE_KEEPALIVE = float(os.environ.get('SSE_KEEPALIVE', 15))
+    SSE_RETRY_MS = int(os.environ.get('SSE_RETRY_MS', 3000))
+    SSE_HISTORY = int(os.environ.get('SSE_HISTORY', 256))
+
+    # ASGI-Modus (uvicorn asgi:app): Threads für die synchronen Flask-Routen
+    ASGI_THREADS = int(os.environ.get('ASGI_THREADS', 8))
+
+    # Optionaler NumPy-Scoring-Kernel für Übersicht, Charts und Profil-Statistiken
+    USE_NUMPY_SCORING = os.environ.get('USE_NUMPY_SCORING', 'false').lower() in ('1', 'true', 'yes')
 
     # Firebase configuration (Backend - Admin SDK)
     FIREBASE_PROJECT_ID = os.environ.get('FIREBASE_PROJECT_ID')
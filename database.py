@@ -1,8 +1,17 @@
 import sqlite3
 import json
 import os
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
 from datetime import datetime
 from config import Config
+from db_pool import ConnectionPool, ThreadLocalSQLitePool
+from cell_values import CellValue, to_cell_value, value_parts
+from scoring import DAYS, plain_points, score_person_week
+from week_keys import resolve_week, week_label, week_number
 
 # Initialize configuration
 config = Config()
@@ -10,14 +19,15 @@ config = Config()
 # Database path for SQLite
 DATABASE_PATH = config.database_config['path'] if config.database_config['type'] == 'sqlite' else None
 
-# PostgreSQL connection
-if config.use_postgresql:
-    import psycopg
-    from urllib.parse import urlparse
+# Bei jeder Änderung an init_database() erhöhen: laufende Prozesse führen die DDL dann einmal aus
+SCHEMA_VERSION = 3
 
 def get_db_connection():
     """Get database connection based on configuration"""
     if config.use_postgresql:
+        # psycopg erst bei der ersten Verbindung laden (schnellerer Import von app.py)
+        import psycopg
+        from urllib.parse import urlparse
         db_url = config.database_config['url']
         parsed_url = urlparse(db_url)
         if not parsed_url.hostname:
@@ -29,33 +39,105 @@ def get_db_connection():
     else:
         return sqlite3.connect(DATABASE_PATH)
 
+_pool = None
+_pool_lock = threading.Lock()
+_tx_local = threading.local()
+
+def get_pool():
+    """Get the process-wide connection pool (created on first use)"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                if config.use_postgresql:
+                    _pool = ConnectionPool(
+                        get_db_connection,
+                        size=config.DB_POOL_SIZE,
+                        timeout=config.DB_POOL_TIMEOUT,
+                        max_idle=config.DB_POOL_MAX_IDLE,
+                        health_check_interval=config.DB_POOL_HEALTH_CHECK_INTERVAL
+                    )
+                else:
+                    _pool = ThreadLocalSQLitePool(
+                        DATABASE_PATH,
+                        max_idle=config.DB_POOL_MAX_IDLE,
+                        health_check_interval=config.DB_POOL_HEALTH_CHECK_INTERVAL
+                    )
+    return _pool
+
+def get_pool_stats():
+    """Get connection pool counters (checkouts, waits, reconnects, ...)"""
+    return get_pool().get_stats()
+
+@contextmanager
+def db_transaction():
+    """Run several statements on one pooled connection in one transaction
+
+    execute_sql() calls inside the block reuse the connection and are
+    committed together when the block exits (rolled back on error).
+    Nested blocks join the outer transaction.
+    """
+    conn = getattr(_tx_local, 'conn', None)
+    if conn is not None:
+        yield conn
+        return
+
+    pool = get_pool()
+    conn = pool.getconn()
+    _tx_local.conn = conn
+    _tx_local.after_commit = []
+    discard = False
+    try:
+        yield conn
+        conn.commit()
+        callbacks = _tx_local.after_commit
+    except Exception:
+        try:
+            conn.rollback()
+        except Exception:
+            discard = True  # Verbindung ist kaputt - nicht zurück in den Pool
+        raise
+    finally:
+        _tx_local.conn = None
+        _tx_local.after_commit = []
+        pool.putconn(conn, discard=discard)
+
+    for callback in callbacks:
+        callback()
+
+def after_commit(callback):
+    """Run callback once the current transaction has committed (now if there is none)"""
+    if getattr(_tx_local, 'conn', None) is None:
+        callback()
+    else:
+        _tx_local.after_commit.append(callback)
+
 def execute_sql(sql, params=None, fetch=False):
     """Execute SQL with proper parameter binding for both databases"""
     if config.use_postgresql:
         # Convert SQLite-style ? placeholders to PostgreSQL %s
-        pg_sql = sql.replace('?', '%s')
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute(pg_sql, params or ())
-        if fetch:
-            result = cursor.fetchall()
-        else:
-            result = None
-        conn.commit()
-        conn.close()
-        return result
-    else:
-        conn = get_db_connection()
+        sql = sql.replace('?', '%s')
+
+    with db_transaction() as conn:
         cursor = conn.cursor()
         cursor.execute(sql, params or ())
         if fetch:
             result = cursor.fetchall()
         else:
             result = None
-        conn.commit()
-        conn.close()
+        cursor.close()
         return result
 
+def execute_many(sql, rows):
+    """Execute one statement for many parameter rows (joins an open transaction)"""
+    if config.use_postgresql:
+        sql = sql.replace('?', '%s')
+
+    with db_transaction() as conn:
+        cursor = conn.cursor()
+        cursor.executemany(sql, rows)
+        cursor.close()
+
 def init_database():
     """Initialize the database with required tables."""
 
@@ -94,39 +176,182 @@ def init_database():
         create_table_sql = '''
             CREATE TABLE IF NOT EXISTS brecher_data (
                 id SERIAL PRIMARY KEY,
+                iso_year INTEGER NOT NULL,
+                iso_week INTEGER NOT NULL,
                 week TEXT NOT NULL,
                 person TEXT NOT NULL,
                 day TEXT NOT NULL,
                 category TEXT NOT NULL,
                 value TEXT,
+                num_value DOUBLE PRECISION,
+                value_flag SMALLINT,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(week, person, day, category)
+                CONSTRAINT brecher_data_year_week_key UNIQUE (iso_year, week, person, day, category)
             )
         '''
     else:
         create_table_sql = '''
             CREATE TABLE IF NOT EXISTS brecher_data (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
+                iso_year INTEGER NOT NULL,
+                iso_week INTEGER NOT NULL,
                 week TEXT NOT NULL,
                 person TEXT NOT NULL,
                 day TEXT NOT NULL,
                 category TEXT NOT NULL,
                 value TEXT,
+                num_value REAL,
+                value_flag INTEGER,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(week, person, day, category)
+                CONSTRAINT brecher_data_year_week_key UNIQUE (iso_year, week, person, day, category)
             )
         '''
 
     execute_sql(create_table_sql)
 
+    # Typed value columns for tables created before they existed
+    if config.use_postgresql:
+        ensure_column('brecher_data', 'num_value', 'DOUBLE PRECISION')
+        ensure_column('brecher_data', 'value_flag', 'SMALLINT')
+    else:
+        ensure_column('brecher_data', 'num_value', 'REAL')
+        ensure_column('brecher_data', 'value_flag', 'INTEGER')
+    backfill_value_columns()
+
+    # ISO-Jahr für Zeilen von vor den (Jahr, Woche)-Schlüsseln
+    migrate_week_keys(create_table_sql)
+
+    # Tabellen mit Wochenschlüssel ohne Jahr: abgeleitet, werden unten neu aufgebaut
+    for table in ('daily_scores', 'weekly_scores', 'category_scores', 'weeks'):
+        columns = get_columns(table)
+        if columns and 'iso_year' not in columns:
+            execute_sql(f'DROP TABLE {table}')
+
+    # Materialized scores, maintained in the same transaction as every write
+    score_type = 'DOUBLE PRECISION' if config.use_postgresql else 'REAL'
+    execute_sql(f'''
+        CREATE TABLE IF NOT EXISTS daily_scores (
+            iso_year INTEGER NOT NULL,
+            week TEXT NOT NULL,
+            person TEXT NOT NULL,
+            day TEXT NOT NULL,
+            total {score_type} NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (iso_year, week, person, day)
+        )
+    ''')
+    execute_sql(f'''
+        CREATE TABLE IF NOT EXISTS weekly_scores (
+            iso_year INTEGER NOT NULL,
+            iso_week INTEGER NOT NULL,
+            week TEXT NOT NULL,
+            person TEXT NOT NULL,
+            total {score_type} NOT NULL DEFAULT 0,
+            bonus INTEGER NOT NULL DEFAULT 0,
+            gym_bonus INTEGER NOT NULL DEFAULT 0,
+            fehler_bonus INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (iso_year, week, person)
+        )
+    ''')
+
+    execute_sql(f'''
+        CREATE TABLE IF NOT EXISTS category_scores (
+            iso_year INTEGER NOT NULL,
+            iso_week INTEGER NOT NULL,
+            week TEXT NOT NULL,
+            person TEXT NOT NULL,
+            category TEXT NOT NULL,
+            points {score_type} NOT NULL DEFAULT 0,
+            filled INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (iso_year, week, person, category)
+        )
+    ''')
+
+    # Week catalogue, maintained by every write to brecher_data (see register_weeks)
+    execute_sql('''
+        CREATE TABLE IF NOT EXISTS weeks (
+            iso_year INTEGER NOT NULL,
+            iso_week INTEGER NOT NULL,
+            week TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (iso_year, week)
+        )
+    ''')
+    if config.use_postgresql:
+        execute_sql('''
+            INSERT INTO weeks (iso_year, iso_week, week) SELECT DISTINCT iso_year, iso_week, week FROM brecher_data
+            ON CONFLICT (iso_year, week) DO NOTHING
+        ''')
+    else:
+        execute_sql('INSERT OR IGNORE INTO weeks (iso_year, iso_week, week) SELECT DISTINCT iso_year, iso_week, week FROM brecher_data')
+    invalidate_weeks_cache()
+
+    # Row counters for get_database_stats(), maintained by triggers on brecher_data
+    execute_sql('''
+        CREATE TABLE IF NOT EXISTS data_counts (
+            kind TEXT NOT NULL,
+            name TEXT NOT NULL,
+            row_count INTEGER NOT NULL DEFAULT 0,
+            last_updated TIMESTAMP,
+            PRIMARY KEY (kind, name)
+        )
+    ''')
+    create_count_triggers()
+    if not execute_sql("SELECT 1 FROM data_counts WHERE kind = 'all'", fetch=True):
+        recount_data()
+
+    # Change log for workers that keep the data in memory (see touch_weeks / get_data_changes)
+    execute_sql('''
+        CREATE TABLE IF NOT EXISTS data_version (
+            id INTEGER PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    if not execute_sql('SELECT 1 FROM data_version WHERE id = 1', fetch=True):
+        execute_sql('INSERT INTO data_version (id, version) VALUES (1, 0)')
+    execute_sql('''
+        CREATE TABLE IF NOT EXISTS data_changes (
+            version INTEGER NOT NULL,
+            week TEXT NOT NULL,
+            origin TEXT,
+            PRIMARY KEY (version, week)
+        )
+    ''')
+
+    # Fill score tables once for databases created before they existed
+    if not (execute_sql('SELECT 1 FROM weekly_scores LIMIT 1', fetch=True) and
+            execute_sql('SELECT 1 FROM category_scores LIMIT 1', fetch=True)) and \
+            execute_sql('SELECT 1 FROM brecher_data LIMIT 1', fetch=True):
+        rebuild_score_tables()
+
     # Create indexes for better performance
     execute_sql('''
         CREATE INDEX IF NOT EXISTS idx_week_person_day
         ON brecher_data(week, person, day)
     ''')
 
+    # Zeitbereiche (Saison, letzte N Wochen) über (Jahr, Woche)
+    execute_sql('''
+        CREATE INDEX IF NOT EXISTS idx_brecher_data_year_week
+        ON brecher_data(iso_year, iso_week)
+    ''')
+    execute_sql('''
+        CREATE INDEX IF NOT EXISTS idx_weekly_scores_year_week
+        ON weekly_scores(iso_year, iso_week)
+    ''')
+    execute_sql('''
+        CREATE INDEX IF NOT EXISTS idx_category_scores_year_week
+        ON category_scores(iso_year, iso_week)
+    ''')
+    execute_sql('''
+        CREATE INDEX IF NOT EXISTS idx_weeks_year_week
+        ON weeks(iso_year, iso_week)
+    ''')
+
     execute_sql('''
         CREATE INDEX IF NOT EXISTS idx_users_firebase_uid
         ON users(firebase_uid)
@@ -137,9 +362,212 @@ def init_database():
         ON users(email)
     ''')
 
+    # Schema ist aktuell: Kaltstarts überspringen die DDL (siehe get_schema_version)
+    execute_sql('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            id INTEGER PRIMARY KEY,
+            version INTEGER NOT NULL
+        )
+    ''')
+    execute_sql('''
+        INSERT INTO schema_version (id, version) VALUES (1, ?)
+        ON CONFLICT (id) DO UPDATE SET version = excluded.version
+    ''', (SCHEMA_VERSION,))
+
     db_info = config.database_config['url'] if config.use_postgresql else DATABASE_PATH
     print(f"✅ Database initialized: {db_info}")
 
+def get_schema_version():
+    """Schema version written by the last init_database() (0 for databases without it)"""
+    try:
+        rows = execute_sql('SELECT version FROM schema_version WHERE id = 1', fetch=True)
+    except Exception:
+        return 0
+    return rows[0][0] if rows else 0
+
+def migrate_database(seed_file='railway_migration.json'):
+    """Deploy step: DDL plus seeding an empty Railway database (python database.py migrate)"""
+    init_database()
+
+    # Auto-migrate data on Railway if database is empty
+    if os.environ.get('DATABASE_URL') and os.path.exists(seed_file):
+        if get_database_stats()['total_records'] == 0:
+            print('🚀 Auto-migrating data to Railway PostgreSQL...')
+            try:
+                with open(seed_file, 'r') as f:
+                    migration_data = json.load(f)
+                records = save_data(migration_data)
+                print(f'✅ Auto-migrated {records} records!')
+            except Exception as e:
+                print(f'❌ Migration error: {e}')
+
+def create_count_triggers():
+    """Create the triggers that keep data_counts in sync with brecher_data"""
+    if config.use_postgresql:
+        execute_sql('''
+            CREATE OR REPLACE FUNCTION brecher_data_count() RETURNS trigger AS $$
+            BEGIN
+                IF TG_OP = 'INSERT' THEN
+                    UPDATE data_counts SET row_count = row_count + 1, last_updated = NEW.updated_at
+                    WHERE kind = 'all' AND name = '';
+                    INSERT INTO data_counts (kind, name, row_count) VALUES ('person', NEW.person, 1)
+                    ON CONFLICT (kind, name) DO UPDATE SET row_count = data_counts.row_count + 1;
+                ELSIF TG_OP = 'UPDATE' THEN
+                    UPDATE data_counts SET last_updated = NEW.updated_at WHERE kind = 'all' AND name = '';
+                ELSE
+                    UPDATE data_counts SET row_count = row_count - 1 WHERE kind = 'all' AND name = '';
+                    UPDATE data_counts SET row_count = row_count - 1 WHERE kind = 'person' AND name = OLD.person;
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+        ''')
+        execute_sql('DROP TRIGGER IF EXISTS brecher_data_count ON brecher_data')
+        execute_sql('''
+            CREATE TRIGGER brecher_data_count
+            AFTER INSERT OR UPDATE OR DELETE ON brecher_data
+            FOR EACH ROW EXECUTE FUNCTION brecher_data_count()
+        ''')
+    else:
+        execute_sql('''
+            CREATE TRIGGER IF NOT EXISTS brecher_data_count_insert AFTER INSERT ON brecher_data
+            BEGIN
+                UPDATE data_counts SET row_count = row_count + 1, last_updated = NEW.updated_at
+                WHERE kind = 'all' AND name = '';
+                INSERT INTO data_counts (kind, name, row_count) VALUES ('person', NEW.person, 1)
+                ON CONFLICT (kind, name) DO UPDATE SET row_count = row_count + 1;
+            END
+        ''')
+        execute_sql('''
+            CREATE TRIGGER IF NOT EXISTS brecher_data_count_update AFTER UPDATE ON brecher_data
+            BEGIN
+                UPDATE data_counts SET last_updated = NEW.updated_at WHERE kind = 'all' AND name = '';
+            END
+        ''')
+        execute_sql('''
+            CREATE TRIGGER IF NOT EXISTS brecher_data_count_delete AFTER DELETE ON brecher_data
+            BEGIN
+                UPDATE data_counts SET row_count = row_count - 1 WHERE kind = 'all' AND name = '';
+                UPDATE data_counts SET row_count = row_count - 1 WHERE kind = 'person' AND name = OLD.person;
+            END
+        ''')
+
+def recount_data():
+    """Fill data_counts from a full scan of brecher_data (once, or to repair it)"""
+    with db_transaction():
+        execute_sql('DELETE FROM data_counts')
+        execute_sql('''
+            INSERT INTO data_counts (kind, name, row_count, last_updated)
+            SELECT 'all', '', COUNT(*), MAX(updated_at) FROM brecher_data
+        ''')
+        execute_sql('''
+            INSERT INTO data_counts (kind, name, row_count)
+            SELECT 'person', person, COUNT(*) FROM brecher_data GROUP BY person
+        ''')
+    invalidate_stats_cache()
+
+def ensure_column(table, column, definition):
+    """Add a column to an existing table if it is missing"""
+    if config.use_postgresql:
+        execute_sql(f'ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {column} {definition}')
+        return
+
+    columns = [row[1] for row in execute_sql(f'PRAGMA table_info({table})', fetch=True)]
+    if column not in columns:
+        execute_sql(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+
+def backfill_value_columns():
+    """Parse legacy rows once into num_value/value_flag"""
+    rows = execute_sql('SELECT id, value FROM brecher_data WHERE value_flag IS NULL', fetch=True)
+    if not rows:
+        return 0
+
+    updates = []
+    for row_id, value in rows:
+        num, flag = value_parts(value)
+        updates.append((num, int(flag), row_id))
+
+    execute_many('UPDATE brecher_data SET num_value = ?, value_flag = ? WHERE id = ?', updates)
+
+    print(f"✅ Parsed {len(updates)} existing values into typed columns")
+    return len(updates)
+
+def get_columns(table):
+    """Column names of a table (empty list if it does not exist)"""
+    if config.use_postgresql:
+        rows = execute_sql('SELECT column_name FROM information_schema.columns WHERE table_name = ?', (table,), fetch=True)
+        return [row[0] for row in rows]
+    return [row[1] for row in execute_sql(f'PRAGMA table_info({table})', fetch=True)]
+
+def week_key(week, today=None):
+    """ISO (year, week) of a week label; labels without a week number get week 0 (outside every range)"""
+    try:
+        return resolve_week(week, today)
+    except ValueError:
+        return (today or datetime.now()).isocalendar()[0], 0
+
+def stored_week(week):
+    """Label in the week column: 'KW39' also for '2025-KW39' (the year is in iso_year)"""
+    number = week_number(week)
+    return week if number is None else f'KW{number}'
+
+def row_label(iso_year, week):
+    """Label of a stored (iso_year, week) as the app uses it: 'KW39' or '2025-KW39'"""
+    number = week_number(week)
+    return week if number is None else week_label(iso_year, number)
+
+def parse_timestamp(value):
+    """created_at/updated_at als datetime (SQLite liefert Text, PostgreSQL datetime)"""
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+def migrate_week_keys(create_table_sql):
+    """Give rows from before the (year, week) keys their ISO year (once)
+
+    A row gets the year its week label had when the row was created
+    (created_at), so an old KW39 stays apart from this year's KW39. Tables
+    still unique on (week, person, day, category) get the new unique key.
+    """
+    ensure_column('brecher_data', 'iso_year', 'INTEGER')
+    ensure_column('brecher_data', 'iso_week', 'INTEGER')
+
+    rows = execute_sql('SELECT id, week, created_at FROM brecher_data WHERE iso_year IS NULL', fetch=True)
+    updates = []
+    for row_id, week, created_at in rows:
+        iso_year, iso_week = week_key(week, parse_timestamp(created_at))
+        updates.append((iso_year, iso_week, row_id))
+    execute_many('UPDATE brecher_data SET iso_year = ?, iso_week = ? WHERE id = ?', updates)
+
+    if config.use_postgresql:
+        if not execute_sql("SELECT 1 FROM pg_constraint WHERE conname = 'brecher_data_year_week_key'", fetch=True):
+            with db_transaction():
+                execute_sql('ALTER TABLE brecher_data DROP CONSTRAINT IF EXISTS brecher_data_week_person_day_category_key')
+                execute_sql('ALTER TABLE brecher_data ALTER COLUMN iso_year SET NOT NULL')
+                execute_sql('ALTER TABLE brecher_data ALTER COLUMN iso_week SET NOT NULL')
+                execute_sql('''
+                    ALTER TABLE brecher_data ADD CONSTRAINT brecher_data_year_week_key
+                    UNIQUE (iso_year, week, person, day, category)
+                ''')
+    else:
+        # SQLite kann Constraints nicht ändern: Tabelle einmal umkopieren
+        # (Indizes und Zähler-Trigger legt init_database danach wieder an)
+        table_sql = execute_sql("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'brecher_data'", fetch=True)[0][0]
+        if 'brecher_data_year_week_key' not in table_sql:
+            columns = 'id, iso_year, iso_week, week, person, day, category, value, num_value, value_flag, created_at, updated_at'
+            with db_transaction():
+                execute_sql('ALTER TABLE brecher_data RENAME TO brecher_data_old')
+                execute_sql(create_table_sql)
+                execute_sql(f'INSERT INTO brecher_data ({columns}) SELECT {columns} FROM brecher_data_old')
+                execute_sql('DROP TABLE brecher_data_old')
+
+    if updates:
+        print(f"✅ Assigned ISO years to {len(updates)} existing rows")
+    return len(updates)
+
 def migrate_json_to_database(json_file='brecher_data.json'):
     """Migrate existing JSON data to database (only if database is empty)."""
     if not os.path.exists(json_file):
@@ -157,152 +585,747 @@ def migrate_json_to_database(json_file='brecher_data.json'):
     with open(json_file, 'r', encoding='utf-8') as f:
         data = json.load(f)
 
-    migrated_records = 0
-
-    for week, week_data in data.items():
-        for person, person_data in week_data.items():
-            for day, day_data in person_data.items():
-                for category, value in day_data.items():
-                    # Insert record (only if database was empty)
-                    execute_sql('''
-                        INSERT INTO brecher_data
-                        (week, person, day, category, value, updated_at)
-                        VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                    ''', (week, person, day, category, str(value) if value else ''))
-                    migrated_records += 1
+    # Insert all records in one transaction (only if database was empty)
+    migrated_records = bulk_write_rows(iter_data_rows(data))
 
     print(f"✅ Migrated {migrated_records} records from JSON to database")
 
-def get_all_data():
-    """Get all data in the original JSON format."""
+# Wochen von (Jahr, Woche) bis (Jahr, Woche) - nutzt die (iso_year, iso_week)-Indizes (Saison in Scoreboards und Charts)
+WEEK_RANGE_SQL = '(iso_year, iso_week) >= (?, ?) AND (iso_year, iso_week) <= (?, ?)'
+
+def nest_rows(rows):
+    """Build {key: {person: {day: {category: CellValue}}}} from (key, person, day, category, value, num_value, value_flag) rows"""
+    data = {}
+    for key, person, day, category, value, num_value, value_flag in rows:
+        if key not in data:
+            data[key] = {}
+        if person not in data[key]:
+            data[key][person] = {}
+        if day not in data[key][person]:
+            data[key][person][day] = {}
+        data[key][person][day][category] = CellValue.from_parts(value, num_value, value_flag)
+    return data
+
+def get_all_data(first=None, last=None):
+    """Get all data (or the weeks from ISO (year, week) first to last) in the original JSON format ({'KW39': ...}).
+
+    Weeks of other years than their plain label are keyed '2025-KW39'.
+    """
+    where, params = '', ()
+    if first is not None:
+        where, params = f'WHERE {WEEK_RANGE_SQL}', tuple(first) + tuple(last)
+    rows = execute_sql(f'''
+        SELECT iso_year, week, person, day, category, value, num_value, value_flag
+        FROM brecher_data
+        {where}
+        ORDER BY iso_year, iso_week, person, day, category
+    ''', params, fetch=True)
+
+    # Rebuild nested structure (values keep their parsed form)
+    return nest_rows((row_label(iso_year, week),) + tuple(row) for iso_year, week, *row in rows)
+
+def get_all_years_data():
+    """Rows of every year as {(iso_year, stored week): week_data} (for rebuilding/verifying the score tables)"""
     rows = execute_sql('''
-        SELECT week, person, day, category, value
+        SELECT iso_year, week, person, day, category, value, num_value, value_flag
         FROM brecher_data
-        ORDER BY week, person, day, category
     ''', fetch=True)
+    return nest_rows(((iso_year, week),) + tuple(row) for iso_year, week, *row in rows)
 
-    # Rebuild nested structure
-    data = {}
-    for week, person, day, category, value in rows:
-        if week not in data:
-            data[week] = {}
-        if person not in data[week]:
-            data[week][person] = {}
-        if day not in data[week][person]:
-            data[week][person][day] = {}
-        data[week][person][day][category] = value
+# Export: so viele Zeilen holt der Cursor pro Runde aus der Datenbank
+EXPORT_BATCH_SIZE = 2000
 
-    return data
+def iter_weeks(first=None, last=None):
+    """Yield ((iso_year, iso_week, label), week_data) one week at a time, oldest first
 
-def save_data(data):
-    """Save data to database."""
-    saved_records = 0
+    Reads brecher_data on a connection of its own, on PostgreSQL through a
+    server-side (named) cursor, in EXPORT_BATCH_SIZE blocks, so only the week
+    being built is held in memory however long the history is. Without
+    first/last every year is read. Values are the stored strings.
+    """
+    sql = 'SELECT iso_year, iso_week, week, person, day, category, value FROM brecher_data'
+    params = ()
+    if first is not None:
+        sql += f' WHERE {WEEK_RANGE_SQL}'
+        params = tuple(first) + tuple(last)
+    # Der (iso_year, iso_week)-Index liefert die Wochen sortiert, sortiert wird nur innerhalb einer Woche
+    sql += ' ORDER BY iso_year, iso_week, week, person, day, category'
+
+    conn = get_db_connection()
+    try:
+        if config.use_postgresql:
+            cursor = conn.cursor(name=f'brecher_export_{uuid.uuid4().hex[:8]}')
+            cursor.itersize = EXPORT_BATCH_SIZE
+            cursor.execute(sql.replace('?', '%s'), params)
+        else:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+
+        current, key, week_data = None, None, None
+        while True:
+            rows = cursor.fetchmany(EXPORT_BATCH_SIZE)
+            if not rows:
+                break
+            for iso_year, iso_week, week, person, day, category, value in rows:
+                if (iso_year, iso_week, week) != current:
+                    if key is not None:
+                        yield key, week_data
+                    current = (iso_year, iso_week, week)
+                    key, week_data = (iso_year, iso_week, row_label(iso_year, week)), {}
+                week_data.setdefault(person, {}).setdefault(day, {})[category] = value
+        if key is not None:
+            yield key, week_data
+        cursor.close()
+    finally:
+        conn.close()
+
+def json_chunks(weeks):
+    """Serialize (key, week_data) pairs as one JSON object {'KW39': ...}, one chunk per week
+
+    Same layout as json.dump(data, indent=2) of the nested dict, which is
+    what save_data() reads back.
+    """
+    separator = '\n'
+    yield '{'
+    for (iso_year, iso_week, week), week_data in weeks:
+        body = json.dumps(week_data, indent=2, ensure_ascii=False).replace('\n', '\n  ')
+        yield f'{separator}  {json.dumps(week)}: {body}'
+        separator = ',\n'
+    yield '\n}' if separator != '\n' else '}'
 
+def ndjson_chunks(weeks):
+    """Serialize (key, week_data) pairs as NDJSON, one line per week with its ISO year"""
+    for (iso_year, iso_week, week), week_data in weeks:
+        yield json.dumps({'iso_year': iso_year, 'iso_week': iso_week, 'week': week, 'data': week_data},
+                         ensure_ascii=False) + '\n'
+
+def iter_data_rows(data):
+    """Flatten the nested week/person/day/category dict into row tuples"""
     for week, week_data in data.items():
         for person, person_data in week_data.items():
             for day, day_data in person_data.items():
                 for category, value in day_data.items():
-                    if config.use_postgresql:
-                        execute_sql('''
-                            INSERT INTO brecher_data
-                            (week, person, day, category, value, updated_at)
-                            VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                            ON CONFLICT (week, person, day, category)
-                            DO UPDATE SET value = EXCLUDED.value, updated_at = CURRENT_TIMESTAMP
-                        ''', (week, person, day, category, str(value) if value else ''))
-                    else:
-                        execute_sql('''
-                            INSERT OR REPLACE INTO brecher_data
-                            (week, person, day, category, value, updated_at)
-                            VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                        ''', (week, person, day, category, str(value) if value else ''))
-                    saved_records += 1
-
-    return saved_records
+                    yield (week, person, day, category, to_cell_value(value))
+
+# Upsert einer Zelle (SQLite >= 3.24 und PostgreSQL). Anders als INSERT OR REPLACE
+# bleibt die Zeile erhalten, so dass die Zähler-Trigger nur echte neue Zeilen zählen.
+UPSERT_ENTRY_SQL = '''
+    INSERT INTO brecher_data
+    (iso_year, iso_week, week, person, day, category, value, num_value, value_flag, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT (iso_year, week, person, day, category)
+    DO UPDATE SET value = EXCLUDED.value, num_value = EXCLUDED.num_value,
+                  value_flag = EXCLUDED.value_flag, updated_at = CURRENT_TIMESTAMP
+'''
+
+def typed_row(week, person, day, category, value):
+    """Build a brecher_data row including the ISO (year, week) and the parsed num_value/value_flag"""
+    value = to_cell_value(value)
+    num, flag = value_parts(value)
+    return week_key(week) + (stored_week(week), person, day, category, str(value), num, int(flag))
+
+def bulk_write_rows(rows, scores=None):
+    """Upsert many (week, person, day, category, value) rows in one transaction
+
+    SQLite uses a single executemany(), PostgreSQL streams the rows with COPY
+    into a temporary table and upserts them with one INSERT ... SELECT.
+    Values are parsed once here into num_value/value_flag, week labels are
+    resolved to their ISO (year, week).
+    ``scores`` are already computed scores {(week, person): scores} of the
+    written person-weeks; without them they are re-scored from brecher_data.
+    Returns the number of rows written.
+    """
+    rows = list(rows)
+    if not rows:
+        return 0
+    weeks = {row[0] for row in rows}
+    week_persons = {(row[0], row[1]) for row in rows}
+    rows = [typed_row(*row) for row in rows]
+
+    with db_transaction() as conn:
+        cursor = conn.cursor()
+        if config.use_postgresql:
+            cursor.execute('''
+                CREATE TEMP TABLE IF NOT EXISTS brecher_data_import (
+                    iso_year INTEGER, iso_week INTEGER,
+                    week TEXT, person TEXT, day TEXT, category TEXT, value TEXT,
+                    num_value DOUBLE PRECISION, value_flag SMALLINT
+                ) ON COMMIT DELETE ROWS
+            ''')
+            with cursor.copy('COPY brecher_data_import (iso_year, iso_week, week, person, day, category, value, num_value, value_flag) FROM STDIN') as copy:
+                for row in rows:
+                    copy.write_row(row)
+            cursor.execute('''
+                INSERT INTO brecher_data
+                (iso_year, iso_week, week, person, day, category, value, num_value, value_flag, updated_at)
+                SELECT DISTINCT ON (iso_year, week, person, day, category)
+                    iso_year, iso_week, week, person, day, category, value, num_value, value_flag, CURRENT_TIMESTAMP
+                FROM brecher_data_import
+                ON CONFLICT (iso_year, week, person, day, category)
+                DO UPDATE SET value = EXCLUDED.value, num_value = EXCLUDED.num_value,
+                              value_flag = EXCLUDED.value_flag, updated_at = CURRENT_TIMESTAMP
+            ''')
+        else:
+            cursor.executemany(UPSERT_ENTRY_SQL, rows)
+        cursor.close()
+
+        register_weeks(weeks)
+        if scores is None:
+            refresh_scores(week_persons)
+        else:
+            write_scores(scores)
+        touch_weeks(weeks)
+        after_commit(invalidate_stats_cache)
+
+    return len(rows)
+
+def save_data_bulk(data):
+    """Save data to database in one transaction and report timing."""
+    started = time.perf_counter()
+    rows_written = bulk_write_rows(iter_data_rows(data))
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    return {
+        'rows_written': rows_written,
+        'elapsed_ms': round(elapsed_ms, 2)
+    }
+
+def save_data(data):
+    """Save data to database."""
+    return save_data_bulk(data)['rows_written']
 
 def get_week_data(week):
-    """Get data for a specific week."""
+    """Get data for a specific week ('KW39' or '2025-KW39')."""
     rows = execute_sql('''
-        SELECT person, day, category, value
+        SELECT person, day, category, value, num_value, value_flag
         FROM brecher_data
-        WHERE week = ?
+        WHERE iso_year = ? AND week = ?
         ORDER BY person, day, category
-    ''', (week,), fetch=True)
+    ''', (week_key(week)[0], stored_week(week)), fetch=True)
 
     # Rebuild structure for this week
     week_data = {}
-    for person, day, category, value in rows:
+    for person, day, category, value, num_value, value_flag in rows:
         if person not in week_data:
             week_data[person] = {}
         if day not in week_data[person]:
             week_data[person][day] = {}
-        week_data[person][day][category] = value
+        week_data[person][day][category] = CellValue.from_parts(value, num_value, value_flag)
 
     return week_data
 
-def update_entry(week, person, day, category, value):
-    """Update a specific entry."""
+def update_entry(week, person, day, category, value, scores=None):
+    """Update a specific entry.
+
+    ``scores`` are the already computed scores of the person-week (only the
+    changed days in ``scores['daily']``); without them the person-week is
+    re-scored from brecher_data.
+    """
+    row = typed_row(week, person, day, category, value)
+    with db_transaction():
+        execute_sql(UPSERT_ENTRY_SQL, row)
+        register_weeks([week])
+        touch_weeks([week])
+        after_commit(invalidate_stats_cache)
+
+        # Tages- und Wochenpunkte in derselben Transaktion aktualisieren
+        if scores is None:
+            refresh_scores([(week, person)])
+        else:
+            write_scores({(week, person): scores})
+
+def load_person_weeks(week_persons):
+    """Load {(week, person): {day: {category: CellValue}}} from brecher_data"""
+    person_weeks = {}
+    for week, person in week_persons:
+        rows = execute_sql('''
+            SELECT day, category, value, num_value, value_flag
+            FROM brecher_data
+            WHERE iso_year = ? AND week = ? AND person = ?
+        ''', (week_key(week)[0], stored_week(week), person), fetch=True)
+
+        person_data = {}
+        for day, category, value, num_value, value_flag in rows:
+            person_data.setdefault(day, {})[category] = CellValue.from_parts(value, num_value, value_flag)
+        person_weeks[(week, person)] = person_data
+
+    return person_weeks
+
+def write_scores(scored, year=None):
+    """Upsert computed scores {(week, person): score_person_week(...)} into the score tables
+
+    ``scores['categories']`` may be missing or hold only the changed categories.
+    Weeks are stored under the ISO year of their label, or ``year``.
+    """
+    daily_rows = []
+    weekly_rows = []
+    category_rows = []
+    for (week, person), scores in scored.items():
+        iso_year, iso_week = week_key(week) if year is None else (year, week_key(week)[1])
+        week = stored_week(week)
+        for day, total in scores['daily'].items():
+            daily_rows.append((iso_year, week, person, day, total))
+        weekly_rows.append((iso_year, iso_week, week, person, scores['total'], scores['bonus'],
+                            scores['gym_bonus'], scores['fehler_bonus']))
+        for category, (points, filled) in scores.get('categories', {}).items():
+            category_rows.append((iso_year, iso_week, week, person, category, points, filled))
+
+    if not weekly_rows:
+        return
+
     if config.use_postgresql:
-        execute_sql('''
-            INSERT INTO brecher_data
-            (week, person, day, category, value, updated_at)
+        execute_many('''
+            INSERT INTO daily_scores (iso_year, week, person, day, total, updated_at)
             VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-            ON CONFLICT (week, person, day, category)
-            DO UPDATE SET value = EXCLUDED.value, updated_at = CURRENT_TIMESTAMP
-        ''', (week, person, day, category, str(value) if value else ''))
+            ON CONFLICT (iso_year, week, person, day)
+            DO UPDATE SET total = EXCLUDED.total, updated_at = CURRENT_TIMESTAMP
+        ''', daily_rows)
+        execute_many('''
+            INSERT INTO weekly_scores (iso_year, iso_week, week, person, total, bonus, gym_bonus, fehler_bonus, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT (iso_year, week, person)
+            DO UPDATE SET total = EXCLUDED.total, bonus = EXCLUDED.bonus, gym_bonus = EXCLUDED.gym_bonus,
+                          fehler_bonus = EXCLUDED.fehler_bonus, updated_at = CURRENT_TIMESTAMP
+        ''', weekly_rows)
+        execute_many('''
+            INSERT INTO category_scores (iso_year, iso_week, week, person, category, points, filled, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT (iso_year, week, person, category)
+            DO UPDATE SET points = EXCLUDED.points, filled = EXCLUDED.filled, updated_at = CURRENT_TIMESTAMP
+        ''', category_rows)
     else:
-        execute_sql('''
-            INSERT OR REPLACE INTO brecher_data
-            (week, person, day, category, value, updated_at)
+        execute_many('''
+            INSERT OR REPLACE INTO daily_scores (iso_year, week, person, day, total, updated_at)
             VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-        ''', (week, person, day, category, str(value) if value else ''))
+        ''', daily_rows)
+        execute_many('''
+            INSERT OR REPLACE INTO weekly_scores (iso_year, iso_week, week, person, total, bonus, gym_bonus, fehler_bonus, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ''', weekly_rows)
+        execute_many('''
+            INSERT OR REPLACE INTO category_scores (iso_year, iso_week, week, person, category, points, filled, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ''', category_rows)
+
+def refresh_scores(week_persons):
+    """Recompute daily_scores/weekly_scores/category_scores for the given (week, person) pairs"""
+    with db_transaction():
+        person_weeks = load_person_weeks(week_persons)
+        write_scores({key: score_person_week(person_data) for key, person_data in person_weeks.items()})
+
+def rebuild_score_tables():
+    """Regenerate daily_scores, weekly_scores and category_scores completely from brecher_data (all years)"""
+    count = 0
+    with db_transaction():
+        execute_sql('DELETE FROM daily_scores')
+        execute_sql('DELETE FROM weekly_scores')
+        execute_sql('DELETE FROM category_scores')
+
+        scored_by_year = {}
+        for (iso_year, week), week_data in get_all_years_data().items():
+            for person, person_data in week_data.items():
+                scored_by_year.setdefault(iso_year, {})[(week, person)] = score_person_week(person_data)
+                count += 1
+        for iso_year, scored in scored_by_year.items():
+            write_scores(scored, year=iso_year)
+
+    print(f"✅ Rebuilt scores for {count} person-weeks")
+    return count
+
+def verify_score_tables():
+    """Compare the score tables with a fresh computation from brecher_data
+
+    Returns a list of (week, person, day_or_None, stored, expected) mismatches
+    (category mismatches carry the category in place of the day); weeks of
+    other years than their plain label are reported as '<year>-KW<n>'.
+    """
+    stored_daily = {
+        (iso_year, week, person, day): total
+        for iso_year, week, person, day, total
+        in execute_sql('SELECT iso_year, week, person, day, total FROM daily_scores', fetch=True)
+    }
+    stored_weekly = {
+        (iso_year, week, person): total
+        for iso_year, week, person, total
+        in execute_sql('SELECT iso_year, week, person, total FROM weekly_scores', fetch=True)
+    }
+    stored_categories = {
+        (iso_year, week, person, category): (points, filled)
+        for iso_year, week, person, category, points, filled
+        in execute_sql('SELECT iso_year, week, person, category, points, filled FROM category_scores', fetch=True)
+    }
+
+    mismatches = []
+    for (iso_year, week), week_data in get_all_years_data().items():
+        label = row_label(iso_year, week)
+        for person, person_data in week_data.items():
+            scores = score_person_week(person_data)
+            for day in DAYS:
+                stored = stored_daily.get((iso_year, week, person, day))
+                if stored is None or abs(stored - scores['daily'][day]) > 1e-9:
+                    mismatches.append((label, person, day, stored, scores['daily'][day]))
+            stored = stored_weekly.get((iso_year, week, person))
+            if stored is None or abs(stored - scores['total']) > 1e-9:
+                mismatches.append((label, person, None, stored, scores['total']))
+            for category, (points, filled) in scores['categories'].items():
+                stored = stored_categories.get((iso_year, week, person, category))
+                if stored is None or abs(stored[0] - points) > 1e-9 or stored[1] != filled:
+                    mismatches.append((label, person, category, stored, (points, filled)))
+
+    return mismatches
+
+def get_weekly_scores(week=None):
+    """Get materialized weekly totals as {week: {person: total}} (one week, or all weeks of every year)"""
+    if week is None:
+        rows = execute_sql('SELECT iso_year, week, person, total FROM weekly_scores', fetch=True)
+    else:
+        rows = execute_sql('SELECT iso_year, week, person, total FROM weekly_scores WHERE iso_year = ? AND week = ?',
+                           (week_key(week)[0], stored_week(week)), fetch=True)
+
+    scores = {}
+    for iso_year, week_label, person, total in rows:
+        scores.setdefault(row_label(iso_year, week_label), {})[person] = plain_points(total)
+    return scores
+
+def get_daily_scores(week):
+    """Get materialized daily totals of one week as {person: {day: total}}"""
+    rows = execute_sql('SELECT person, day, total FROM daily_scores WHERE iso_year = ? AND week = ?',
+                       (week_key(week)[0], stored_week(week)), fetch=True)
+
+    scores = {}
+    for person, day, total in rows:
+        scores.setdefault(person, {})[day] = plain_points(total)
+    return scores
+
+def get_category_scores(week=None):
+    """Get materialized category points as {week: {person: {category: (points, filled_days)}}}
+    (one week, or all weeks of every year)"""
+    if week is None:
+        rows = execute_sql('SELECT iso_year, week, person, category, points, filled FROM category_scores', fetch=True)
+    else:
+        rows = execute_sql('SELECT iso_year, week, person, category, points, filled FROM category_scores WHERE iso_year = ? AND week = ?',
+                           (week_key(week)[0], stored_week(week)), fetch=True)
+
+    scores = {}
+    for iso_year, week_label, person, category, points, filled in rows:
+        scores.setdefault(row_label(iso_year, week_label), {}).setdefault(person, {})[category] = (plain_points(points), filled)
+    return scores
+
+def get_weekly_scores_range(first, last):
+    """Weekly totals of the weeks from ISO (year, week) first to last as {(year, week): {person: total}}"""
+    rows = execute_sql(f'''
+        SELECT iso_year, iso_week, person, total FROM weekly_scores
+        WHERE {WEEK_RANGE_SQL}
+        ORDER BY iso_year, iso_week
+    ''', tuple(first) + tuple(last), fetch=True)
+
+    scores = {}
+    for iso_year, iso_week, person, total in rows:
+        scores.setdefault((iso_year, iso_week), {})[person] = plain_points(total)
+    return scores
+
+def get_category_scores_range(first, last):
+    """Category points of the weeks from ISO (year, week) first to last as {(year, week): {person: {category: (points, filled_days)}}}"""
+    rows = execute_sql(f'''
+        SELECT iso_year, iso_week, person, category, points, filled FROM category_scores
+        WHERE {WEEK_RANGE_SQL}
+    ''', tuple(first) + tuple(last), fetch=True)
+
+    scores = {}
+    for iso_year, iso_week, person, category, points, filled in rows:
+        scores.setdefault((iso_year, iso_week), {}).setdefault(person, {})[category] = (plain_points(points), filled)
+    return scores
+
+def backup_label(iso_year, week):
+    """Label of a week in backups: always with its year ('2025-KW39'), so a restore puts it back into the same year"""
+    number = week_number(week)
+    return week if number is None else f'{iso_year}-KW{number}'
 
 def backup_to_json(filename=None):
-    """Backup database to JSON file."""
+    """Backup all years of the database to a file, written week by week (see iter_weeks).
+
+    A .json file is in the format save_data() reads, a .ndjson file has one
+    line per week including its ISO year. Both are read back by
+    restore_backup().
+    """
     if not filename:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"brecher_backup_{timestamp}.json"
+    ndjson = filename.endswith('.ndjson')
 
-    data = get_all_data()
-
+    weeks = (((iso_year, iso_week, backup_label(iso_year, week)), week_data)
+             for (iso_year, iso_week, week), week_data in iter_weeks())
     with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+        for chunk in (ndjson_chunks if ndjson else json_chunks)(weeks):
+            f.write(chunk)
 
     print(f"✅ Database backed up to {filename}")
     return filename
 
+def restore_backup(filename):
+    """Write a backup (.json or .ndjson, see backup_to_json) back into the database.
+
+    Existing cells are overwritten, other cells are kept. NDJSON is read line
+    by line and written in blocks of EXPORT_BATCH_SIZE rows, so a backup of
+    any length needs only one block in memory.
+    """
+    if not filename.endswith('.ndjson'):
+        with open(filename, 'r', encoding='utf-8') as f:
+            rows_written = save_data(json.load(f))
+        print(f"✅ Restored {rows_written} records from {filename}")
+        return rows_written
+
+    rows_written = 0
+    batch = []
+    with open(filename, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            week = backup_label(entry['iso_year'], entry['week'])
+            batch.extend(iter_data_rows({week: entry['data']}))
+            if len(batch) >= EXPORT_BATCH_SIZE:
+                rows_written += bulk_write_rows(batch)
+                batch = []
+    rows_written += bulk_write_rows(batch)
+
+    print(f"✅ Restored {rows_written} records from {filename}")
+    return rows_written
+
+# In-Process-Cache der weeks-Tabelle (alle Jahre)
+_weeks_cache = {'rows': None, 'weeks': None, 'keys': frozenset(), 'labeled_on': None, 'loaded_at': 0.0}
+_weeks_lock = threading.Lock()
+
+def invalidate_weeks_cache():
+    """Force the next get_all_weeks() to read the weeks table again"""
+    with _weeks_lock:
+        _weeks_cache['rows'] = None
+
+def register_weeks(weeks):
+    """Add weeks to the weeks table (joins an open transaction)
+
+    Weeks the cache already knows are skipped, so a normal cell update costs
+    no extra statement.
+    """
+    new_weeks = [week_key(week) + (stored_week(week),) for week in weeks]
+    new_weeks = [row for row in new_weeks if (row[0], row[2]) not in _weeks_cache['keys']]
+    if not new_weeks:
+        return
+
+    if config.use_postgresql:
+        execute_many('INSERT INTO weeks (iso_year, iso_week, week) VALUES (?, ?, ?) ON CONFLICT (iso_year, week) DO NOTHING', new_weeks)
+    else:
+        execute_many('INSERT OR IGNORE INTO weeks (iso_year, iso_week, week) VALUES (?, ?, ?)', new_weeks)
+    after_commit(invalidate_weeks_cache)
+
 def get_all_weeks():
-    """Get all available weeks from database."""
-    weeks_raw = execute_sql('SELECT DISTINCT week FROM brecher_data ORDER BY week', fetch=True)
+    """Get all weeks of every year in calendar order from the cached weeks table
+
+    Weeks come as numbers (39) while their plain label 'KW39' means them,
+    older ones as labels ('2025-KW39').
+    """
+    today = datetime.now().date()
+    with _weeks_lock:
+        rows = _weeks_cache['rows']
+        if rows is not None and time.monotonic() - _weeks_cache['loaded_at'] < config.WEEKS_CACHE_TTL:
+            if _weeks_cache['labeled_on'] == today:
+                return list(_weeks_cache['weeks'])
+        else:
+            rows = None
 
-    # Extrahiere Wochennummern aus "KW39" Format
+    if rows is None:
+        rows = execute_sql('SELECT iso_year, iso_week, week FROM weeks ORDER BY iso_year, iso_week', fetch=True)
+        rows = [tuple(row) for row in rows]
+
+    # Nur echte KW-Labels; Labels hängen vom Datum ab (siehe week_keys.week_label)
     weeks = []
-    for week_tuple in weeks_raw:
-        week_str = week_tuple[0]
-        if week_str.startswith('KW'):
+    for iso_year, iso_week, week_str in rows:
+        if week_str == f'KW{iso_week}':
+            label = week_label(iso_year, iso_week, today)
+            weeks.append(iso_week if label == week_str else label)
+
+    with _weeks_lock:
+        if _weeks_cache['rows'] is not rows:
+            _weeks_cache['loaded_at'] = time.monotonic()
+        _weeks_cache['rows'] = rows
+        _weeks_cache['weeks'] = weeks
+        _weeks_cache['keys'] = frozenset((iso_year, week_str) for iso_year, _, week_str in rows)
+        _weeks_cache['labeled_on'] = today
+
+    return list(weeks)
+
+# --- Datenversion und Änderungsprotokoll ---
+#
+# Every write bumps the single row of data_version (the row lock orders the
+# versions like the commits, a rollback leaves no gap) and logs the written
+# weeks under that version in data_changes, tagged with the writing process.
+# Other gunicorn workers compare the version with the one their data_store was
+# loaded at and reload only the weeks changed by someone else.
+
+# Kennung dieses Prozesses in data_changes.origin
+PROCESS_ORIGIN = f'{os.getpid()}-{uuid.uuid4().hex[:8]}'
+
+# NOTIFY-Kanal für PostgreSQL (Payload: neue Version)
+CHANGE_CHANNEL = 'brecher_data_changes'
+
+def touch_weeks(weeks):
+    """Bump the data version and log the written weeks (joins an open transaction)
+
+    Returns the new version.
+    """
+    weeks = sorted(set(weeks))
+    if not weeks:
+        return None
+
+    with db_transaction():
+        execute_sql('UPDATE data_version SET version = version + 1 WHERE id = 1')
+        version = execute_sql('SELECT version FROM data_version WHERE id = 1', fetch=True)[0][0]
+        execute_many('INSERT INTO data_changes (version, week, origin) VALUES (?, ?, ?)',
+                     [(version, week, PROCESS_ORIGIN) for week in weeks])
+
+        # Protokoll kurz halten; wer weiter zurückliegt, lädt komplett neu
+        if version % 100 == 0:
+            execute_sql('DELETE FROM data_changes WHERE version <= ?', (version - config.DATA_CHANGES_KEEP,))
+
+        if config.use_postgresql:
+            execute_sql('SELECT pg_notify(?, ?)', (CHANGE_CHANNEL, str(version)))
+    return version
+
+def get_data_version():
+    """Current data version (one primary-key lookup)"""
+    rows = execute_sql('SELECT version FROM data_version WHERE id = 1', fetch=True)
+    return rows[0][0] if rows else 0
+
+def get_data_changes(since):
+    """Weeks written by other processes after version ``since``
+
+    Returns (version, weeks); weeks is None when the log no longer reaches
+    back to ``since`` and everything has to be reloaded.
+    """
+    with db_transaction():
+        version = get_data_version()
+        if version <= since:
+            return version, set()
+        rows = execute_sql(
+            'SELECT version, week, origin FROM data_changes WHERE version > ? AND version <= ?',
+            (since, version), fetch=True
+        )
+
+    if not rows or min(row[0] for row in rows) > since + 1:
+        return version, None
+    return version, {week for _, week, origin in rows if origin != PROCESS_ORIGIN}
+
+def start_change_listener(on_version):
+    """PostgreSQL: call on_version(version) for every committed change (LISTEN/NOTIFY)
+
+    Runs in a daemon thread on its own connection. on_version(None) means
+    the listener lost its connection and nothing is known until it is back.
+    Returns the thread (None for SQLite).
+    """
+    if not config.use_postgresql:
+        return None
+
+    def listen():
+        import psycopg
+        while True:
             try:
-                week_num = int(week_str[2:])  # "KW39" -> 39
-                weeks.append(week_num)
-            except ValueError:
-                continue
+                conn = psycopg.connect(config.database_config['url'], autocommit=True)
+                try:
+                    conn.execute(f'LISTEN {CHANGE_CHANNEL}')
+                    # Änderungen vor dem LISTEN nicht verpassen
+                    on_version(conn.execute('SELECT version FROM data_version WHERE id = 1').fetchone()[0])
+                    for notify in conn.notifies():
+                        on_version(int(notify.payload))
+                finally:
+                    conn.close()
+            except Exception as e:
+                print(f"⚠️  Change listener reconnecting: {e}")
+            on_version(None)
+            time.sleep(5)
 
-    return sorted(weeks)
+    thread = threading.Thread(target=listen, name='brecher-change-listener', daemon=True)
+    thread.start()
+    return thread
 
-def get_database_stats():
-    """Get database statistics."""
-    total_records = execute_sql('SELECT COUNT(*) FROM brecher_data', fetch=True)[0][0]
-    total_weeks = execute_sql('SELECT COUNT(DISTINCT week) FROM brecher_data', fetch=True)[0][0]
-    total_persons = execute_sql('SELECT COUNT(DISTINCT person) FROM brecher_data', fetch=True)[0][0]
-    last_updated = execute_sql('SELECT MAX(updated_at) FROM brecher_data', fetch=True)[0][0]
+# Kurzlebiger Cache für get_database_stats()
+_stats_cache = {'stats': None, 'loaded_at': 0.0}
+
+def invalidate_stats_cache():
+    _stats_cache['stats'] = None
+
+STATS_SQL = '''
+    SELECT
+        (SELECT row_count FROM data_counts WHERE kind = 'all' AND name = ''),
+        (SELECT COUNT(*) FROM weeks),
+        (SELECT COUNT(*) FROM data_counts WHERE kind = 'person' AND row_count > 0),
+        (SELECT last_updated FROM data_counts WHERE kind = 'all' AND name = '')
+'''
 
+def get_cached_stats():
+    """Stats from the cache, or None when they have to be queried again"""
+    stats = _stats_cache['stats']
+    if stats is None or time.monotonic() - _stats_cache['loaded_at'] >= config.STATS_CACHE_TTL:
+        return None
+    return stats
+
+def store_stats(row):
+    """Build the stats dict from a STATS_SQL row and cache it"""
+    total_records, total_weeks, total_persons, last_updated = row
     db_info = config.database_config['url'] if config.use_postgresql else DATABASE_PATH
-    return {
-        'total_records': total_records,
+    stats = {
+        'total_records': total_records or 0,
         'total_weeks': total_weeks,
         'total_persons': total_persons,
         'last_updated': last_updated,
         'database_file': db_info
     }
+    _stats_cache['stats'] = stats
+    _stats_cache['loaded_at'] = time.monotonic()
+    return stats
+
+def get_database_stats():
+    """Get database statistics (one query on the counters, cached for STATS_CACHE_TTL seconds)."""
+    stats = get_cached_stats()
+    if stats is None:
+        stats = store_stats(execute_sql(STATS_SQL, fetch=True)[0])
+
+    return dict(stats, pool=get_pool_stats())
+
+if __name__ == "__main__" and len(sys.argv) > 1 and sys.argv[1] == 'migrate':
+    # python database.py migrate (Railway preDeployCommand)
+    migrate_database()
+    print(f"✅ Schema version {get_schema_version()}")
+    sys.exit(0)
+
+if __name__ == "__main__" and len(sys.argv) > 1 and sys.argv[1] == 'recount-stats':
+    # python database.py recount-stats
+    init_database()
+    recount_data()
+    print(f"✅ Counters rebuilt: {get_database_stats()['total_records']} records")
+    sys.exit(0)
+
+if __name__ == "__main__" and len(sys.argv) > 1 and sys.argv[1] in ('rebuild-scores', 'verify-scores'):
+    # python database.py rebuild-scores | verify-scores
+    init_database()
+    if sys.argv[1] == 'rebuild-scores':
+        rebuild_score_tables()
+    mismatches = verify_score_tables()
+    for week, person, day, stored, expected in mismatches:
+        print(f"❌ {week} {person} {day or 'Woche'}: stored={stored} expected={expected}")
+    print(f"{'✅' if not mismatches else '❌'} Score tables checked: {len(mismatches)} mismatches")
+    sys.exit(1 if mismatches else 0)
+
+if __name__ == "__main__" and len(sys.argv) > 1 and sys.argv[1] == 'backup':
+    # python database.py backup [datei.json | datei.ndjson]
+    init_database()
+    backup_to_json(sys.argv[2] if len(sys.argv) > 2 else None)
+    sys.exit(0)
+
+if __name__ == "__main__" and len(sys.argv) > 2 and sys.argv[1] == 'restore':
+    # python database.py restore datei.json | datei.ndjson
+    init_database()
+    restore_backup(sys.argv[2])
+    sys.exit(0)
 
 if __name__ == "__main__":
     # Initialize database and migrate from JSON
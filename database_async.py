@@ -0,0 +1,100 @@
+"""
+Async database access for the ASGI entry point (asgi.py).
+
+PostgreSQL uses psycopg's AsyncConnection from a small asyncio pool, so a
+request waiting on the database does not hold a thread. SQLite has no async
+driver; its statements run in the default executor on the thread-local
+connections of database.py (they are local file I/O and short).
+"""
+
+import asyncio
+
+import database
+from database import STATS_SQL, config, get_cached_stats, get_pool_stats, store_stats
+
+
+class AsyncConnectionPool:
+    """Bounded pool of psycopg AsyncConnections"""
+
+    def __init__(self, url, size=5):
+        self.url = url
+        self.size = size
+        self._idle = []
+        self._open = 0
+        self._available = None  # asyncio.Condition, im laufenden Loop angelegt
+
+    async def getconn(self):
+        if self._available is None:
+            self._available = asyncio.Condition()
+        async with self._available:
+            while not self._idle and self._open >= self.size:
+                await self._available.wait()
+            if self._idle:
+                conn = self._idle.pop()
+                if not conn.closed:
+                    return conn
+                self._open -= 1
+            self._open += 1
+        try:
+            import psycopg
+            return await psycopg.AsyncConnection.connect(self.url)
+        except Exception:
+            async with self._available:
+                self._open -= 1
+                self._available.notify()
+            raise
+
+    async def putconn(self, conn, discard=False):
+        if discard or conn.closed:
+            try:
+                await conn.close()
+            except Exception:
+                pass
+        async with self._available:
+            if discard or conn.closed:
+                self._open -= 1
+            else:
+                self._idle.append(conn)
+            self._available.notify()
+
+
+_async_pool = None
+
+def get_async_pool():
+    global _async_pool
+    if _async_pool is None:
+        _async_pool = AsyncConnectionPool(config.database_config['url'], size=config.DB_POOL_SIZE)
+    return _async_pool
+
+async def execute_sql_async(sql, params=None, fetch=False):
+    """execute_sql() for coroutines (one statement, committed on its own)"""
+    if not config.use_postgresql:
+        return await asyncio.get_running_loop().run_in_executor(
+            None, lambda: database.execute_sql(sql, params, fetch)
+        )
+
+    pool = get_async_pool()
+    conn = await pool.getconn()
+    discard = False
+    try:
+        async with conn.cursor() as cursor:
+            await cursor.execute(sql.replace('?', '%s'), params or ())
+            result = await cursor.fetchall() if fetch else None
+        await conn.commit()
+        return result
+    except Exception:
+        try:
+            await conn.rollback()
+        except Exception:
+            discard = True
+        raise
+    finally:
+        await pool.putconn(conn, discard=discard)
+
+async def get_database_stats_async():
+    """get_database_stats() without blocking the event loop (same cache)"""
+    stats = get_cached_stats()
+    if stats is None:
+        rows = await execute_sql_async(STATS_SQL, fetch=True)
+        stats = store_stats(rows[0])
+    return dict(stats, pool=get_pool_stats())
@@ -0,0 +1,228 @@
+import sqlite3
+import threading
+import time
+
+
+class PoolTimeout(Exception):
+    """Keine Verbindung innerhalb des Timeouts verfügbar"""
+
+
+class ConnectionPool:
+    """Bounded pool for PostgreSQL connections
+
+    Connections are handed out LIFO so the pool naturally shrinks back to the
+    connections that are actually in use. Idle connections older than
+    ``max_idle`` seconds are replaced, and connections idle for longer than
+    ``health_check_interval`` seconds are pinged with ``SELECT 1`` before
+    they are handed out again.
+    """
+
+    def __init__(self, connect, size=5, timeout=30, max_idle=300, health_check_interval=30):
+        self._connect = connect
+        self.size = size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.health_check_interval = health_check_interval
+
+        self._idle = []  # [(conn, last_used), ...]
+        self._open = 0
+        self._cond = threading.Condition()
+        self.stats = {
+            'checkouts': 0,
+            'waits': 0,
+            'wait_time': 0.0,
+            'reconnects': 0,
+            'connections_created': 0,
+            'connections_closed': 0,
+        }
+
+    def getconn(self):
+        """Leihe eine Verbindung aus (blockiert, wenn der Pool ausgeschöpft ist)"""
+        deadline = time.monotonic() + self.timeout
+        with self._cond:
+            self.stats['checkouts'] += 1
+            wait_started = None
+            while not self._idle and self._open >= self.size:
+                if wait_started is None:
+                    wait_started = time.monotonic()
+                    self.stats['waits'] += 1
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.stats['wait_time'] += time.monotonic() - wait_started
+                    raise PoolTimeout(f'No database connection available after {self.timeout}s (pool size {self.size})')
+                self._cond.wait(remaining)
+            if wait_started is not None:
+                self.stats['wait_time'] += time.monotonic() - wait_started
+
+            if self._idle:
+                conn, last_used = self._idle.pop()
+            else:
+                conn, last_used = None, None
+                self._open += 1
+
+        if conn is None:
+            return self._new_connection()
+
+        idle_for = time.monotonic() - last_used
+        if idle_for > self.max_idle or (idle_for > self.health_check_interval and not self._is_healthy(conn)):
+            self._close(conn)
+            with self._cond:
+                self.stats['reconnects'] += 1
+            return self._new_connection()
+
+        return conn
+
+    def putconn(self, conn, discard=False):
+        """Gib eine Verbindung an den Pool zurück"""
+        if not discard and not conn.closed:
+            try:
+                # Offene oder abgebrochene Transaktionen nicht an den nächsten Nutzer weiterreichen
+                if conn.info.transaction_status != 0:  # psycopg.pq.TransactionStatus.IDLE
+                    conn.rollback()
+            except Exception:
+                discard = True
+
+        with self._cond:
+            if discard or conn.closed:
+                self._open -= 1
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+        if discard:
+            self._close(conn)
+
+    def close_all(self):
+        """Schließe alle Verbindungen im Leerlauf"""
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+        for conn, _ in idle:
+            self._close(conn)
+
+    def get_stats(self):
+        with self._cond:
+            stats = dict(self.stats)
+            stats['pool_size'] = self.size
+            stats['open_connections'] = self._open
+            stats['idle_connections'] = len(self._idle)
+            stats['in_use'] = self._open - len(self._idle)
+        stats['wait_time'] = round(stats['wait_time'], 4)
+        return stats
+
+    def _new_connection(self):
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self.stats['connections_created'] += 1
+        return conn
+
+    def _close(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self.stats['connections_closed'] += 1
+
+    @staticmethod
+    def _is_healthy(conn):
+        try:
+            conn.execute('SELECT 1')
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+
+class ThreadLocalSQLitePool:
+    """Persistent SQLite connection per thread
+
+    SQLite connections are cheap to keep open but must not be shared between
+    threads, so every thread gets its own connection which is reused for all
+    of its statements.
+    """
+
+    def __init__(self, path, max_idle=300, health_check_interval=30):
+        self.path = path
+        self.max_idle = max_idle
+        self.health_check_interval = health_check_interval
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.stats = {
+            'checkouts': 0,
+            'waits': 0,
+            'wait_time': 0.0,
+            'reconnects': 0,
+            'connections_created': 0,
+            'connections_closed': 0,
+        }
+
+    def getconn(self):
+        conn = getattr(self._local, 'conn', None)
+        last_used = getattr(self._local, 'last_used', None)
+        reconnect = False
+
+        if conn is not None:
+            idle_for = time.monotonic() - last_used
+            if idle_for > self.max_idle or (idle_for > self.health_check_interval and not self._is_healthy(conn)):
+                self._close(conn)
+                conn = None
+                reconnect = True
+
+        if conn is None:
+            conn = sqlite3.connect(self.path)
+            self._local.conn = conn
+            self._local.last_used = time.monotonic()
+            with self._lock:
+                self.stats['connections_created'] += 1
+
+        with self._lock:
+            self.stats['checkouts'] += 1
+            if reconnect:
+                self.stats['reconnects'] += 1
+        return conn
+
+    def putconn(self, conn, discard=False):
+        if discard:
+            self._close(conn)
+            self._local.conn = None
+            return
+        if conn.in_transaction:
+            conn.rollback()
+        self._local.last_used = time.monotonic()
+
+    def close_all(self):
+        """Schließe die Verbindung des aktuellen Threads"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            self._close(conn)
+            self._local.conn = None
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+        stats['pool_size'] = None  # eine Verbindung pro Thread
+        stats['open_connections'] = stats['connections_created'] - stats['connections_closed']
+        return stats
+
+    def _close(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._lock:
+            self.stats['connections_closed'] += 1
+
+    @staticmethod
+    def _is_healthy(conn):
+        try:
+            conn.execute('SELECT 1').fetchall()
+            return True
+        except sqlite3.Error:
+            return False
@@ -0,0 +1,125 @@
+"""
+Fan-out hub for Server-Sent Events (/api/stream).
+
+Published events are encoded to their SSE text once and appended to a short
+ring buffer with increasing ids. A connection does not own a queue or a
+thread: its generator blocks in wait() until an event newer than the last id
+it sent arrives (or the keepalive timeout passes) and then sends the events
+of its week. With the gevent worker (see Procfile) every open stream is a
+greenlet waiting on the same condition; the streams of asgi.py register an
+asyncio.Event instead, which publish() sets from any thread.
+
+Event ids are '<tag>-<n>' with a random tag per hub (= per worker process).
+Clients that reconnect send Last-Event-ID and get the events they missed as
+long as they are still in the buffer of the same hub; otherwise (buffer
+overrun, another worker, restart) they get a 'reset' event and reload the
+page.
+"""
+
+import json
+import threading
+import uuid
+from collections import deque
+
+
+def encode_event(event_id, event_type, data):
+    """SSE text of one event"""
+    payload = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    return f'id: {event_id}\nevent: {event_type}\ndata: {payload}\n\n'
+
+
+class EventHub:
+    """Ring buffer of encoded events plus a condition all streams wait on"""
+
+    def __init__(self, history=256):
+        self._events = deque(maxlen=history)  # (id, week, encoded)
+        self.tag = uuid.uuid4().hex[:12]
+        self._cond = threading.Condition()
+        self.last_id = 0
+        self.subscribers = 0
+        self.published = 0
+        self._async_waiters = set()  # (loop, asyncio.Event)
+
+    def publish(self, event_type, data, week=None):
+        """Encode an event once and wake all streams (week=None: for every week)"""
+        with self._cond:
+            self.last_id += 1
+            self._events.append((self.last_id, week, encode_event(self.event_id(self.last_id), event_type, data)))
+            self.published += 1
+            self._cond.notify_all()
+            self._wake_async()
+        return self.last_id
+
+    def wake(self):
+        """Alle wartenden Streams aufwecken (z.B. nach Änderungen anderer Worker)"""
+        with self._cond:
+            self._cond.notify_all()
+            self._wake_async()
+
+    def _wake_async(self):
+        for loop, event in self._async_waiters:
+            loop.call_soon_threadsafe(event.set)
+
+    def register_async(self, loop, event):
+        """Set event (in loop) whenever something is published or wake() is called"""
+        with self._cond:
+            self._async_waiters.add((loop, event))
+
+    def unregister_async(self, loop, event):
+        with self._cond:
+            self._async_waiters.discard((loop, event))
+
+    def event_id(self, number):
+        return f'{self.tag}-{number}'
+
+    def subscribe(self, last_event_id=''):
+        """Register a stream and return the id to wait() after
+
+        A Last-Event-ID of this hub resumes after that event; an id of another
+        hub (other worker, restart) or a plain number gets a 'reset' first.
+        """
+        with self._cond:
+            self.subscribers += 1
+            if not last_event_id:
+                return self.last_id
+            tag, _, number = last_event_id.rpartition('-')
+            if tag == self.tag and number.isdigit() and int(number) <= self.last_id:
+                return int(number)
+            return -1  # wait() antwortet mit 'reset'
+
+    def unsubscribe(self):
+        with self._cond:
+            self.subscribers -= 1
+
+    def wait(self, after_id, week=None, timeout=15):
+        """Wait for events newer than after_id
+
+        Returns (last_id, [encoded events for week]). An empty list means the
+        timeout passed (or wake() was called) without new events. If events
+        after after_id have already left the buffer, a single 'reset' event
+        is returned instead.
+        """
+        with self._cond:
+            if self.last_id <= after_id and timeout:
+                self._cond.wait(timeout)
+            if self.last_id <= after_id:
+                return after_id, []
+
+            oldest_id = self._events[0][0] if self._events else self.last_id + 1
+            if after_id + 1 < oldest_id:
+                return self.last_id, [encode_event(self.event_id(self.last_id), 'reset', {})]
+
+            events = [
+                encoded for event_id, event_week, encoded in self._events
+                if event_id > after_id and (week is None or event_week is None or event_week == week)
+            ]
+            return self.last_id, events
+
+    def stats(self):
+        with self._cond:
+            return {
+                'last_id': self.last_id,
+                'buffered': len(self._events),
+                'subscribers': self.subscribers,
+                'published': self.published,
+            }
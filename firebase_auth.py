@@ -1,22 +1,38 @@
-import firebase_admin
-from firebase_admin import credentials, auth
 from functools import wraps
 from flask import request, jsonify, session, current_app
+import hashlib
 import json
 import os
+import threading
+import time
 from config import Config
+from result_cache import TTLCache
 
-# Initialize Firebase Admin SDK
+# Initialize Firebase Admin SDK (firebase_admin wird erst in init_firebase importiert)
 firebase_app = None
+_firebase_checked = False
+_firebase_lock = threading.Lock()
 config = Config()
 
+# Verifizierte ID-Tokens (SHA-256 des Tokens -> Claims) bis zu ihrem exp-Claim
+_token_cache = TTLCache(maxsize=config.FIREBASE_TOKEN_CACHE_SIZE, ttl=0)
+# Firebase User Records (uid -> (display_name, photo_url)), siehe get_user_record
+_user_record_cache = TTLCache(maxsize=config.FIREBASE_TOKEN_CACHE_SIZE, ttl=config.FIREBASE_USER_CACHE_TTL)
+
 def init_firebase():
-    """Initialize Firebase Admin SDK"""
-    global firebase_app
+    """Initialize Firebase Admin SDK (once; the warm-up in app.py calls it before the first request)"""
+    global firebase_app, _firebase_checked
 
-    if firebase_app:
+    if _firebase_checked:
         return firebase_app
 
+    with _firebase_lock:
+        if not _firebase_checked:
+            firebase_app = _init_firebase_app()
+            _firebase_checked = True
+    return firebase_app
+
+def _init_firebase_app():
     try:
         # Check if Firebase credentials are available
         if not all([
@@ -38,6 +54,9 @@ def init_firebase():
             "token_uri": config.FIREBASE_TOKEN_URI,
         }
 
+        import firebase_admin
+        from firebase_admin import credentials
+
         cred = credentials.Certificate(cred_dict)
         firebase_app = firebase_admin.initialize_app(cred)
 
@@ -49,8 +68,38 @@ def init_firebase():
         return None
 
 
+def decode_token_cached(id_token):
+    """auth.verify_id_token with the result cached until the token's exp claim
+
+    Repeat requests with the same token skip the signature check.
+    """
+    key = hashlib.sha256(id_token.encode('utf-8')).hexdigest()
+    found, decoded_token = _token_cache.lookup(key)
+    if found:
+        return decoded_token
+
+    from firebase_admin import auth
+    decoded_token = auth.verify_id_token(id_token)
+    lifetime = decoded_token.get('exp', 0) - time.time()
+    if lifetime > 0:
+        _token_cache.put(key, decoded_token, ttl=lifetime)
+    return decoded_token
+
+def get_user_record(uid):
+    """(display_name, photo_url) from auth.get_user, cached for FIREBASE_USER_CACHE_TTL seconds"""
+    def load():
+        from firebase_admin import auth
+        user_record = auth.get_user(uid)
+        return user_record.display_name, user_record.photo_url
+    return _user_record_cache.get(uid, load)
+
+def get_auth_cache_stats():
+    """Hit/Miss-Zähler von Token- und User-Record-Cache"""
+    return {'tokens': _token_cache.stats(), 'user_records': _user_record_cache.stats()}
+
 def verify_firebase_token(id_token):
     """Verify Firebase ID token and return user info"""
+    from firebase_admin import auth
     try:
         print(f"🔥 Starting Firebase token verification (token length: {len(id_token) if id_token else 0})")
 
@@ -71,22 +120,21 @@ def verify_firebase_token(id_token):
 
         print(f"🔥 Firebase app available, verifying token...")
 
-        # Verify the ID token
-        decoded_token = auth.verify_id_token(id_token)
+        # Verify the ID token (cached until it expires)
+        decoded_token = decode_token_cached(id_token)
         print(f"✅ Token verified successfully")
         print(f"🔥 Token claims: uid={decoded_token.get('uid')}, email={decoded_token.get('email')}, name={decoded_token.get('name')}")
 
-        # Get additional user info from Firebase Admin SDK
+        # Get additional user info from Firebase Admin SDK (oder nur aus den Token-Claims)
         uid = decoded_token['uid']
-        try:
-            user_record = auth.get_user(uid)
-            display_name = user_record.display_name
-            profile_picture = user_record.photo_url
-            print(f"🔥 User record retrieved: display_name={display_name}")
-        except Exception as e:
-            print(f"⚠️ Could not get user record: {e}")
-            display_name = decoded_token.get('name')
-            profile_picture = decoded_token.get('picture')
+        display_name = decoded_token.get('name')
+        profile_picture = decoded_token.get('picture')
+        if config.FIREBASE_FETCH_USER_RECORD:
+            try:
+                display_name, profile_picture = get_user_record(uid)
+                print(f"🔥 User record retrieved: display_name={display_name}")
+            except Exception as e:
+                print(f"⚠️ Could not get user record: {e}")
 
         user_info = {
             'firebase_uid': decoded_token['uid'],
@@ -149,22 +197,30 @@ def require_firebase_auth(f):
     return decorated_function
 
 
+# asgi.py lädt das Profil vorab asynchron und legt (firebase_uid, Profil) hier ins WSGI-environ
+PREFETCHED_PROFILE_KEY = 'brecher.user_profile'
+
+def _user_profile(firebase_uid):
+    prefetched = request.environ.get(PREFETCHED_PROFILE_KEY)
+    if prefetched is not None and prefetched[0] == firebase_uid:
+        return dict(prefetched[1]) if prefetched[1] is not None else None
+    from firestore_users import get_cached_user_profile
+    return get_cached_user_profile(firebase_uid)
+
 def get_current_user():
-    """Get current authenticated user info from Firestore"""
+    """Get current authenticated user info from Firestore (cached, see get_cached_user_profile)"""
     # Try Firebase user first
     if hasattr(request, 'firebase_user'):
         firebase_uid = request.firebase_user.get('firebase_uid')
         if firebase_uid:
-            from firestore_users import get_user_profile
-            return get_user_profile(firebase_uid)
+            return _user_profile(firebase_uid)
         return request.firebase_user
 
     # Fallback to session
     if session.get('firebase_user'):
         firebase_uid = session['firebase_user'].get('firebase_uid')
         if firebase_uid:
-            from firestore_users import get_user_profile
-            return get_user_profile(firebase_uid)
+            return _user_profile(firebase_uid)
         return session['firebase_user']
 
     return None
@@ -172,4 +228,4 @@ def get_current_user():
 
 def is_firebase_available():
     """Check if Firebase is properly configured and available"""
-    return firebase_app is not None
\ No newline at end of file
+    return init_firebase() is not None
\ No newline at end of file
@@ -1,41 +1,89 @@
-import firebase_admin
-from firebase_admin import firestore
 from datetime import datetime
 import json
 from config import Config
+from result_cache import TTLCache
 
 config = Config()
 
+# Prozesslokaler Cache der Profile (firebase_uid -> Profil oder None), siehe get_cached_user_profile
+_profile_cache = TTLCache(
+    maxsize=config.USER_PROFILE_CACHE_SIZE,
+    ttl=config.USER_PROFILE_CACHE_TTL,
+    negative_ttl=config.USER_PROFILE_NEGATIVE_TTL
+)
+
 def get_firestore_client():
     """Get Firestore client instance"""
-    if not firebase_admin._apps:
-        from firebase_auth import init_firebase
-        init_firebase()
+    # firebase_admin/Firestore erst beim ersten Zugriff laden (schnellerer Import von app.py)
+    from firebase_auth import init_firebase
+    init_firebase()
 
+    from firebase_admin import firestore
     return firestore.client()
 
+def get_async_firestore_client():
+    """Get async Firestore client instance (for asgi.py)"""
+    from firebase_auth import init_firebase
+    init_firebase()
+
+    from firebase_admin import firestore_async
+    return firestore_async.client()
+
+def _profile_document(firebase_uid, email, display_name=None, profile_data=None):
+    from firebase_admin import firestore
+    user_data = {
+        'firebase_uid': firebase_uid,
+        'email': email,
+        'display_name': display_name,
+        'created_at': firestore.SERVER_TIMESTAMP,
+        'updated_at': firestore.SERVER_TIMESTAMP,
+        'is_active': True
+    }
+
+    # Add extended profile data if provided
+    if profile_data:
+        user_data.update(profile_data)
+    return user_data
+
 def create_user_profile(firebase_uid, email, display_name=None, profile_data=None):
     """Create or update user profile in Firestore"""
     try:
         db = get_firestore_client()
-
-        # Base user data
-        user_data = {
-            'firebase_uid': firebase_uid,
-            'email': email,
-            'display_name': display_name,
-            'created_at': firestore.SERVER_TIMESTAMP,
-            'updated_at': firestore.SERVER_TIMESTAMP,
-            'is_active': True
-        }
-
-        # Add extended profile data if provided
-        if profile_data:
-            user_data.update(profile_data)
+        user_data = _profile_document(firebase_uid, email, display_name, profile_data)
 
         # Use merge=True to update existing document or create new one
         doc_ref = db.collection('users').document(firebase_uid)
         doc_ref.set(user_data, merge=True)
+        invalidate_user_profile(firebase_uid)
+
+        print(f"✅ User profile created/updated in Firestore for: {email}")
+        return user_data
+
+    except Exception as e:
+        print(f"❌ Failed to create user profile in Firestore: {e}")
+        return None
+
+def _load_user_profile(firebase_uid):
+    """Read one profile from Firestore (None if it does not exist, errors are raised)"""
+    db = get_firestore_client()
+    doc_ref = db.collection('users').document(firebase_uid)
+    doc = doc_ref.get()
+
+    if doc.exists:
+        data = doc.to_dict()
+        print(f"✅ User profile loaded from Firestore: {data.get('email')}")
+        return data
+    else:
+        print(f"❌ User profile not found in Firestore: {firebase_uid}")
+        return None
+
+async def create_user_profile_async(firebase_uid, email, display_name=None, profile_data=None):
+    """create_user_profile() with the async Firestore client"""
+    try:
+        db = get_async_firestore_client()
+        user_data = _profile_document(firebase_uid, email, display_name, profile_data)
+        await db.collection('users').document(firebase_uid).set(user_data, merge=True)
+        invalidate_user_profile(firebase_uid)
 
         print(f"✅ User profile created/updated in Firestore for: {email}")
         return user_data
@@ -44,24 +92,56 @@ def create_user_profile(firebase_uid, email, display_name=None, profile_data=Non
         print(f"❌ Failed to create user profile in Firestore: {e}")
         return None
 
+async def _load_user_profile_async(firebase_uid):
+    db = get_async_firestore_client()
+    doc = await db.collection('users').document(firebase_uid).get()
+
+    if doc.exists:
+        data = doc.to_dict()
+        print(f"✅ User profile loaded from Firestore: {data.get('email')}")
+        return data
+    else:
+        print(f"❌ User profile not found in Firestore: {firebase_uid}")
+        return None
+
 def get_user_profile(firebase_uid):
     """Get user profile from Firestore"""
     try:
-        db = get_firestore_client()
-        doc_ref = db.collection('users').document(firebase_uid)
-        doc = doc_ref.get()
+        return _load_user_profile(firebase_uid)
+    except Exception as e:
+        print(f"❌ Failed to get user profile from Firestore: {e}")
+        return None
 
-        if doc.exists:
-            data = doc.to_dict()
-            print(f"✅ User profile loaded from Firestore: {data.get('email')}")
-            return data
-        else:
-            print(f"❌ User profile not found in Firestore: {firebase_uid}")
-            return None
+def get_cached_user_profile(firebase_uid):
+    """Get user profile, from the process-local cache if possible
 
+    Profiles are kept for USER_PROFILE_CACHE_TTL seconds, missing profiles for
+    USER_PROFILE_NEGATIVE_TTL seconds. Firestore errors are not cached.
+    """
+    try:
+        profile = _profile_cache.get(firebase_uid, lambda: _load_user_profile(firebase_uid))
     except Exception as e:
         print(f"❌ Failed to get user profile from Firestore: {e}")
         return None
+    # Kopie, damit Aufrufer den gecachten Eintrag nicht verändern
+    return dict(profile) if profile is not None else None
+
+async def get_cached_user_profile_async(firebase_uid):
+    """get_cached_user_profile() with the async Firestore client (same cache)"""
+    try:
+        profile = await _profile_cache.aget(firebase_uid, lambda: _load_user_profile_async(firebase_uid))
+    except Exception as e:
+        print(f"❌ Failed to get user profile from Firestore: {e}")
+        return None
+    return dict(profile) if profile is not None else None
+
+def invalidate_user_profile(firebase_uid=None):
+    """Verwirf gecachte Profile (eines Users oder alle)"""
+    _profile_cache.invalidate(firebase_uid)
+
+def get_profile_cache_stats():
+    """Hit/Miss-Zähler des Profil-Caches"""
+    return _profile_cache.stats()
 
 def update_user_profile(firebase_uid, update_data):
     """Update specific fields in user profile"""
@@ -70,9 +150,11 @@ def update_user_profile(firebase_uid, update_data):
         doc_ref = db.collection('users').document(firebase_uid)
 
         # Add timestamp to update
+        from firebase_admin import firestore
         update_data['updated_at'] = firestore.SERVER_TIMESTAMP
 
         doc_ref.update(update_data)
+        invalidate_user_profile(firebase_uid)
         print(f"✅ User profile updated in Firestore: {firebase_uid}")
         return True
 
@@ -86,6 +168,7 @@ def delete_user_profile(firebase_uid):
         db = get_firestore_client()
         doc_ref = db.collection('users').document(firebase_uid)
         doc_ref.delete()
+        invalidate_user_profile(firebase_uid)
 
         print(f"✅ User profile deleted from Firestore: {firebase_uid}")
         return True
@@ -0,0 +1,7 @@
+# Gunicorn-Hooks (Server-Optionen stehen im Procfile)
+
+
+def post_worker_init(worker):
+    """Jeder Worker wärmt sich im Hintergrund auf und nimmt sofort Requests an"""
+    from app import start_warm_up
+    start_warm_up()
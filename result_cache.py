@@ -0,0 +1,166 @@
+"""
+Small in-process caches.
+
+VersionedCache holds derived results (dashboard scoreboards and statistics).
+Every entry is stored under the data version that was current when it was
+computed. Changing the data bumps the version, so older entries are never
+returned again; they are dropped right away and the cache never holds more
+than ``maxsize`` entries (least recently used first out).
+
+TTLCache holds results of remote lookups (Firestore user profiles, Firebase
+user records, verified ID tokens). Entries expire after ``ttl`` seconds (or
+an expiry given per entry with put()); a result of None ("not found") is
+cached too, for ``negative_ttl`` seconds. Both caches count hits and misses.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class VersionedCache:
+    """LRU cache whose entries are only valid for one data version"""
+
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self.version = 0
+        self._entries = OrderedDict()  # (version, key) -> Ergebnis
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def bump(self):
+        """Daten haben sich geändert: alle bisherigen Ergebnisse verwerfen"""
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+        return self.version
+
+    def get(self, key, compute):
+        """Return the cached result for key or compute and store it"""
+        with self._lock:
+            version = self.version
+            entry_key = (version, key)
+            if entry_key in self._entries:
+                self._entries.move_to_end(entry_key)
+                self.hits += 1
+                return self._entries[entry_key]
+            self.misses += 1
+
+        # Ohne Lock rechnen; ein paralleles bump() macht das Ergebnis ungültig
+        result = compute()
+
+        with self._lock:
+            if self.version == version and self.maxsize > 0:
+                self._entries[entry_key] = result
+                self._entries.move_to_end(entry_key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return result
+
+    def stats(self):
+        with self._lock:
+            return {
+                'version': self.version,
+                'entries': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+class TTLCache:
+    """LRU cache with expiry per entry and negative caching of None"""
+
+    def __init__(self, maxsize=256, ttl=300, negative_ttl=30):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries = OrderedDict()  # key -> (läuft ab um, Wert)
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, load):
+        """Return the cached value for key or load() it
+
+        Exceptions of load() are not cached.
+        """
+        found, value = self.lookup(key)
+        if found:
+            return value
+        with self._lock:
+            generation = self._generation
+
+        value = load()
+
+        with self._lock:
+            # Während des Ladens invalidiert: Ergebnis nicht speichern
+            if generation == self._generation:
+                self._store(key, value)
+        return value
+
+    async def aget(self, key, load):
+        """get() for coroutines: load is an async function"""
+        found, value = self.lookup(key)
+        if found:
+            return value
+        with self._lock:
+            generation = self._generation
+
+        value = await load()
+
+        with self._lock:
+            if generation == self._generation:
+                self._store(key, value)
+        return value
+
+    def lookup(self, key):
+        """(True, value) for a live entry, else (False, None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key, value, ttl=None):
+        """Store value, optionally with its own lifetime in seconds"""
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def _store(self, key, value, ttl=None):
+        if ttl is None:
+            ttl = self.negative_ttl if value is None else self.ttl
+        if ttl <= 0 or self.maxsize <= 0:
+            self._entries.pop(key, None)
+            return
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key=None):
+        """Verwirf einen Eintrag (oder alle)"""
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'negative_ttl': self.negative_ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
@@ -0,0 +1,212 @@
+"""
+Incremental scoring for single cell edits.
+
+Every person-week keeps its derived values (cell points, Fehler points per
+day, daily totals, bonus components, weekly total) together with the
+dependency graph between them:
+
+    cell            -> daily total of its day -> weekly total
+    Fehler of a day -> Fehler points of that day and every later day
+                       (the first error of the week is free) -> their daily totals
+    Fehler of a day -> Fehler bonus (all seven days entered and 0) -> weekly total
+    Gym of a day    -> gym bonus (5 workouts) -> weekly total
+
+An edit only recomputes the nodes reachable from the edited cell and reports
+the ones whose value actually changed. Only the edited cell is scored again;
+a daily total re-adds the cached points of its day in category order, so the
+results are bit-identical to scoring.score_person_week (adding deltas to a
+running float sum drifts across the rounding to two decimals). The work per
+edit does not depend on the number of people or weeks.
+"""
+
+from cell_values import FLAG_NUMBER, parse_value
+from scoring import CATEGORIES, DAYS, calculate_points, fehler_day_points, get_fehler_count
+
+def _parts(value):
+    if not value:
+        return None, None
+    try:
+        return value.num, value.flag
+    except AttributeError:
+        return parse_value(value)
+
+def _gym_workouts(value):
+    """Beitrag eines Gym-Werts zum 5x-Gym-Bonus (nur echte Workouts, kein 'R')"""
+    num, flag = _parts(value)
+    if flag == FLAG_NUMBER and num > 0:
+        return num
+    return 0
+
+def _fehler_free(value):
+    """Tag zählt für den Fehler-Bonus nur mit explizit eingetragener 0"""
+    num, flag = _parts(value)
+    return flag == FLAG_NUMBER and num == 0
+
+def _positive_count(value):
+    count = get_fehler_count(value)
+    return count if count is not None and count > 0 else 0
+
+
+class PersonWeekScores:
+    """Derived values of one person in one week"""
+
+    def __init__(self, person_data):
+        self.points = {}       # (day, category) -> Punkte der Zelle (ohne Fehler)
+        self.fehler_counts = {}
+        self.fehler_points = {}
+        self.fehler_free_days = set()
+        self.gym_workouts = {}
+        self.daily = {}
+
+        errors_before = 0
+        for day in DAYS:
+            day_data = person_data.get(day, {})
+            fehler_value = day_data.get('Fehler', '')
+            count = _positive_count(fehler_value)
+            self.fehler_counts[day] = count
+            self.fehler_points[day] = fehler_day_points(count, errors_before)
+            errors_before += count
+            if _fehler_free(fehler_value):
+                self.fehler_free_days.add(day)
+            self.gym_workouts[day] = _gym_workouts(day_data.get('Gym', ''))
+
+            for category in CATEGORIES:
+                if category != 'Fehler':
+                    self.points[(day, category)] = calculate_points(category, day_data.get(category, ''))
+            self.daily[day] = self._daily_total(day)
+
+        self.gym_count = sum(self.gym_workouts.values())
+        self.gym_bonus = 2 if self.gym_count >= 5 else 0
+        self.fehler_bonus = 2 if len(self.fehler_free_days) == len(DAYS) else 0
+        self.total = self._weekly_total()
+
+    @property
+    def bonus(self):
+        return self.gym_bonus + self.fehler_bonus
+
+    def _weekly_total(self):
+        total = 0
+        for day in DAYS:
+            total += self.daily[day]
+        return round(total + self.bonus, 2)
+
+    def _daily_total(self, day):
+        """Summe in derselben Reihenfolge wie scoring.calculate_daily_total"""
+        total = 0
+        for category in CATEGORIES:
+            if category == 'Fehler':
+                total += self.fehler_points[day]
+            else:
+                total += self.points[(day, category)]
+        return round(total, 2)
+
+    def _refresh_day(self, day, changed_days):
+        daily = self._daily_total(day)
+        if daily != self.daily[day]:
+            self.daily[day] = daily
+            changed_days.add(day)
+
+    def update(self, day, category, value):
+        """Apply one cell edit and return the derived values that changed
+
+        The result always contains the points of the edited cell and the new
+        daily/weekly totals and bonus values; ``daily`` and ``fehler`` only
+        list days whose value changed and ``bonus_changed`` tells whether the
+        bonus row needs to be redrawn.
+        """
+        old_bonus = (self.gym_bonus, self.fehler_bonus)
+        changed_days = set()
+        fehler_changed = {}
+
+        if category == 'Fehler':
+            self.fehler_counts[day] = _positive_count(value)
+            if _fehler_free(value):
+                self.fehler_free_days.add(day)
+            else:
+                self.fehler_free_days.discard(day)
+            self.fehler_bonus = 2 if len(self.fehler_free_days) == len(DAYS) else 0
+
+            # Position der Fehler in der Woche: nur dieser und spätere Tage können sich ändern
+            errors_before = 0
+            start = DAYS.index(day)
+            for earlier_day in DAYS[:start]:
+                errors_before += self.fehler_counts[earlier_day]
+            for later_day in DAYS[start:]:
+                count = self.fehler_counts[later_day]
+                points = fehler_day_points(count, errors_before)
+                errors_before += count
+                old_points = self.fehler_points[later_day]
+                if later_day == day or points != old_points:
+                    self.fehler_points[later_day] = points
+                    self._refresh_day(later_day, changed_days)
+                    fehler_changed[later_day] = points
+            cell_points = self.fehler_points[day]
+        else:
+            cell_points = calculate_points(category, value)
+            if cell_points != self.points[(day, category)]:
+                self.points[(day, category)] = cell_points
+                self._refresh_day(day, changed_days)
+
+            if category == 'Gym':
+                self.gym_workouts[day] = _gym_workouts(value)
+                self.gym_count = sum(self.gym_workouts[gym_day] for gym_day in DAYS)
+                self.gym_bonus = 2 if self.gym_count >= 5 else 0
+
+        bonus_changed = (self.gym_bonus, self.fehler_bonus) != old_bonus
+        if changed_days or bonus_changed:
+            self.total = self._weekly_total()
+
+        return {
+            'points': cell_points,
+            'daily_total': self.daily[day],
+            'daily': {changed_day: self.daily[changed_day] for changed_day in changed_days},
+            'fehler': fehler_changed,
+            'weekly_total': self.total,
+            'gym_bonus': self.gym_bonus,
+            'fehler_bonus': self.fehler_bonus,
+            'bonus': self.bonus,
+            'bonus_changed': bonus_changed,
+        }
+
+    def as_scores(self, days=None):
+        """Scores in the shape of scoring.score_person_week (optionally only some days)"""
+        return {
+            'daily': {day: self.daily[day] for day in (DAYS if days is None else days)},
+            'gym_bonus': self.gym_bonus,
+            'fehler_bonus': self.fehler_bonus,
+            'bonus': self.bonus,
+            'total': self.total,
+        }
+
+
+class ScoreEngine:
+    """Cache of PersonWeekScores, built lazily from the data_store"""
+
+    def __init__(self):
+        self._person_weeks = {}
+
+    def get(self, week, person, person_data):
+        key = (week, person)
+        scores = self._person_weeks.get(key)
+        if scores is None:
+            scores = PersonWeekScores(person_data)
+            self._person_weeks[key] = scores
+        return scores
+
+    def update(self, week, person, person_data, day, category, value):
+        """Apply an edit; person_data must still hold the value before the edit"""
+        return self.get(week, person, person_data).update(day, category, value)
+
+    def rebuild(self, week, person, person_data):
+        """Score a person-week from scratch (after several edits at once)"""
+        scores = PersonWeekScores(person_data)
+        self._person_weeks[(week, person)] = scores
+        return scores
+
+    def invalidate(self, week=None):
+        """Forget derived values of one week (or of all weeks)"""
+        if week is None:
+            self._person_weeks.clear()
+            return
+        for key in [key for key in self._person_weeks if key[0] == week]:
+            del self._person_weeks[key]
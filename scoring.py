@@ -0,0 +1,311 @@
+"""
+Scoring rules of the BrecherSystem.
+
+All functions work on the data of one person in one week
+(``{day: {category: value}}``) so they can be used both on the in-memory
+data_store (app.py) and on rows loaded from the database (database.py).
+"""
+
+from cell_values import FLAG_EMPTY, FLAG_NUMBER, FLAG_REST, parse_value, value_parts
+
+CATEGORIES = ['Gym', 'Food', 'Supps', 'Sleep', 'FH', 'Steps', 'Hausarbeit', 'Work', 'Study', 'Fehler', 'Morgenroutine', 'Abendroutine', 'PB']
+DAYS = ['Mo', 'Di', 'Mi', 'Do', 'Fr', 'Sa', 'So']
+
+def plain_points(value):
+    """Punkte aus einer REAL-Spalte (oder NumPy) so wie die Berechnung sie liefert: 12 statt 12.0"""
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+def calculate_points(category, value):
+    """Berechne Punkte basierend auf Kategorie und Wert"""
+    if not value:
+        return 0
+
+    try:
+        val, flag = value.num, value.flag  # geparste Form aus dem data_store
+    except AttributeError:
+        val, flag = parse_value(value)
+    if flag != FLAG_NUMBER:
+        # Gym 'R' (Rest Day) - 1x pro Woche erlaubt, gibt 2 Punkte
+        if category == 'Gym' and flag == FLAG_REST:
+            return 2
+        return 0
+
+    if category == 'Gym':
+        # 1 Workout = 2 Punkte, 2 Workouts = 4 Punkte, etc.
+        return val * 2
+    elif category == 'Food':
+        return min(val, 3)
+    elif category == 'Supps':  # Renamed from Saps
+        return 1 if val > 0 else 0
+    elif category == 'Sleep':
+        if 7 <= val <= 9:
+            return 4
+        elif (6 <= val < 7) or (9 < val <= 10):
+            return 3
+        else:
+            return 1
+    elif category == 'FH':  # Renamed from Study - 0.5 points per hour
+        return val * 0.5
+    elif category == 'Steps':
+        # New formula: (steps * 2) / 10000
+        return (val * 2) / 10000
+    elif category == 'Hausarbeit':
+        return val
+    elif category == 'Work':
+        return val / 100
+    elif category == 'Study':  # Renamed from Podcast/Read - 2 points per hour
+        return val * 2
+    elif category == 'Fehler':
+        # Fehler-Berechnung erfolgt über die ganze Woche (siehe calculate_daily_total)
+        return val * -2  # Temporär, wird in calculate_daily_total überschrieben
+    elif category == 'Morgenroutine':
+        return 2 if val >= 1 else 0
+    elif category == 'Abendroutine':
+        return 2 if val >= 1 else 0
+    elif category == 'PB':
+        # 1h = 1 Punkt (direkte Umrechnung)
+        return val
+    return 0
+
+def get_cell_color(category, value, person_data=None, day=None, fehler_points=None):
+    """Bestimme Zellfarbe basierend auf Wert
+
+    Für Fehler wird die Woche der Person (person_data) benötigt, um den ersten
+    (tolerierten) Fehler der Woche grün zu färben - oder die bereits berechneten
+    fehler_points des Tages.
+    """
+    if not value:
+        return 'white'
+
+    try:
+        val, flag = value.num, value.flag  # geparste Form aus dem data_store
+    except AttributeError:
+        val, flag = parse_value(value)
+    if flag != FLAG_NUMBER:
+        # Gym 'R' (Rest Day) - grün
+        if category == 'Gym' and flag == FLAG_REST:
+            return 'green'
+        return 'white'
+
+    if category == 'Gym':
+        # 1 Workout = grün, 2+ Workouts = grün
+        if val >= 1: return 'green'
+        else: return 'orange'
+    elif category == 'Food':
+        if val >= 3: return 'green'
+        elif val >= 2: return 'orange'
+        else: return 'red'
+    elif category == 'Supps':  # Renamed from Saps
+        if val >= 1: return 'green'
+        else: return 'red'
+    elif category == 'Sleep':
+        if 7 <= val <= 9: return 'green'
+        elif (6 <= val < 7) or (9 < val <= 10): return 'orange'
+        else: return 'red'
+    elif category == 'FH':  # Renamed from Study - 0.5 points per hour
+        if val >= 4: return 'green'
+        elif val >= 2: return 'orange'
+        else: return 'red'
+    elif category == 'Steps':
+        # New thresholds based on new formula
+        if val >= 15000: return 'green'
+        elif val >= 10000: return 'orange'
+        else: return 'red'
+    elif category == 'Hausarbeit':
+        if val >= 3: return 'green'
+        elif val >= 2: return 'orange'
+        else: return 'red'
+    elif category == 'Work':
+        if val >= 300: return 'green'
+        elif val >= 150: return 'orange'
+        else: return 'red'
+    elif category == 'Study':  # Renamed from Podcast/Read - 2 points per hour
+        if val >= 3: return 'green'
+        elif val >= 1: return 'orange'
+        else: return 'red'
+    elif category == 'Fehler':
+        if val == 0:
+            return 'green'  # Keine Fehler = grün
+        else:
+            # Prüfe ob es der erste Fehler der Woche ist (braucht week context)
+            if fehler_points is None and person_data is not None and day:
+                fehler_points = calculate_fehler_points(person_data, day)
+            if fehler_points is not None:
+                if fehler_points == 0:
+                    return 'green'  # Erster Fehler = grün (toleriert)
+                else:
+                    return 'red'  # Weitere Fehler = rot
+            else:
+                return 'red'  # Fallback
+    elif category == 'Morgenroutine':
+        if val >= 1: return 'green'
+        else: return 'red'
+    elif category == 'Abendroutine':
+        if val >= 1: return 'green'
+        else: return 'red'
+    elif category == 'PB':
+        if val >= 6: return 'green'
+        elif val >= 2: return 'orange'
+        else: return 'red'
+    return 'white'
+
+def get_fehler_count(value):
+    """Anzahl Fehler eines Tages aus dem geparsten Wert (None wenn leer/ungültig)"""
+    if not value:
+        return None
+    try:
+        num, flag = value.num, value.flag
+    except AttributeError:
+        num, flag = parse_value(value)
+    if flag != FLAG_NUMBER:
+        return None
+    try:
+        return int(num)
+    except (ValueError, OverflowError):
+        return None
+
+def fehler_day_points(count, errors_before):
+    """Fehler-Punkte eines Tags mit count Fehlern, wenn vorher schon errors_before Fehler waren
+    Regel: Erster Fehler der Woche = 0 Punkte, alle weiteren = -2 Punkte
+    """
+    if count <= 0:
+        return 0
+    if errors_before == 0:
+        return -2 * (count - 1)
+    return -2 * count
+
+def fehler_points_by_day(person_data):
+    """Fehler-Punkte aller Tage einer Person-Woche in einem Durchlauf
+
+    Keeps a running count of the errors before each day (prefix sum), so the
+    points of every day - and with them the Fehler colours - come from one
+    pass over the week: {day: points}.
+    """
+    points = {}
+    errors_before = 0
+    for day in DAYS:
+        count = get_fehler_count(person_data.get(day, {}).get('Fehler', ''))
+        if count is None or count <= 0:
+            points[day] = 0
+            continue
+        points[day] = fehler_day_points(count, errors_before)
+        errors_before += count
+    return points
+
+def calculate_fehler_points(person_data, target_day):
+    """Berechne Fehler-Punkte für einen Tag basierend auf der gesamten Woche
+    Regel: Erster Fehler der Woche = 0 Punkte, alle weiteren = -2 Punkte
+    """
+    return fehler_points_by_day(person_data)[target_day]
+
+def calculate_daily_total(person_data, day, fehler_points=None):
+    """Berechne Tagespunkte für eine Person
+
+    fehler_points: Fehler-Punkte des Tages, falls schon bekannt (siehe fehler_points_by_day)
+    """
+    total = 0
+    day_data = person_data.get(day, {})
+
+    for category in CATEGORIES:
+        value = day_data.get(category, '')
+        if category == 'Fehler':
+            # Spezielle Behandlung für Fehler (wochenweise Toleranz)
+            points = calculate_fehler_points(person_data, day) if fehler_points is None else fehler_points
+        else:
+            points = calculate_points(category, value)
+        total += points
+
+    return round(total, 2)
+
+def calculate_gym_bonus(person_data):
+    """Bonus 1: 5x Gym = 2 Bonus-Punkte"""
+    gym_count = 0
+    for day in DAYS:
+        day_data = person_data.get(day, {})
+        # Zähle nur echte Workouts, nicht 'R' (Rest Day)
+        gym_val, gym_flag = value_parts(day_data.get('Gym', ''))
+        if gym_flag == FLAG_NUMBER and gym_val > 0:
+            gym_count += gym_val
+
+    return 2 if gym_count >= 5 else 0
+
+def calculate_fehler_bonus(person_data):
+    """Bonus 2: 7 fehlerfreie Tage = 2 Bonus-Punkte
+
+    ALLE 7 Tage müssen eingetragen UND 0 sein (grün)
+    """
+    for day in DAYS:
+        day_data = person_data.get(day, {})
+        fehler_val, fehler_flag = value_parts(day_data.get('Fehler', ''))
+
+        # Tag muss einen Wert haben UND dieser muss 0 sein
+        if fehler_flag == FLAG_EMPTY:
+            return 0  # Kein Eintrag = kein Bonus
+
+        if fehler_flag != FLAG_NUMBER:
+            return 0  # Ungültiger Wert = kein Bonus
+
+        if fehler_val != 0:
+            return 0  # Nicht 0 = kein Bonus
+
+    # Nur wenn alle 7 Tage explizit mit 0 eingetragen sind
+    return 2
+
+def calculate_weekly_bonus(person_data):
+    """Berechne Wochen-Bonus: 5x Gym = 2 Punkte, 7 fehlerfreie Tage = 2 Punkte"""
+    return calculate_gym_bonus(person_data) + calculate_fehler_bonus(person_data)
+
+def calculate_weekly_total(person_data):
+    """Berechne Wochenpunkte für eine Person"""
+    fehler_points = fehler_points_by_day(person_data)
+    total = 0
+    for day in DAYS:
+        total += calculate_daily_total(person_data, day, fehler_points[day])
+
+    # Add weekly bonus points
+    total += calculate_weekly_bonus(person_data)
+
+    return round(total, 2)
+
+def score_category(person_data, category):
+    """Wochenpunkte einer Kategorie (Zellpunkte wie in den Charts) und Anzahl ausgefüllter Tage"""
+    points = 0
+    filled = 0
+    for day in DAYS:
+        value = person_data.get(day, {}).get(category, '')
+        points += calculate_points(category, value)
+        if str(value).strip():
+            filled += 1
+    return round(points, 2), filled
+
+def score_categories(person_data):
+    """score_category für alle Kategorien: {category: (points, filled)}"""
+    return {category: score_category(person_data, category) for category in CATEGORIES}
+
+def score_person_week(person_data):
+    """Berechne alle abgeleiteten Werte einer Person-Woche auf einmal
+
+    Returns the daily totals, the weekly bonus components and total and the
+    per-category points, in the shape stored in the daily_scores,
+    weekly_scores and category_scores tables.
+    """
+    fehler_points = fehler_points_by_day(person_data)
+    daily = {day: calculate_daily_total(person_data, day, fehler_points[day]) for day in DAYS}
+    gym_bonus = calculate_gym_bonus(person_data)
+    fehler_bonus = calculate_fehler_bonus(person_data)
+    bonus = gym_bonus + fehler_bonus
+
+    total = 0
+    for day in DAYS:
+        total += daily[day]
+    total += bonus
+
+    return {
+        'daily': daily,
+        'gym_bonus': gym_bonus,
+        'fehler_bonus': fehler_bonus,
+        'bonus': bonus,
+        'total': round(total, 2),
+        'categories': score_categories(person_data)
+    }
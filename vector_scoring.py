@@ -0,0 +1,286 @@
+"""
+Optional NumPy scoring kernel.
+
+Holds all cell values as a dense (week, person, day, category) cube of
+numbers plus a parallel cube of value flags (empty / number / 'R' / text)
+and evaluates the scoring rules of scoring.py for the whole history in a few
+vectorized passes.
+
+The results are the same floats the scalar functions produce: totals are
+accumulated category by category and day by day in the same order as
+scoring.calculate_daily_total/calculate_weekly_total, and rounding to two
+decimals uses Python's round() semantics (see _round2).
+
+NumPy is not a hard dependency; without it ``np`` is None and the app keeps
+using the scalar functions.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # NumPy ist optional
+    np = None
+
+from cell_values import FLAG_EMPTY, FLAG_NUMBER, FLAG_REST, parse_value
+from scoring import CATEGORIES, DAYS, plain_points
+from week_keys import week_number, week_order
+
+COLORS = ['white', 'green', 'orange', 'red']
+WHITE, GREEN, ORANGE, RED = range(len(COLORS))
+
+
+def is_available():
+    return np is not None
+
+def _round2(values):
+    """round(x, 2) for every element, with exactly the result of Python's round()
+
+    rint(x * 100) / 100 agrees with round() except when x * 100 lies on (or
+    within floating point noise of) a .5 boundary; those few elements are
+    rounded with round() itself.
+    """
+    scaled = values * 100
+    rounded = np.rint(scaled) / 100
+    ties = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) < 1e-6
+    if ties.any():
+        rounded[ties] = [round(value, 2) for value in values[ties].tolist()]
+    return rounded
+
+def _threshold_colors(val, green, orange):
+    """green/orange/red nach Mindestwerten (orange=None: kein Orange-Bereich)"""
+    if orange is None:
+        return np.where(val >= green, GREEN, RED)
+    return np.where(val >= green, GREEN, np.where(val >= orange, ORANGE, RED))
+
+
+class ScoreResult:
+    """Derived values of one ScoreCube snapshot (arrays indexed like the cube)"""
+
+    def __init__(self, weeks, names, points, colors, daily, gym_bonus, fehler_bonus, weekly, category_weekly, completed):
+        self.weeks = weeks
+        self.names = names
+        self.points = points                    # (W, P, D, C)
+        self.colors = colors                    # (W, P, D, C) Index in COLORS
+        self.daily = daily                      # (W, P, D)
+        self.gym_bonus = gym_bonus              # (W, P)
+        self.fehler_bonus = fehler_bonus        # (W, P)
+        self.bonus = gym_bonus + fehler_bonus   # (W, P)
+        self.weekly = weekly                    # (W, P)
+        self.category_weekly = category_weekly  # (W, P, C) Summe von calculate_points
+        self.completed = completed              # (W, P) alle Zellen ausgefüllt
+
+    def weekly_scores(self):
+        """{week: {person: total}} like database.get_weekly_scores()"""
+        totals = self.weekly.tolist()
+        return {
+            week: dict(zip(self.names, map(plain_points, totals[w])))
+            for w, week in enumerate(self.weeks)
+        }
+
+    def category_points(self, week, category):
+        """{person: weekly points of one category} (round 2, like the chart data)"""
+        if week not in self.weeks:
+            return {person: 0 for person in self.names}
+        points = self.category_weekly[self.weeks.index(week), :, CATEGORIES.index(category)].tolist()
+        return dict(zip(self.names, map(plain_points, points)))
+
+    def completed_weeks(self):
+        """{week: {person: bool}} - Woche vollständig ausgefüllt"""
+        completed = self.completed.tolist()
+        return {
+            week: dict(zip(self.names, completed[w]))
+            for w, week in enumerate(self.weeks)
+        }
+
+    def color_names(self, week, person):
+        """{day: {category: color}} of one person-week"""
+        codes = self.colors[self.weeks.index(week), self.names.index(person)].tolist()
+        return {
+            day: {category: COLORS[code] for category, code in zip(CATEGORIES, codes[d])}
+            for d, day in enumerate(DAYS)
+        }
+
+
+class ScoreCube:
+    """Dense (week, person, day, category) array of the data_store
+
+    Built once from the data_store, afterwards single cells are updated in
+    place with set_value(). score() recomputes the ScoreResult only after a
+    change.
+    """
+
+    def __init__(self, names):
+        self.names = list(names)
+        self.weeks = []
+        self.values = None
+        self.flags = None
+        self._result = None
+
+    @property
+    def loaded(self):
+        return self.values is not None
+
+    def load(self, data_store):
+        weeks = sorted((week for week in data_store if week_number(week) is not None), key=week_order)
+        shape = (len(weeks), len(self.names), len(DAYS), len(CATEGORIES))
+        values = np.full(shape, np.nan)
+        flags = np.zeros(shape, dtype=np.int8)
+
+        person_index = {person: p for p, person in enumerate(self.names)}
+        day_index = {day: d for d, day in enumerate(DAYS)}
+        category_index = {category: c for c, category in enumerate(CATEGORIES)}
+
+        for w, week in enumerate(weeks):
+            for person, person_data in data_store[week].items():
+                p = person_index.get(person)
+                if p is None:
+                    continue
+                for day, day_data in person_data.items():
+                    d = day_index.get(day)
+                    if d is None:
+                        continue
+                    for category, value in day_data.items():
+                        c = category_index.get(category)
+                        if c is None or not value:
+                            continue
+                        self._store(values, flags, (w, p, d, c), value)
+
+        self.weeks = weeks
+        self.values = values
+        self.flags = flags
+        self._result = None
+
+    def invalidate(self):
+        """Beim nächsten score() komplett neu aus dem data_store laden"""
+        self.values = None
+        self.flags = None
+        self._result = None
+
+    def set_value(self, week, person, day, category, value):
+        """Update one cell; returns False if the cell is outside the cube"""
+        if not self.loaded or week not in self.weeks or person not in self.names:
+            return False
+        index = (self.weeks.index(week), self.names.index(person), DAYS.index(day), CATEGORIES.index(category))
+        self._store(self.values, self.flags, index, value)
+        self._result = None
+        return True
+
+    @staticmethod
+    def _store(values, flags, index, value):
+        try:
+            num, flag = value.num, value.flag
+        except AttributeError:
+            num, flag = parse_value(value)
+        values[index] = num if flag == FLAG_NUMBER else np.nan
+        flags[index] = flag
+
+    def score(self):
+        if self._result is None:
+            self._result = self._compute()
+        return self._result
+
+    def _compute(self):
+        val = self.values
+        flags = self.flags
+        numeric = flags == FLAG_NUMBER
+        rest = flags == FLAG_REST
+        c = CATEGORIES.index
+
+        # Punkte pro Zelle (calculate_points), nicht-numerische Werte = 0
+        with np.errstate(invalid='ignore'):
+            points = np.zeros(val.shape)
+            colors = np.full(val.shape, WHITE, dtype=np.int8)
+
+            for category in CATEGORIES:
+                v = val[..., c(category)]
+                if category == 'Gym':
+                    p = v * 2
+                    col = np.where(v >= 1, GREEN, ORANGE)
+                elif category == 'Food':
+                    p = np.minimum(v, 3)
+                    col = _threshold_colors(v, 3, 2)
+                elif category == 'Supps':
+                    p = np.where(v > 0, 1, 0)
+                    col = _threshold_colors(v, 1, None)
+                elif category == 'Sleep':
+                    good = (v >= 7) & (v <= 9)
+                    ok = ((v >= 6) & (v < 7)) | ((v > 9) & (v <= 10))
+                    p = np.where(good, 4, np.where(ok, 3, 1))
+                    col = np.where(good, GREEN, np.where(ok, ORANGE, RED))
+                elif category == 'FH':
+                    p = v * 0.5
+                    col = _threshold_colors(v, 4, 2)
+                elif category == 'Steps':
+                    p = (v * 2) / 10000
+                    col = _threshold_colors(v, 15000, 10000)
+                elif category == 'Hausarbeit':
+                    p = v
+                    col = _threshold_colors(v, 3, 2)
+                elif category == 'Work':
+                    p = v / 100
+                    col = _threshold_colors(v, 300, 150)
+                elif category == 'Study':
+                    p = v * 2
+                    col = _threshold_colors(v, 3, 1)
+                elif category == 'Fehler':
+                    continue  # wochenweise, siehe unten
+                elif category in ('Morgenroutine', 'Abendroutine'):
+                    p = np.where(v >= 1, 2, 0)
+                    col = _threshold_colors(v, 1, None)
+                elif category == 'PB':
+                    p = v
+                    col = _threshold_colors(v, 6, 2)
+                else:
+                    continue
+                points[..., c(category)] = np.where(numeric[..., c(category)], p, 0)
+                colors[..., c(category)] = np.where(numeric[..., c(category)], col, WHITE)
+
+            # Gym 'R' (Rest Day) = 2 Punkte, grün
+            gym_rest = rest[..., c('Gym')]
+            points[..., c('Gym')] = np.where(gym_rest, 2, points[..., c('Gym')])
+            colors[..., c('Gym')] = np.where(gym_rest, GREEN, colors[..., c('Gym')])
+
+            # Fehler: erster Fehler der Woche = 0 Punkte, alle weiteren = -2 Punkte
+            fehler = val[..., c('Fehler')]
+            fehler_numeric = numeric[..., c('Fehler')] & np.isfinite(fehler)
+            counts = np.where(fehler_numeric, np.trunc(np.where(fehler_numeric, fehler, 0)), 0).astype(np.int64)
+            positive = np.where(counts > 0, counts, 0)
+            errors_before = np.cumsum(positive, axis=-1) - positive
+            fehler_points = np.where(positive > 0, np.where(errors_before == 0, -2 * (positive - 1), -2 * positive), 0)
+            points[..., c('Fehler')] = fehler_points
+            fehler_colors = np.where(fehler == 0, GREEN, np.where(fehler_points == 0, GREEN, RED))
+            colors[..., c('Fehler')] = np.where(numeric[..., c('Fehler')], fehler_colors, WHITE)
+
+            # Tagessummen in Kategorie-Reihenfolge (wie calculate_daily_total)
+            day_sums = np.zeros(val.shape[:-1])
+            for index in range(len(CATEGORIES)):
+                day_sums += points[..., index]
+            daily = _round2(day_sums)
+
+            # Bonus: 5x Gym (nur echte Workouts) und 7 eingetragene fehlerfreie Tage
+            gym = val[..., c('Gym')]
+            workouts = np.where(numeric[..., c('Gym')] & (gym > 0), gym, 0)
+            gym_count = np.zeros(val.shape[:2])
+            for index in range(len(DAYS)):
+                gym_count += workouts[..., index]
+            gym_bonus = np.where(gym_count >= 5, 2, 0)
+            fehler_bonus = np.where((numeric[..., c('Fehler')] & (fehler == 0)).all(axis=-1), 2, 0)
+
+            # Wochensumme in Tages-Reihenfolge (wie calculate_weekly_total)
+            week_sums = np.zeros(val.shape[:2])
+            for index in range(len(DAYS)):
+                week_sums += daily[..., index]
+            weekly = _round2(week_sums + gym_bonus + fehler_bonus)
+
+            # Wochenpunkte pro Kategorie (Charts/Leader) in Tages-Reihenfolge. Wie dort
+            # zählt Fehler hier mit calculate_points (Wert * -2), ohne Wochen-Toleranz.
+            category_points = points.copy()
+            category_points[..., c('Fehler')] = np.where(numeric[..., c('Fehler')], fehler * -2, 0)
+            category_sums = np.zeros(val.shape[:2] + (len(CATEGORIES),))
+            for index in range(len(DAYS)):
+                category_sums += category_points[:, :, index, :]
+            category_weekly = _round2(category_sums)
+
+        completed = (flags != FLAG_EMPTY).all(axis=(2, 3))
+
+        return ScoreResult(list(self.weeks), self.names, points, colors, daily,
+                           gym_bonus, fehler_bonus, weekly, category_weekly, completed)
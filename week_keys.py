@@ -0,0 +1,123 @@
+"""
+ISO (year, week) keys behind the 'KW<n>' week labels.
+
+The app, the URLs and the data_store keep using 'KW39'. In the database every
+week also carries its ISO year: a plain label means the KW39 closest to today
+(at most half a year away), so in January 'KW52' is last year's week and
+'KW1' this year's - the same wrap get_scoreboard_week() does, and weeks
+created ahead of time land in the coming weeks. Once another year's KW39 is
+closer, the old KW39 keeps its data and is addressed as '2025-KW39'.
+
+Comparisons between weeks go through week_order(), which sorts them in time
+instead of by number.
+"""
+
+import functools
+import re
+from datetime import date, datetime, timedelta
+
+# 'KW39' oder '2025-KW39'
+_LABEL = re.compile(r'(?:(\d{4})-)?KW(\d{1,2})$')
+
+
+def _today(today):
+    if today is None:
+        return date.today()
+    if isinstance(today, datetime):
+        return today.date()
+    return today
+
+
+def _monday(day):
+    return day - timedelta(days=day.weekday())
+
+
+def parse_week(week):
+    """(year or None, number) of 39, 'KW39' or '2025-KW39' (None for other labels)"""
+    if isinstance(week, int):
+        return None, week
+    if isinstance(week, str):
+        match = _LABEL.match(week)
+        if match:
+            return (int(match.group(1)) if match.group(1) else None), int(match.group(2))
+    return None
+
+
+def week_number(week):
+    """39 for 39, 'KW39' or '2025-KW39' (None for other labels)"""
+    parsed = parse_week(week)
+    return parsed[1] if parsed else None
+
+
+def _occurrences(number, year):
+    """(monday, year) of week ``number`` in the years around ``year``"""
+    occurrences = []
+    for candidate_year in range(year - 6, year + 2):
+        try:
+            occurrences.append((date.fromisocalendar(candidate_year, number, 1), candidate_year))
+        except ValueError:
+            continue  # KW53 gibt es nicht in jedem Jahr
+    return occurrences
+
+
+@functools.lru_cache(maxsize=1024)
+def _resolve(number, monday):
+    occurrences = _occurrences(number, monday.isocalendar()[0])
+    if not occurrences:
+        return monday.isocalendar()[0], number
+    # Gleich weit weg (Jahre mit KW53): die vergangene Woche
+    closest = min(occurrences, key=lambda occurrence: (abs((occurrence[0] - monday).days), occurrence[0] > monday))
+    return closest[1], number
+
+
+def resolve_week(week, today=None):
+    """ISO (year, week) of 39, 'KW39' or '2025-KW39' as seen from today
+
+    With a date other than today a plain label is read as it was meant then
+    (e.g. rows from before the (year, week) keys, dated by their created_at).
+    """
+    parsed = parse_week(week)
+    if parsed is None:
+        raise ValueError(f'Invalid week: {week!r}')
+    year, number = parsed
+    if year is not None:
+        return year, number
+    return _resolve(number, _monday(_today(today)))
+
+
+def week_label(year, number, today=None):
+    """Label of an ISO week: 'KW39' while the plain label means it, otherwise '2025-KW39'"""
+    if _resolve(number, _monday(_today(today))) == (year, number):
+        return f'KW{number}'
+    return f'{year}-KW{number}'
+
+
+def as_label(week):
+    """Week label of a weeks-list entry (39 -> 'KW39', labels stay as they are)"""
+    return f'KW{week}' if isinstance(week, int) else week
+
+
+def week_order(week, today=None):
+    """Sort key of a week number/label: its ISO (year, week)"""
+    return resolve_week(week, today)
+
+
+def relabeled_weeks(before, after):
+    """Week numbers whose plain label means another year on ``after`` than on ``before``"""
+    before, after = _monday(_today(before)), _monday(_today(after))
+    return [number for number in range(1, 54) if _resolve(number, before) != _resolve(number, after)]
+
+
+def parse_season_start(value):
+    """ISO (year, week) of a SEASON_START setting like '2025-W39' (None when empty)"""
+    if not value:
+        return None
+    match = re.match(r'(\d{4})-?W(\d{1,2})$', value.strip().upper())
+    if not match:
+        raise ValueError(f'Invalid SEASON_START: {value!r} (expected e.g. 2025-W39)')
+    return int(match.group(1)), int(match.group(2))
+
+
+def season_range(start=None):
+    """First and last ISO (year, week) of the season beginning at ``start`` (every week without one)"""
+    return (tuple(start) if start else (0, 0)), (9999, 99)